@@ -44,6 +44,7 @@ echo    Isso pode demorar alguns minutos dependendo da quantidade
 echo.
 
 REM Executa o processamento
+REM (encaminhado ao daemon OCR se estiver ativo: python power_automate_integration.py --serve)
 python power_automate_integration.py input_images
 
 if errorlevel 1 (
@@ -46,6 +46,7 @@ echo "   Isso pode demorar alguns minutos dependendo da quantidade"
 echo ""
 
 # Executa o processamento
+# (encaminhado ao daemon OCR se estiver ativo: python3 power_automate_integration.py --serve)
 python3 power_automate_integration.py input_images
 
 if [ $? -ne 0 ]; then
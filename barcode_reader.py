@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Barcode Reader - Leitura de códigos de barras, QR e DataMatrix
+Caminho rápido: quando um símbolo é decodificado, o OCR não é executado
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+# Leitores opcionais: pip install pyzbar / pip install pylibdmtx
+try:
+    from pyzbar import pyzbar
+except ImportError:
+    pyzbar = None
+
+try:
+    from pylibdmtx import pylibdmtx
+except ImportError:
+    pylibdmtx = None
+
+logger = logging.getLogger(__name__)
+
+# Leitores na ordem padrão (do mais barato ao mais caro)
+DEFAULT_READERS = ['opencv_barcode', 'opencv_qr', 'pyzbar', 'libdmtx']
+
+
+def _create_opencv_barcode_detector():
+    """
+    Cria o detector de códigos de barras do OpenCV, se disponível
+
+    O detector está em cv2.barcode a partir do OpenCV 4.8 e em
+    cv2.barcode_BarcodeDetector nas versões contrib anteriores, cujo
+    detectAndDecode devolve (ok, textos, tipos, pontos).
+
+    Returns:
+        Instância do detector ou None
+    """
+    if hasattr(cv2, 'barcode') and hasattr(cv2.barcode, 'BarcodeDetector'):
+        return cv2.barcode.BarcodeDetector()
+    if hasattr(cv2, 'barcode_BarcodeDetector'):
+        return cv2.barcode_BarcodeDetector()
+    return None
+
+
+class BarcodeReader:
+    """
+    Decodifica o primeiro símbolo legível de uma imagem, tentando os leitores em ordem
+    """
+
+    def __init__(self, options: Optional[Dict] = None):
+        """
+        Inicializa o leitor (os detectores são criados no primeiro uso)
+
+        Args:
+            options: Opções (settings.json 'barcode'): 'readers', 'max_side',
+                'libdmtx_timeout_ms'
+        """
+        self.options = options or {}
+        self.max_side = self.options.get('max_side', 1600)
+        self.readers = self._available_readers(self.options.get('readers', DEFAULT_READERS))
+        self._barcode_detector = None
+        self._qr_detector = None
+
+    def _available_readers(self, readers: List[str]) -> List[str]:
+        """
+        Remove da lista os leitores cujas bibliotecas não estão instaladas
+
+        Args:
+            readers: Leitores configurados
+
+        Returns:
+            Leitores utilizáveis, na ordem configurada
+        """
+        missing = {
+            'opencv_barcode': _create_opencv_barcode_detector() is None,
+            'pyzbar': pyzbar is None,
+            'libdmtx': pylibdmtx is None
+        }
+        available = []
+        for reader in readers:
+            if reader not in DEFAULT_READERS:
+                raise ValueError(f"Leitor de códigos desconhecido: {reader} (disponíveis: {', '.join(DEFAULT_READERS)})")
+            if missing.get(reader):
+                logger.info(f"Leitor de códigos '{reader}' indisponível, ignorado")
+                continue
+            available.append(reader)
+        return available
+
+    def decode(self, gray: np.ndarray) -> Optional[Dict]:
+        """
+        Procura e decodifica um símbolo na imagem
+
+        Args:
+            gray: Imagem em escala de cinza
+
+        Returns:
+            Dicionário com 'texto', 'tipo' e 'leitor', ou None se nada foi lido
+        """
+        height, width = gray.shape[:2]
+        scale = min(1.0, self.max_side / max(height, width))
+        if scale < 1:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        for reader in self.readers:
+            try:
+                symbol = getattr(self, f'_decode_{reader}')(gray)
+            except Exception as e:
+                logger.warning(f"Falha no leitor de códigos '{reader}': {str(e)}")
+                continue
+            if symbol is not None:
+                symbol['leitor'] = reader
+                logger.debug(f"Símbolo {symbol['tipo']} lido por {reader}: {symbol['texto']}")
+                return symbol
+
+        return None
+
+    def _decode_opencv_barcode(self, gray: np.ndarray) -> Optional[Dict]:
+        if self._barcode_detector is None:
+            self._barcode_detector = _create_opencv_barcode_detector()
+
+        if hasattr(self._barcode_detector, 'detectAndDecodeWithType'):
+            # OpenCV >= 4.8 (cv2.barcode.BarcodeDetector)
+            ok, decoded_info, decoded_type, _ = self._barcode_detector.detectAndDecodeWithType(gray)
+        else:
+            # Detector legado do contrib: detectAndDecode já devolve os tipos
+            ok, decoded_info, decoded_type, _ = self._barcode_detector.detectAndDecode(gray)
+        if ok:
+            for text, symbol_type in zip(decoded_info, decoded_type):
+                if text:
+                    return {'texto': text, 'tipo': symbol_type}
+        return None
+
+    def _decode_opencv_qr(self, gray: np.ndarray) -> Optional[Dict]:
+        if self._qr_detector is None:
+            self._qr_detector = cv2.QRCodeDetector()
+
+        text, _, _ = self._qr_detector.detectAndDecode(gray)
+        return {'texto': text, 'tipo': 'QRCODE'} if text else None
+
+    def _decode_pyzbar(self, gray: np.ndarray) -> Optional[Dict]:
+        for symbol in pyzbar.decode(gray):
+            text = symbol.data.decode('utf-8', errors='replace')
+            if text:
+                return {'texto': text, 'tipo': symbol.type}
+        return None
+
+    def _decode_libdmtx(self, gray: np.ndarray) -> Optional[Dict]:
+        # libdmtx é lento em imagens sem símbolo: limita o tempo e a quantidade
+        timeout = self.options.get('libdmtx_timeout_ms', 200)
+        for symbol in pylibdmtx.decode(gray, timeout=timeout, max_count=1):
+            text = symbol.data.decode('utf-8', errors='replace')
+            if text:
+                return {'texto': text, 'tipo': 'DATAMATRIX'}
+        return None
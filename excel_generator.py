@@ -8,27 +8,115 @@ Author: Confrade Tech Solutions
 Date: 2025
 """
 
+import csv
 import json
-import pandas as pd
+import warnings
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Font, PatternFill, Border, Side
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from datetime import datetime
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Resultados aceitos pelos geradores: caminho do JSON, dicionário com
+# 'resultados' (formato de save_results_json) ou lista/iterador de registros
+ResultsInput = Union[str, Dict, Iterable[Dict]]
+
+# Colunas das abas e do CSV
+DETAILED_HEADERS = [
+    'Arquivo',
+    'Texto Extraído',
+    'Texto Limpo',
+    'Observação',
+    'Status',
+    'Confiança',
+    'Data/Hora',
+    'Caminho Completo'
+]
+POWER_AUTOMATE_HEADERS = ['ID', 'Arquivo', 'TextoExtraido', 'Observacao', 'Status']
+SUMMARY_STATS_HEADERS = ['Observação', 'Quantidade']
+CSV_HEADERS = ['ID', 'Arquivo', 'TextoExtraido', 'Observacao', 'Status', 'Timestamp']
+
+# Limite de linhas por aba do Excel (inclui o cabeçalho)
+EXCEL_MAX_ROWS = 1048576
+
+
+class _RollingSheet:
+    """
+    Aba que continua automaticamente em uma nova aba ao atingir o limite de linhas
+    """
+
+    def __init__(self, workbook: openpyxl.Workbook, title: str, init_sheet, finish_sheet,
+                 max_rows: int = EXCEL_MAX_ROWS):
+        """
+        Cria a primeira aba
+
+        Args:
+            workbook: Objeto workbook do openpyxl
+            title: Título da aba (as seguintes recebem ' (2)', ' (3)'...)
+            init_sheet: Função (workbook, título, índice) -> worksheet com cabeçalho
+            finish_sheet: Função (worksheet, número da parte, linhas) chamada quando a aba é concluída
+            max_rows: Número máximo de linhas por aba
+        """
+        self.workbook = workbook
+        self.title = title
+        self.init_sheet = init_sheet
+        self.finish_sheet = finish_sheet
+        self.max_rows = max_rows
+        self.sheets = []
+        self._new_sheet()
+
+    def _new_sheet(self):
+        if not self.sheets:
+            self.ws = self.init_sheet(self.workbook, self.title)
+        else:
+            self.finish_sheet(self.ws, len(self.sheets), self.rows)
+            # Continuação logo após a parte anterior
+            index = self.workbook.worksheets.index(self.ws) + 1
+            self.ws = self.init_sheet(self.workbook, f"{self.title} ({len(self.sheets) + 1})", index)
+        self.sheets.append(self.ws)
+        self.rows = 1
+
+    def append(self, values: List):
+        """
+        Acrescenta uma linha, abrindo uma nova aba se a atual estiver cheia
+
+        Args:
+            values: Valores da linha
+        """
+        if self.rows >= self.max_rows:
+            self._new_sheet()
+        self.ws.append(values)
+        self.rows += 1
+
+    def close(self):
+        """
+        Conclui a última aba (tabela e formatação condicional)
+        """
+        self.finish_sheet(self.ws, len(self.sheets), self.rows)
+
+
 class ExcelGenerator:
     """
     Classe para geração de planilhas Excel a partir dos resultados OCR
     """
 
-    def __init__(self):
+    def __init__(self, write_only: bool = False):
         """
         Inicializa o gerador de Excel
+
+        Args:
+            write_only: Usa o modo streaming do openpyxl (linhas gravadas à medida
+                que chegam, memória constante) para lotes muito grandes
         """
+        self.write_only = write_only
+
         # Estilos para formatação
         self.header_font = Font(bold=True, color="FFFFFF")
         self.header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -44,6 +132,9 @@ class ExcelGenerator:
         )
         self.border = thin_border
 
+        # Estilo das tabelas do Excel (cabeçalho, bordas e listras por aba)
+        self.table_style = "TableStyleMedium2"
+
         logger.info("Excel Generator inicializado")
 
     def load_json_results(self, json_file_path: str) -> Dict:
@@ -67,6 +158,66 @@ class ExcelGenerator:
             logger.error(f"Erro ao carregar JSON: {str(e)}")
             raise
 
+    def _resolve_data(self, data: ResultsInput) -> Dict:
+        """
+        Normaliza a entrada dos geradores para o formato de save_results_json
+
+        Args:
+            data: Caminho do JSON, dicionário com 'resultados' ou registros
+
+        Returns:
+            Dicionário com 'resultados' (lista ou iterador, não copiado)
+        """
+        if isinstance(data, (str, Path)):
+            return self.load_json_results(str(data))
+        if isinstance(data, dict):
+            return data
+        return {'resultados': data}
+
+    def _cell(self, ws, value, font: Optional[Font] = None) -> WriteOnlyCell:
+        """
+        Cria uma célula com fonte própria para ws.append (funciona nos dois modos)
+
+        Args:
+            ws: Worksheet de destino
+            value: Valor da célula
+            font: Fonte (opcional)
+
+        Returns:
+            Célula pronta para ser acrescentada
+        """
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        return cell
+
+    def _add_table(self, ws, name: str, headers: List[str], last_row: int, first_row: int = 1):
+        """
+        Formata um intervalo como Tabela do Excel (cabeçalho, bordas e listras)
+
+        As colunas são declaradas explicitamente para não depender da leitura
+        das células, que não é possível no modo streaming.
+
+        Args:
+            ws: Worksheet de destino
+            name: Nome da tabela (único na pasta de trabalho)
+            headers: Cabeçalhos das colunas
+            last_row: Última linha da tabela
+            first_row: Linha do cabeçalho
+        """
+        last_col = openpyxl.utils.get_column_letter(len(headers))
+        # Uma tabela precisa de ao menos uma linha de dados
+        ref = f"A{first_row}:{last_col}{max(last_row, first_row + 1)}"
+
+        table = Table(displayName=name, ref=ref, autoFilter=AutoFilter(ref=ref))
+        table.tableColumns = [TableColumn(id=i, name=header) for i, header in enumerate(headers, 1)]
+        table.tableStyleInfo = TableStyleInfo(name=self.table_style, showRowStripes=True)
+
+        # No modo streaming o openpyxl sempre avisa sobre as colunas, já declaradas acima
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            ws.add_table(table)
+
     def create_summary_sheet(self, workbook: openpyxl.Workbook, data: Dict):
         """
         Cria a aba de resumo na planilha
@@ -75,6 +226,23 @@ class ExcelGenerator:
             workbook: Objeto workbook do openpyxl
             data: Dados do processamento OCR
         """
+        # Conta observações
+        obs_count = {}
+        for result in data.get('resultados', []):
+            obs = result.get('observacao', 'Sem observação')
+            obs_count[obs] = obs_count.get(obs, 0) + 1
+
+        self._write_summary_sheet(workbook, data, obs_count)
+
+    def _write_summary_sheet(self, workbook: openpyxl.Workbook, data: Dict, obs_count: Dict[str, int]):
+        """
+        Escreve a aba de resumo a partir de contagens já calculadas
+
+        Args:
+            workbook: Objeto workbook do openpyxl
+            data: Cabeçalho do processamento (timestamp, total_processadas, sucessos, erros)
+            obs_count: Contagem de registros por observação
+        """
         # Remove a sheet padrão se existir
         if 'Sheet' in workbook.sheetnames:
             workbook.remove(workbook['Sheet'])
@@ -82,10 +250,16 @@ class ExcelGenerator:
         # Cria nova aba
         ws = workbook.create_sheet("📊 Resumo", 0)
 
+        # Ajusta largura das colunas (antes das linhas, exigência do modo streaming)
+        ws.column_dimensions['A'].width = 30
+        ws.column_dimensions['B'].width = 25
+
         # Cabeçalho
-        ws['A1'] = "RELATÓRIO DE PROCESSAMENTO OCR - LATAS"
-        ws['A1'].font = Font(size=16, bold=True, color="366092")
-        ws.merge_cells('A1:D1')
+        ws.append([self._cell(ws, "RELATÓRIO DE PROCESSAMENTO OCR - LATAS",
+                              font=Font(size=16, bold=True, color="366092"))])
+        if not workbook.write_only:
+            ws.merge_cells('A1:D1')
+        ws.append([])
 
         # Informações gerais
         info_data = [
@@ -93,41 +267,27 @@ class ExcelGenerator:
             ['Total de Imagens Processadas:', data.get('total_processadas', 0)],
             ['Sucessos:', data.get('sucessos', 0)],
             ['Erros:', data.get('erros', 0)],
+            ['Baixa Qualidade:', data.get('baixa_qualidade', 0)],
             ['Taxa de Sucesso:', f"{(data.get('sucessos', 0) / max(data.get('total_processadas', 1), 1) * 100):.1f}%"]
         ]
 
-        start_row = 3
-        for i, (label, value) in enumerate(info_data):
-            ws[f'A{start_row + i}'] = label
-            ws[f'B{start_row + i}'] = value
-            ws[f'A{start_row + i}'].font = Font(bold=True)
+        bold = Font(bold=True)
+        for label, value in info_data:
+            ws.append([self._cell(ws, label, font=bold), value])
 
-        # Estatísticas por regras de negócio
-        results = data.get('resultados', [])
-        if results:
-            ws[f'A{start_row + len(info_data) + 2}'] = "ESTATÍSTICAS POR OBSERVAÇÃO:"
-            ws[f'A{start_row + len(info_data) + 2}'].font = Font(bold=True, size=12)
+        # Estatísticas por regras de negócio, formatadas como tabela
+        if obs_count:
+            ws.append([])
+            ws.append([])
+            ws.append([self._cell(ws, "ESTATÍSTICAS POR OBSERVAÇÃO:", font=Font(bold=True, size=12))])
 
-            # Conta observações
-            obs_count = {}
-            for result in results:
-                obs = result.get('observacao', 'Sem observação')
-                obs_count[obs] = obs_count.get(obs, 0) + 1
+            header_row = 3 + len(info_data) + 3
+            ws.append(SUMMARY_STATS_HEADERS)
+            for obs, count in obs_count.items():
+                ws.append([obs, count])
 
-            stats_start = start_row + len(info_data) + 4
-            for i, (obs, count) in enumerate(obs_count.items()):
-                ws[f'A{stats_start + i}'] = obs
-                ws[f'B{stats_start + i}'] = count
-
-        # Formatação geral
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.border = self.border
-                cell.alignment = Alignment(vertical='center')
-
-        # Ajusta largura das colunas
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 25
+            self._add_table(ws, 'EstatisticasObservacao', SUMMARY_STATS_HEADERS,
+                            header_row + len(obs_count), first_row=header_row)
 
         logger.info("Aba de resumo criada")
 
@@ -139,58 +299,87 @@ class ExcelGenerator:
             workbook: Objeto workbook do openpyxl
             data: Dados do processamento OCR
         """
-        ws = workbook.create_sheet("📋 Detalhes")
-
-        # Cabeçalhos das colunas
-        headers = [
-            'Arquivo',
-            'Texto Extraído',
-            'Texto Limpo',
-            'Observação',
-            'Status',
-            'Data/Hora',
-            'Caminho Completo'
-        ]
-
-        # Adiciona cabeçalhos
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = self.border
+        sheet = self._new_detailed_sheet(workbook)
 
         # Adiciona dados
-        results = data.get('resultados', [])
-        for row, result in enumerate(results, 2):
-            ws.cell(row=row, column=1, value=result.get('arquivo', ''))
-            ws.cell(row=row, column=2, value=result.get('texto_extraido', ''))
-            ws.cell(row=row, column=3, value=result.get('texto_limpo', ''))
-            ws.cell(row=row, column=4, value=result.get('observacao', ''))
-            ws.cell(row=row, column=5, value=result.get('status', ''))
-            ws.cell(row=row, column=6, value=result.get('timestamp', ''))
-            ws.cell(row=row, column=7, value=result.get('caminho_completo', ''))
-
-            # Formatação condicional baseada no status
-            status = result.get('status', '')
-            fill = self.success_fill if status == 'sucesso' else self.error_fill
-
-            for col in range(1, len(headers) + 1):
-                cell = ws.cell(row=row, column=col)
-                cell.border = self.border
-                cell.alignment = Alignment(vertical='center')
-                if status == 'erro':
-                    cell.fill = self.error_fill
-
-        # Ajusta largura das colunas
-        column_widths = [20, 30, 30, 40, 10, 20, 50]
+        count = 0
+        for result in data.get('resultados', []):
+            self._add_detailed_row(sheet, result)
+            count += 1
+        sheet.close()
+
+        logger.info(f"Aba detalhada criada com {count} registros")
+
+    def _new_detailed_sheet(self, workbook: openpyxl.Workbook) -> _RollingSheet:
+        return _RollingSheet(workbook, "📋 Detalhes", self._init_detailed_sheet, self._finish_detailed_sheet)
+
+    def _init_detailed_sheet(self, workbook: openpyxl.Workbook, title: str = "📋 Detalhes",
+                             index: Optional[int] = None):
+        """
+        Cria a aba detalhada com cabeçalhos, larguras, formatos e painel congelado
+
+        Args:
+            workbook: Objeto workbook do openpyxl
+            title: Título da aba
+            index: Posição da aba (padrão: ao final)
+
+        Returns:
+            Worksheet criada
+        """
+        ws = workbook.create_sheet(title, index)
+
+        # Ajusta largura e formato das colunas (códigos sempre como texto)
+        column_widths = [20, 30, 30, 40, 10, 12, 20, 50]
         for i, width in enumerate(column_widths, 1):
-            ws.column_dimensions[openpyxl.utils.get_column_letter(i)].width = width
+            column = ws.column_dimensions[openpyxl.utils.get_column_letter(i)]
+            column.width = width
+            column.number_format = '0.0' if DETAILED_HEADERS[i - 1] == 'Confiança' else '@'
 
         # Congela a primeira linha
         ws.freeze_panes = 'A2'
 
-        logger.info(f"Aba detalhada criada com {len(results)} registros")
+        # Adiciona cabeçalhos (formatados pelo estilo da tabela)
+        ws.append(DETAILED_HEADERS)
+
+        return ws
+
+    def _finish_detailed_sheet(self, ws, part: int, rows: int):
+        """
+        Aplica a tabela e a regra de erro em vermelho à aba detalhada
+
+        Args:
+            ws: Worksheet da aba detalhada
+            part: Número da parte (1 para a primeira aba)
+            rows: Número de linhas escritas, incluindo o cabeçalho
+        """
+        self._add_table(ws, f"Detalhes{part}", DETAILED_HEADERS, rows)
+
+        # Linhas com Status (coluna E) = 'erro' em vermelho
+        last_col = openpyxl.utils.get_column_letter(len(DETAILED_HEADERS))
+        ws.conditional_formatting.add(
+            f"A2:{last_col}{max(rows, 2)}",
+            FormulaRule(formula=['$E2="erro"'], fill=self.error_fill)
+        )
+
+    def _add_detailed_row(self, sheet: _RollingSheet, result: Dict):
+        """
+        Escreve um registro na aba detalhada
+
+        Args:
+            sheet: Aba detalhada
+            result: Resultado de uma imagem
+        """
+        sheet.append([
+            result.get('arquivo', ''),
+            result.get('texto_extraido', ''),
+            result.get('texto_limpo', ''),
+            result.get('observacao', ''),
+            result.get('status', ''),
+            # Confiança média das palavras (vazia se o motor não a informa)
+            result['confianca'] if result.get('confianca', -1) >= 0 else '',
+            result.get('timestamp', ''),
+            result.get('caminho_completo', '')
+        ])
 
     def create_power_automate_sheet(self, workbook: openpyxl.Workbook, data: Dict):
         """
@@ -200,122 +389,256 @@ class ExcelGenerator:
             workbook: Objeto workbook do openpyxl
             data: Dados do processamento OCR
         """
-        ws = workbook.create_sheet("🤖 PowerAutomate")
-
-        # Cabeçalhos simplificados para Power Automate
-        headers = ['ID', 'Arquivo', 'TextoExtraido', 'Observacao', 'Status']
-
-        # Adiciona cabeçalhos
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.border = self.border
+        sheet = self._new_power_automate_sheet(workbook)
 
         # Adiciona dados
-        results = data.get('resultados', [])
-        for row, result in enumerate(results, 2):
-            ws.cell(row=row, column=1, value=row-1)  # ID sequencial
-            ws.cell(row=row, column=2, value=result.get('arquivo', ''))
-            ws.cell(row=row, column=3, value=result.get('texto_limpo', ''))
-            ws.cell(row=row, column=4, value=result.get('observacao', ''))
-            ws.cell(row=row, column=5, value=result.get('status', ''))
-
-            # Aplica bordas
-            for col in range(1, len(headers) + 1):
-                ws.cell(row=row, column=col).border = self.border
-
-        # Ajusta largura das colunas
-        ws.column_dimensions['A'].width = 5
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 35
-        ws.column_dimensions['D'].width = 40
-        ws.column_dimensions['E'].width = 10
+        for i, result in enumerate(data.get('resultados', []), 1):
+            self._add_power_automate_row(sheet, i, result)
+        sheet.close()
 
         logger.info("Aba para Power Automate criada")
 
-    def generate_excel(self, json_file_path: str, excel_output_path: Optional[str] = None) -> str:
+    def _new_power_automate_sheet(self, workbook: openpyxl.Workbook) -> _RollingSheet:
+        return _RollingSheet(workbook, "🤖 PowerAutomate", self._init_power_automate_sheet,
+                             self._finish_power_automate_sheet)
+
+    def _init_power_automate_sheet(self, workbook: openpyxl.Workbook, title: str = "🤖 PowerAutomate",
+                                   index: Optional[int] = None):
         """
-        Gera planilha Excel completa a partir do JSON
+        Cria a aba para Power Automate com cabeçalhos, larguras e formatos
 
         Args:
-            json_file_path: Caminho para o arquivo JSON
-            excel_output_path: Caminho de saída para Excel (opcional)
+            workbook: Objeto workbook do openpyxl
+            title: Título da aba
+            index: Posição da aba (padrão: ao final)
 
         Returns:
-            Caminho do arquivo Excel gerado
+            Worksheet criada
         """
-        try:
-            # Carrega dados do JSON
-            data = self.load_json_results(json_file_path)
+        ws = workbook.create_sheet(title, index)
+
+        # Ajusta largura e formato das colunas
+        ws.column_dimensions['A'].width = 5
+        ws.column_dimensions['A'].number_format = '0'
+        for letter, width in (('B', 25), ('C', 35), ('D', 40), ('E', 10)):
+            ws.column_dimensions[letter].width = width
+            ws.column_dimensions[letter].number_format = '@'
+
+        # Adiciona cabeçalhos (formatados pelo estilo da tabela)
+        ws.append(POWER_AUTOMATE_HEADERS)
+
+        return ws
+
+    def _finish_power_automate_sheet(self, ws, part: int, rows: int):
+        """
+        Formata a aba para Power Automate como tabela
 
-            # Define caminho de saída se não fornecido
-            if not excel_output_path:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                excel_output_path = f"relatorio_ocr_latas_{timestamp}.xlsx"
+        Args:
+            ws: Worksheet da aba Power Automate
+            part: Número da parte (1 para a primeira aba)
+            rows: Número de linhas escritas, incluindo o cabeçalho
+        """
+        self._add_table(ws, f"PowerAutomate{part}", POWER_AUTOMATE_HEADERS, rows)
 
-            # Cria workbook
-            workbook = openpyxl.Workbook()
+    def _add_power_automate_row(self, sheet: _RollingSheet, index: int, result: Dict):
+        """
+        Escreve um registro na aba para Power Automate
 
-            # Cria todas as abas
-            self.create_summary_sheet(workbook, data)
-            self.create_detailed_sheet(workbook, data)
-            self.create_power_automate_sheet(workbook, data)
+        Args:
+            sheet: Aba Power Automate
+            index: ID sequencial (a partir de 1)
+            result: Resultado de uma imagem
+        """
+        sheet.append([
+            index,
+            result.get('arquivo', ''),
+            result.get('texto_limpo', ''),
+            result.get('observacao', ''),
+            result.get('status', '')
+        ])
+
+    def generate_reports(self, data: ResultsInput, excel_output_path: Optional[str] = None,
+                         csv_output_path: Optional[str] = None, generate_excel: bool = True,
+                         generate_csv: bool = True, write_only: Optional[bool] = None) -> Dict[str, Optional[str]]:
+        """
+        Gera Excel e/ou CSV em uma única passada sobre os resultados
 
-            # Salva arquivo
-            workbook.save(excel_output_path)
-            logger.info(f"Planilha Excel salva em: {excel_output_path}")
+        Os registros são lidos uma vez e escritos em todas as saídas ao mesmo
+        tempo; o resumo é montado ao final a partir das contagens acumuladas.
 
-            return excel_output_path
+        Args:
+            data: Caminho do JSON, dicionário com 'resultados' ou registros em memória
+            excel_output_path: Caminho de saída para Excel (opcional)
+            csv_output_path: Caminho de saída para CSV (opcional)
+            generate_excel: Se deve gerar arquivo Excel
+            generate_csv: Se deve gerar arquivo CSV
+            write_only: Modo streaming do Excel (padrão: self.write_only)
+
+        Returns:
+            Dicionário com 'excel_file' e 'csv_file' (None se não gerado)
+        """
+        try:
+            data = self._resolve_data(data)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+            if write_only is None:
+                write_only = self.write_only
+
+            workbook = detail_sheet = pa_sheet = None
+            if generate_excel:
+                if not excel_output_path:
+                    excel_output_path = f"relatorio_ocr_latas_{timestamp}.xlsx"
+                workbook = openpyxl.Workbook(write_only=write_only)
+                detail_sheet = self._new_detailed_sheet(workbook)
+                pa_sheet = self._new_power_automate_sheet(workbook)
+
+            csv_file = csv_writer = None
+            if generate_csv:
+                if not csv_output_path:
+                    csv_output_path = f"dados_ocr_latas_{timestamp}.csv"
+                csv_file = open(csv_output_path, 'w', newline='', encoding='utf-8-sig')
+                csv_writer = csv.DictWriter(csv_file, fieldnames=CSV_HEADERS)
+                csv_writer.writeheader()
+
+            # Passada única sobre os registros
+            total = sucessos = erros = baixa_qualidade = 0
+            obs_count = {}
+            try:
+                for i, result in enumerate(data.get('resultados', []), 1):
+                    if workbook is not None:
+                        self._add_detailed_row(detail_sheet, result)
+                        self._add_power_automate_row(pa_sheet, i, result)
+                    if csv_writer is not None:
+                        csv_writer.writerow(self._csv_row(i, result))
+
+                    total += 1
+                    status = result.get('status', '')
+                    if status == 'sucesso':
+                        sucessos += 1
+                    elif status == 'erro':
+                        erros += 1
+                    elif status == 'baixa_qualidade':
+                        baixa_qualidade += 1
+                    obs = result.get('observacao', 'Sem observação')
+                    obs_count[obs] = obs_count.get(obs, 0) + 1
+            finally:
+                if csv_file is not None:
+                    csv_file.close()
+
+            if csv_writer is not None:
+                logger.info(f"Arquivo CSV salvo em: {csv_output_path}")
+
+            if workbook is not None:
+                detail_sheet.close()
+                pa_sheet.close()
+
+                summary = {
+                    'timestamp': data.get('timestamp', datetime.now().isoformat()),
+                    'total_processadas': total,
+                    'sucessos': sucessos,
+                    'erros': erros,
+                    'baixa_qualidade': baixa_qualidade
+                }
+                self._write_summary_sheet(workbook, summary, obs_count)
+                logger.info(f"Aba detalhada criada com {total} registros")
+
+                workbook.save(excel_output_path)
+                logger.info(f"Planilha Excel salva em: {excel_output_path}")
+
+            return {
+                'excel_file': excel_output_path if generate_excel else None,
+                'csv_file': csv_output_path if generate_csv else None
+            }
 
         except Exception as e:
-            logger.error(f"Erro ao gerar Excel: {str(e)}")
+            logger.error(f"Erro ao gerar relatórios: {str(e)}")
             raise
 
-    def generate_csv_for_power_automate(self, json_file_path: str, csv_output_path: Optional[str] = None) -> str:
+    def generate_excel(self, json_file_path: ResultsInput, excel_output_path: Optional[str] = None) -> str:
+        """
+        Gera planilha Excel completa a partir do JSON
+
+        Args:
+            json_file_path: Caminho para o arquivo JSON ou resultados já em memória
+            excel_output_path: Caminho de saída para Excel (opcional)
+
+        Returns:
+            Caminho do arquivo Excel gerado
+        """
+        return self.generate_reports(
+            json_file_path, excel_output_path=excel_output_path, generate_csv=False
+        )['excel_file']
+
+    def generate_csv_for_power_automate(self, json_file_path: ResultsInput, csv_output_path: Optional[str] = None) -> str:
         """
         Gera arquivo CSV simples para integração com Power Automate
 
         Args:
-            json_file_path: Caminho para o arquivo JSON
+            json_file_path: Caminho para o arquivo JSON ou resultados já em memória
             csv_output_path: Caminho de saída para CSV (opcional)
 
         Returns:
             Caminho do arquivo CSV gerado
         """
-        try:
-            # Carrega dados
-            data = self.load_json_results(json_file_path)
-
-            # Define caminho de saída
-            if not csv_output_path:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                csv_output_path = f"dados_ocr_latas_{timestamp}.csv"
-
-            # Prepara dados para DataFrame
-            results = data.get('resultados', [])
-            df_data = []
-
-            for i, result in enumerate(results, 1):
-                df_data.append({
-                    'ID': i,
-                    'Arquivo': result.get('arquivo', ''),
-                    'TextoExtraido': result.get('texto_limpo', ''),
-                    'Observacao': result.get('observacao', ''),
-                    'Status': result.get('status', ''),
-                    'Timestamp': result.get('timestamp', '')
-                })
-
-            # Cria DataFrame e salva CSV
-            df = pd.DataFrame(df_data)
-            df.to_csv(csv_output_path, index=False, encoding='utf-8-sig')
-
-            logger.info(f"Arquivo CSV salvo em: {csv_output_path}")
-            return csv_output_path
+        return self.generate_reports(
+            json_file_path, csv_output_path=csv_output_path, generate_excel=False
+        )['csv_file']
 
-        except Exception as e:
-            logger.error(f"Erro ao gerar CSV: {str(e)}")
-            raise
+    def append_csv_rows(self, results: Iterable[Dict], csv_output_path: str,
+                        start_index: Optional[int] = None) -> int:
+        """
+        Acrescenta registros a um CSV existente (ou o cria com cabeçalho)
+
+        Usado pelo monitoramento contínuo, que grava o CSV do dia aos poucos.
+
+        Args:
+            results: Resultados a acrescentar
+            csv_output_path: Caminho do CSV
+            start_index: ID do primeiro registro (padrão: continua a numeração do arquivo)
+
+        Returns:
+            ID do próximo registro
+        """
+        csv_path = Path(csv_output_path)
+        is_new = not csv_path.exists() or csv_path.stat().st_size == 0
+
+        if start_index is None:
+            start_index = 1
+            if not is_new:
+                with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+                    start_index = sum(1 for _ in csv.reader(f))  # cabeçalho + registros
+
+        # No modo 'a', o BOM do utf-8-sig só é escrito em arquivo vazio
+        with open(csv_path, 'a', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+            if is_new:
+                writer.writeheader()
+            for result in results:
+                writer.writerow(self._csv_row(start_index, result))
+                start_index += 1
+
+        return start_index
+
+    @staticmethod
+    def _csv_row(index: int, result: Dict) -> Dict:
+        """
+        Monta uma linha do CSV para Power Automate
+
+        Args:
+            index: ID sequencial (a partir de 1)
+            result: Resultado de uma imagem
+
+        Returns:
+            Dicionário com as colunas do CSV
+        """
+        return {
+            'ID': index,
+            'Arquivo': result.get('arquivo', ''),
+            'TextoExtraido': result.get('texto_limpo', ''),
+            'Observacao': result.get('observacao', ''),
+            'Status': result.get('status', ''),
+            'Timestamp': result.get('timestamp', '')
+        }
 
 
 def main():
@@ -329,19 +652,27 @@ def main():
     parser.add_argument('-x', '--excel', help='Caminho para arquivo Excel de saída')
     parser.add_argument('-c', '--csv', help='Caminho para arquivo CSV de saída')
     parser.add_argument('--both', action='store_true', help='Gera tanto Excel quanto CSV')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Gera o Excel em modo streaming (lotes muito grandes)')
 
     args = parser.parse_args()
 
-    generator = ExcelGenerator()
+    generator = ExcelGenerator(write_only=args.streaming)
 
     try:
-        if args.excel or args.both:
-            excel_path = generator.generate_excel(args.json_file, args.excel)
-            print(f"✅ Excel gerado: {excel_path}")
-
-        if args.csv or args.both:
-            csv_path = generator.generate_csv_for_power_automate(args.json_file, args.csv)
-            print(f"✅ CSV gerado: {csv_path}")
+        if args.excel or args.csv or args.both:
+            # Lê o JSON uma única vez e gera as saídas pedidas na mesma passada
+            generated = generator.generate_reports(
+                args.json_file,
+                excel_output_path=args.excel,
+                csv_output_path=args.csv,
+                generate_excel=bool(args.excel or args.both),
+                generate_csv=bool(args.csv or args.both)
+            )
+            if generated['excel_file']:
+                print(f"✅ Excel gerado: {generated['excel_file']}")
+            if generated['csv_file']:
+                print(f"✅ CSV gerado: {generated['csv_file']}")
 
         if not args.excel and not args.csv and not args.both:
             # Padrão: gera Excel
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Folder Watcher - Monitoramento da pasta de entrada
+inotify no Linux (via ctypes, sem dependências) e varredura periódica nos demais sistemas
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constantes de <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Cabeçalho de cada evento: wd, mask, cookie, len (o nome vem em seguida)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """
+    Carrega as funções de inotify da libc
+
+    Returns:
+        Biblioteca C com inotify_init1/inotify_add_watch ou None se indisponível
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FolderWatcher:
+    """
+    Entrega, em lotes, as imagens que terminaram de ser gravadas na pasta
+
+    Com inotify, um arquivo está pronto no evento IN_CLOSE_WRITE (gravação
+    concluída) ou IN_MOVED_TO (renomeado para a pasta). Na varredura, está
+    pronto quando tamanho e data de modificação ficam estáveis por
+    'settle_seconds'.
+
+    O registro de entregas é podado quando o arquivo sai da pasta, então
+    nunca passa do conteúdo atual da pasta.
+    """
+
+    # Intervalo mínimo entre duas podas do registro de entregas, em segundos
+    PRUNE_INTERVAL = 60.0
+
+    def __init__(self, folder: str, extensions: Iterable[str], use_inotify: bool = True,
+                 poll_interval: float = 1.0, settle_seconds: float = 2.0, batch_window: float = 0.5,
+                 process_existing: bool = False):
+        """
+        Inicializa o monitoramento
+
+        Args:
+            folder: Pasta monitorada
+            extensions: Extensões de imagem aceitas (ex.: {'.jpg', '.png'})
+            use_inotify: Usa inotify quando disponível (senão, sempre varredura)
+            poll_interval: Intervalo entre varreduras, em segundos
+            settle_seconds: Tempo de estabilidade exigido na varredura, em segundos
+            batch_window: Espera após o primeiro arquivo pronto para juntar um lote
+            process_existing: Entrega também as imagens já presentes ao iniciar
+        """
+        self.folder = Path(folder)
+        self.extensions = {ext.lower() for ext in extensions}
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.batch_window = batch_window
+        self.process_existing = process_existing
+
+        self._libc = _load_inotify() if use_inotify else None
+        self._fd = None
+
+        # Arquivos já entregues: caminho -> (tamanho, mtime) no momento da entrega
+        self._delivered: Dict[Path, Tuple[int, float]] = {}
+        self._last_prune = time.monotonic()
+
+    @property
+    def mode(self) -> str:
+        return 'inotify' if self._libc is not None else 'polling'
+
+    def _is_image(self, path: Path) -> bool:
+        return path.suffix.lower() in self.extensions and not path.name.startswith('.')
+
+    def _signature(self, path: Path) -> Optional[Tuple[int, float]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime
+
+    def _prune(self):
+        """
+        Remove do registro os arquivos que saíram da pasta
+        """
+        now = time.monotonic()
+        if now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+
+        for path in [path for path in self._delivered if not path.exists()]:
+            del self._delivered[path]
+
+    def _take(self, paths: Iterable[Path]) -> List[Path]:
+        """
+        Filtra os arquivos ainda não entregues (ou alterados desde a entrega)
+
+        Args:
+            paths: Candidatos
+
+        Returns:
+            Arquivos a entregar, em ordem de nome
+        """
+        ready = []
+        for path in sorted(set(paths)):
+            signature = self._signature(path)
+            if signature is None or signature[0] == 0 or self._delivered.get(path) == signature:
+                continue
+            self._delivered[path] = signature
+            ready.append(path)
+        return ready
+
+    def _scan(self) -> Dict[Path, Tuple[int, float]]:
+        signatures = {}
+        for path in self.folder.iterdir():
+            if path.is_file() and self._is_image(path):
+                signature = self._signature(path)
+                if signature is not None:
+                    signatures[path] = signature
+        return signatures
+
+    def batches(self, should_stop=None) -> Iterator[List[Path]]:
+        """
+        Gera lotes de imagens prontas indefinidamente
+
+        Args:
+            should_stop: Função sem argumentos; o monitoramento termina quando
+                retornar True (verificada ao menos a cada segundo)
+
+        Yields:
+            Lista de caminhos prontos para o OCR
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+        should_stop = should_stop or (lambda: False)
+
+        existing = self._scan()
+        if self.process_existing:
+            ready = self._take(existing)
+            if ready:
+                yield ready
+        else:
+            self._delivered.update(existing)
+
+        logger.info(f"Monitorando {self.folder} ({self.mode})")
+        if self._libc is not None:
+            yield from self._inotify_batches(should_stop)
+        else:
+            yield from self._polling_batches(should_stop)
+
+    def _inotify_batches(self, should_stop) -> Iterator[List[Path]]:
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(self.folder)), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch falhou: {self.folder}")
+
+        try:
+            while not should_stop():
+                self._prune()
+                pending = self._read_events(timeout=1.0)
+                if not pending:
+                    continue
+
+                # Junta os arquivos que terminarem logo em seguida no mesmo lote
+                deadline = time.monotonic() + self.batch_window
+                while time.monotonic() < deadline:
+                    pending.extend(self._read_events(timeout=max(0.0, deadline - time.monotonic())))
+
+                ready = self._take(pending)
+                if ready:
+                    yield ready
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read_events(self, timeout: float) -> List[Path]:
+        """
+        Lê os eventos de inotify disponíveis
+
+        Args:
+            timeout: Espera máxima por eventos, em segundos
+
+        Returns:
+            Imagens com gravação concluída
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths, offset = [], 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            _, mask, _, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                # Fila do kernel estourou: recupera pela varredura da pasta
+                logger.warning("Fila do inotify estourou; varrendo a pasta")
+                paths.extend(self._scan())
+            elif name:
+                path = self.folder / os.fsdecode(name)
+                if self._is_image(path):
+                    paths.append(path)
+        return paths
+
+    def _polling_batches(self, should_stop) -> Iterator[List[Path]]:
+        # Última assinatura vista de cada arquivo e desde quando está estável
+        last_seen: Dict[Path, Tuple[Tuple[int, float], float]] = {}
+
+        while not should_stop():
+            self._prune()
+            now = time.monotonic()
+            candidates = []
+            scanned = self._scan()
+            for path, signature in scanned.items():
+                if self._delivered.get(path) == signature:
+                    continue
+                previous = last_seen.get(path)
+                if previous is None or previous[0] != signature:
+                    last_seen[path] = (signature, now)
+                elif now - previous[1] >= self.settle_seconds:
+                    candidates.append(path)
+
+            ready = self._take(candidates)
+            for path in ready:
+                last_seen.pop(path, None)
+            for path in [path for path in last_seen if path not in scanned]:
+                # Removido antes de estabilizar
+                del last_seen[path]
+            if ready:
+                yield ready
+
+            time.sleep(self.poll_interval)
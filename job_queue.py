@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Job Queue - Fila de processamento durável em SQLite (WAL)
+Jobs com prioridade, estado, tentativas e horários; sobrevivem a reinícios
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Estados de um job
+PENDENTE = 'pendente'          # aguardando um worker
+PROCESSANDO = 'processando'    # reservado por um worker
+AGUARDANDO = 'aguardando'      # pasta expandida, esperando as imagens filhas
+CONCLUIDO = 'concluido'
+ERRO = 'erro'
+
+# Fases de um job de pasta
+FASE_EXPANDIR = 'expandir'     # listar as imagens e criar os jobs filhos
+FASE_RELATORIO = 'relatorio'   # filhos finalizados: gerar os relatórios
+
+
+class JobQueue:
+    """
+    Fila de jobs de OCR (imagens e pastas) armazenada em um arquivo SQLite
+
+    Jobs de pasta são expandidos em um job por imagem, na prioridade da
+    pasta; assim, uma imagem urgente enviada depois passa à frente das
+    imagens restantes de uma pasta grande, em vez de esperar a pasta inteira.
+    """
+
+    def __init__(self, db_path: str = 'cache/job_queue.sqlite', max_attempts: int = 3):
+        """
+        Inicializa a fila (cada thread abre a sua conexão no primeiro uso)
+
+        Args:
+            db_path: Caminho para o arquivo SQLite
+            max_attempts: Número máximo de tentativas por job
+        """
+        self.db_path = Path(db_path)
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre a conexão da thread atual e cria a tabela se necessário
+
+        Returns:
+            Conexão SQLite (transações controladas manualmente)
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tipo TEXT NOT NULL,
+                    caminho TEXT NOT NULL,
+                    prioridade INTEGER NOT NULL DEFAULT 0,
+                    estado TEXT NOT NULL,
+                    fase TEXT,
+                    tentativas INTEGER NOT NULL DEFAULT 0,
+                    max_tentativas INTEGER NOT NULL,
+                    pai_id INTEGER REFERENCES jobs (id),
+                    parametros TEXT,
+                    resultado TEXT,
+                    erro TEXT,
+                    worker TEXT,
+                    criado_em REAL NOT NULL,
+                    iniciado_em REAL,
+                    atualizado_em REAL NOT NULL,
+                    concluido_em REAL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_fila ON jobs (estado, prioridade DESC, id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_pai ON jobs (pai_id, estado)')
+            self._local.conn = conn
+        return conn
+
+    def _row_to_job(self, row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        job['parametros'] = json.loads(job['parametros']) if job['parametros'] else {}
+        job['resultado'] = json.loads(job['resultado']) if job['resultado'] else None
+        return job
+
+    def submit(self, path: str, kind: Optional[str] = None, priority: int = 0,
+               params: Optional[Dict] = None) -> int:
+        """
+        Adiciona um job à fila
+
+        Args:
+            path: Imagem ou pasta a processar
+            kind: 'imagem' ou 'pasta' (padrão: conforme o caminho)
+            priority: Prioridade (maior = mais urgente)
+            params: Parâmetros do processamento (ex.: incremental, resume)
+
+        Returns:
+            Identificador do job
+        """
+        if kind is None:
+            kind = 'pasta' if Path(path).is_dir() else 'imagem'
+        now = time.time()
+        cursor = self._connect().execute(
+            'INSERT INTO jobs (tipo, caminho, prioridade, estado, fase, max_tentativas, parametros, '
+            'criado_em, atualizado_em) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (kind, str(path), priority, PENDENTE, FASE_EXPANDIR if kind == 'pasta' else None,
+             self.max_attempts, json.dumps(params or {}), now, now)
+        )
+        return cursor.lastrowid
+
+    def claim(self, worker: str, limit: int = 1) -> List[Dict]:
+        """
+        Reserva atomicamente os próximos jobs da fila
+
+        Retorna o job pendente de maior prioridade; se for uma imagem, junta
+        as imagens pendentes seguintes de mesma prioridade (até 'limit') para
+        manter o pool de workers ocupado. Jobs de pasta são reservados sozinhos.
+
+        Args:
+            worker: Identificação de quem reservou
+            limit: Número máximo de imagens reservadas de uma vez
+
+        Returns:
+            Jobs reservados (lista vazia se a fila estiver vazia)
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            top = conn.execute(
+                'SELECT id, tipo FROM jobs WHERE estado = ? ORDER BY prioridade DESC, id LIMIT 1',
+                (PENDENTE,)
+            ).fetchone()
+            if top is None:
+                conn.execute('COMMIT')
+                return []
+
+            if top['tipo'] == 'pasta':
+                ids = [top['id']]
+            else:
+                # Só imagens da mesma prioridade, para não passar à frente de outros jobs
+                ids = [row['id'] for row in conn.execute(
+                    'SELECT id FROM jobs WHERE estado = ? AND tipo = ? AND prioridade = '
+                    '(SELECT prioridade FROM jobs WHERE id = ?) ORDER BY id LIMIT ?',
+                    (PENDENTE, 'imagem', top['id'], max(1, limit))
+                )]
+
+            now = time.time()
+            placeholders = ','.join('?' * len(ids))
+            conn.execute(
+                f'UPDATE jobs SET estado = ?, tentativas = tentativas + 1, worker = ?, '
+                f'iniciado_em = ?, atualizado_em = ? WHERE id IN ({placeholders})',
+                (PROCESSANDO, worker, now, now, *ids)
+            )
+            rows = conn.execute(
+                f'SELECT * FROM jobs WHERE id IN ({placeholders}) ORDER BY prioridade DESC, id', ids
+            ).fetchall()
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return [self._row_to_job(row) for row in rows]
+
+    def expand(self, folder_job_id: int, image_paths: List[str]):
+        """
+        Cria um job por imagem de uma pasta e coloca a pasta em espera
+
+        Args:
+            folder_job_id: Job de pasta reservado
+            image_paths: Imagens encontradas na pasta
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            parent = conn.execute('SELECT prioridade, parametros FROM jobs WHERE id = ?',
+                                  (folder_job_id,)).fetchone()
+            now = time.time()
+            conn.executemany(
+                'INSERT INTO jobs (tipo, caminho, prioridade, estado, max_tentativas, pai_id, parametros, '
+                'criado_em, atualizado_em) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [('imagem', str(path), parent['prioridade'], PENDENTE, self.max_attempts, folder_job_id,
+                  parent['parametros'], now, now) for path in image_paths]
+            )
+            # Sem imagens, a pasta vai direto para a fase de relatório
+            state, phase = (AGUARDANDO, FASE_EXPANDIR) if image_paths else (PENDENTE, FASE_RELATORIO)
+            conn.execute('UPDATE jobs SET estado = ?, fase = ?, atualizado_em = ? WHERE id = ?',
+                         (state, phase, now, folder_job_id))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        logger.info(f"Job {folder_job_id}: pasta expandida em {len(image_paths)} imagens")
+
+    def complete(self, job_id: int, result: Dict):
+        """
+        Marca um job como concluído
+
+        Args:
+            job_id: Identificador do job
+            result: Resultado (imagem filha) ou resposta final (job enviado)
+        """
+        self._finish(job_id, CONCLUIDO, resultado=json.dumps(result, ensure_ascii=False))
+
+    def fail(self, job_id: int, error: str):
+        """
+        Registra uma falha; o job volta à fila até esgotar as tentativas
+
+        Args:
+            job_id: Identificador do job
+            error: Mensagem de erro
+        """
+        row = self._connect().execute('SELECT tentativas, max_tentativas FROM jobs WHERE id = ?',
+                                      (job_id,)).fetchone()
+        if row is not None and row['tentativas'] < row['max_tentativas']:
+            now = time.time()
+            self._connect().execute(
+                'UPDATE jobs SET estado = ?, erro = ?, worker = NULL, atualizado_em = ? WHERE id = ?',
+                (PENDENTE, error, now, job_id)
+            )
+            logger.warning(f"Job {job_id} falhou (tentativa {row['tentativas']}), voltando à fila: {error}")
+        else:
+            self._finish(job_id, ERRO, erro=error)
+            logger.error(f"Job {job_id} falhou definitivamente: {error}")
+
+    def _finish(self, job_id: int, state: str, resultado: Optional[str] = None, erro: Optional[str] = None):
+        """
+        Finaliza um job e, se for o último filho de uma pasta, libera o relatório da pasta
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            conn.execute(
+                'UPDATE jobs SET estado = ?, resultado = COALESCE(?, resultado), erro = COALESCE(?, erro), '
+                'atualizado_em = ?, concluido_em = ? WHERE id = ?',
+                (state, resultado, erro, now, now, job_id)
+            )
+            parent_id = conn.execute('SELECT pai_id FROM jobs WHERE id = ?', (job_id,)).fetchone()['pai_id']
+            if parent_id is not None:
+                remaining = conn.execute(
+                    'SELECT COUNT(*) FROM jobs WHERE pai_id = ? AND estado IN (?, ?)',
+                    (parent_id, PENDENTE, PROCESSANDO)
+                ).fetchone()[0]
+                if remaining == 0:
+                    conn.execute(
+                        'UPDATE jobs SET estado = ?, fase = ?, atualizado_em = ? WHERE id = ? AND estado = ?',
+                        (PENDENTE, FASE_RELATORIO, now, parent_id, AGUARDANDO)
+                    )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def requeue_stale(self, older_than: Optional[float] = None) -> int:
+        """
+        Devolve à fila jobs reservados por workers que não terminaram
+
+        Um job que já esgotou as tentativas é finalizado com erro em vez de
+        voltar à fila: provavelmente foi ele que derrubou o processo (falta
+        de memória, falha nativa fora do pool) e o faria de novo a cada reinício.
+
+        Args:
+            older_than: Só jobs sem atualização há mais de N segundos
+                (None = todos, usado ao iniciar o único consumidor da fila)
+
+        Returns:
+            Número de jobs devolvidos
+        """
+        limit = time.time() - older_than if older_than is not None else time.time() + 1
+        conn = self._connect()
+        stale = conn.execute(
+            'SELECT id, tentativas, max_tentativas FROM jobs WHERE estado = ? AND atualizado_em < ?',
+            (PROCESSANDO, limit)
+        ).fetchall()
+
+        requeued = [row['id'] for row in stale if row['tentativas'] < row['max_tentativas']]
+        for row in stale:
+            if row['tentativas'] >= row['max_tentativas']:
+                # Imagens filhas entram nos relatórios da pasta como resultado de erro
+                self._finish(row['id'], ERRO, erro=f"interrompido em {row['tentativas']} tentativas")
+                logger.error(f"Job {row['id']} interrompido {row['tentativas']} vezes; finalizado com erro")
+
+        if requeued:
+            placeholders = ','.join('?' * len(requeued))
+            conn.execute(
+                f'UPDATE jobs SET estado = ?, worker = NULL, atualizado_em = ? '
+                f'WHERE id IN ({placeholders}) AND estado = ?',
+                (PENDENTE, time.time(), *requeued, PROCESSANDO)
+            )
+            logger.info(f"{len(requeued)} jobs interrompidos devolvidos à fila")
+        return len(requeued)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        """
+        Retorna um job (None se não existir)
+        """
+        row = self._connect().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._row_to_job(row)
+
+    def progress(self, folder_job_id: int) -> Dict:
+        """
+        Conta as imagens filhas de uma pasta por estado
+
+        Args:
+            folder_job_id: Job de pasta
+
+        Returns:
+            Dicionário {estado: quantidade} com 'total'
+        """
+        counts = {row['estado']: row['n'] for row in self._connect().execute(
+            'SELECT estado, COUNT(*) AS n FROM jobs WHERE pai_id = ? GROUP BY estado', (folder_job_id,)
+        )}
+        counts['total'] = sum(counts.values())
+        return counts
+
+    def counts(self) -> Dict:
+        """
+        Conta os jobs enviados (sem as imagens filhas) por estado
+
+        Returns:
+            Dicionário {estado: quantidade}
+        """
+        return {row['estado']: row['n'] for row in self._connect().execute(
+            'SELECT estado, COUNT(*) AS n FROM jobs WHERE pai_id IS NULL GROUP BY estado'
+        )}
+
+    def child_results(self, folder_job_id: int) -> List[Dict]:
+        """
+        Resultados das imagens de uma pasta, na ordem de expansão
+
+        Imagens que esgotaram as tentativas entram como resultado de erro.
+
+        Args:
+            folder_job_id: Job de pasta
+
+        Returns:
+            Lista de resultados no formato de OCRProcessor.process_single_image
+        """
+        results = []
+        for row in self._connect().execute(
+                'SELECT caminho, estado, resultado, erro FROM jobs WHERE pai_id = ? ORDER BY id', (folder_job_id,)):
+            if row['resultado']:
+                results.append(json.loads(row['resultado']))
+            else:
+                results.append({
+                    'arquivo': Path(row['caminho']).name,
+                    'caminho_completo': row['caminho'],
+                    'texto_extraido': '',
+                    'texto_limpo': '',
+                    'observacao': f"ERRO: {row['erro'] or 'não processada'}",
+                    'status': 'erro'
+                })
+        return results
+
+    def purge(self, max_age_days: float = 7) -> int:
+        """
+        Remove jobs finalizados (e seus filhos) mais antigos que o limite
+
+        Args:
+            max_age_days: Idade máxima, em dias, de um job finalizado
+
+        Returns:
+            Número de jobs removidos
+        """
+        limit = time.time() - max_age_days * 86400
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'DELETE FROM jobs WHERE pai_id IN (SELECT id FROM jobs WHERE estado IN (?, ?) AND concluido_em < ?)',
+                (CONCLUIDO, ERRO, limit)
+            )
+            cursor = conn.execute(
+                'DELETE FROM jobs WHERE pai_id IS NULL AND estado IN (?, ?) AND concluido_em < ?',
+                (CONCLUIDO, ERRO, limit)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount
+
+    def close(self):
+        """
+        Fecha a conexão da thread atual
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Cache - Cache persistente de resultados OCR em SQLite
+Chave: hash do conteúdo da imagem + impressão digital da configuração
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo
+
+    Args:
+        file_path: Caminho para o arquivo
+        chunk_size: Tamanho dos blocos de leitura
+
+    Returns:
+        Hash hexadecimal do conteúdo
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_fingerprint(config: Dict) -> str:
+    """
+    Gera a impressão digital de uma configuração de pré-processamento/OCR
+
+    Args:
+        config: Dicionário com as opções que afetam o resultado do OCR
+
+    Returns:
+        Hash curto e estável da configuração
+    """
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class OCRCache:
+    """
+    Cache de resultados OCR armazenado em um arquivo SQLite local
+    """
+
+    def __init__(self, db_path: str = 'cache/ocr_cache.sqlite', max_entries: int = 100000,
+                 max_age_days: float = 30, max_size_mb: float = 200):
+        """
+        Inicializa o cache (a conexão é aberta no primeiro uso)
+
+        Args:
+            db_path: Caminho para o arquivo SQLite
+            max_entries: Número máximo de entradas mantidas
+            max_age_days: Idade máxima de uma entrada, em dias
+            max_size_mb: Tamanho máximo dos resultados armazenados, em MB
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._conn = None
+        self._puts_since_eviction = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre a conexão e cria a tabela se necessário
+
+        A conexão é preguiçosa para que cada processo do pool abra a sua.
+
+        Returns:
+            Conexão SQLite
+        """
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_cache (
+                    chave TEXT PRIMARY KEY,
+                    resultado TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado_em REAL NOT NULL,
+                    acessado_em REAL NOT NULL
+                )
+            """)
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_acessado ON ocr_cache (acessado_em)')
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Busca um resultado no cache
+
+        Args:
+            key: Chave do cache
+
+        Returns:
+            Resultado armazenado ou None se ausente/expirado
+        """
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT resultado, criado_em FROM ocr_cache WHERE chave = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row[1] > self.max_age_seconds:
+            conn.execute('DELETE FROM ocr_cache WHERE chave = ?', (key,))
+            conn.commit()
+            return None
+
+        conn.execute('UPDATE ocr_cache SET acessado_em = ? WHERE chave = ?', (now, key))
+        conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict):
+        """
+        Armazena um resultado no cache
+
+        Args:
+            key: Chave do cache
+            result: Resultado a armazenar
+        """
+        conn = self._connect()
+        payload = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        conn.execute(
+            'INSERT OR REPLACE INTO ocr_cache VALUES (?, ?, ?, ?, ?)',
+            (key, payload, len(payload), now, now)
+        )
+        conn.commit()
+
+        # Remoção periódica, para não pagar o custo a cada inserção
+        self._puts_since_eviction += 1
+        if self._puts_since_eviction >= 100:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove entradas expiradas e as menos acessadas acima dos limites
+        """
+        conn = self._connect()
+        self._puts_since_eviction = 0
+
+        conn.execute('DELETE FROM ocr_cache WHERE criado_em < ?', (time.time() - self.max_age_seconds,))
+
+        count, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM ocr_cache').fetchone()
+        if count > self.max_entries or size > self.max_size_bytes:
+            # Remove as menos acessadas até voltar a ~90% dos limites
+            keep = min(int(self.max_entries * 0.9), int(count * self.max_size_bytes * 0.9 / max(size, 1)))
+            conn.execute(
+                'DELETE FROM ocr_cache WHERE chave IN ('
+                'SELECT chave FROM ocr_cache ORDER BY acessado_em ASC LIMIT ?)',
+                (count - keep,)
+            )
+            logger.info(f"Cache OCR: {count - keep} entradas removidas")
+
+        conn.commit()
+
+    def close(self):
+        """
+        Fecha a conexão com o banco
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Client - Cliente leve do daemon OCR (somente biblioteca padrão)
+Encaminha pedidos ao daemon aquecido sem importar OpenCV nem openpyxl
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+# Arquivo onde o daemon anuncia endereço e PID (no diretório de trabalho)
+DEFAULT_STATE_FILE = '.ocr_daemon.json'
+
+
+class DaemonUnavailable(Exception):
+    """
+    O daemon recusou a conexão: o pedido não chegou a ser recebido
+    e pode ser processado localmente
+    """
+
+
+def write_state(address: str, state_file: str = DEFAULT_STATE_FILE):
+    """
+    Anuncia o daemon em execução (chamado pelo próprio daemon)
+
+    Args:
+        address: URL base do daemon (ex.: http://127.0.0.1:8765)
+        state_file: Caminho do arquivo de estado
+    """
+    state = {'url': address, 'pid': os.getpid()}
+    tmp_path = f"{state_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_file)
+
+
+def remove_state(state_file: str = DEFAULT_STATE_FILE):
+    """
+    Remove o anúncio do daemon, se ainda for deste processo
+
+    Args:
+        state_file: Caminho do arquivo de estado
+    """
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            if json.load(f).get('pid') == os.getpid():
+                os.remove(state_file)
+    except (OSError, ValueError):
+        pass
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == 'nt':
+        # os.kill(pid, 0) não existe no Windows; a verificação de saúde decide
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def find_daemon(state_file: str = DEFAULT_STATE_FILE, timeout: float = 0.5) -> Optional[str]:
+    """
+    Localiza um daemon ativo pelo arquivo de estado
+
+    Args:
+        state_file: Caminho do arquivo de estado
+        timeout: Tempo máximo da verificação de saúde, em segundos
+
+    Returns:
+        URL base do daemon ou None se nenhum estiver respondendo
+    """
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not state.get('url') or not _pid_alive(int(state.get('pid', 0))):
+        return None
+
+    try:
+        with urllib.request.urlopen(f"{state['url']}/health", timeout=timeout) as response:
+            return state['url'] if response.status == 200 else None
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+def _error_response(message: str) -> Dict:
+    return {"success": False, "message": message, "data": None}
+
+
+def _request(url: str, data: Optional[bytes] = None, headers: Optional[Dict] = None,
+             timeout: float = 3600) -> Dict:
+    """
+    Envia um pedido ao daemon e devolve a resposta JSON
+
+    Falhas de rede, tempo esgotado e respostas que não são JSON viram uma
+    resposta de erro no formato do Power Automate.
+
+    Args:
+        url: URL completa
+        data: Corpo do pedido (POST) ou None (GET)
+        headers: Cabeçalhos HTTP
+        timeout: Tempo máximo de espera, em segundos
+
+    Returns:
+        Resposta do daemon ou resposta de erro
+
+    Raises:
+        DaemonUnavailable: Conexão recusada (daemon encerrado após a verificação de saúde)
+    """
+    request = urllib.request.Request(url, data=data, headers=headers or {},
+                                     method='POST' if data is not None else 'GET')
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        # Erros do daemon também vêm em JSON, no formato do Power Automate
+        try:
+            return json.loads(e.read().decode('utf-8'))
+        except (OSError, ValueError):
+            return _error_response(f"Daemon respondeu HTTP {e.code}")
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, ConnectionRefusedError):
+            raise DaemonUnavailable(str(e.reason)) from e
+        return _error_response(f"Falha na comunicação com o daemon: {e.reason}")
+    except ConnectionRefusedError as e:
+        raise DaemonUnavailable(str(e)) from e
+    except (OSError, ValueError) as e:
+        # Inclui tempo esgotado, conexão interrompida e resposta que não é JSON
+        return _error_response(f"Falha na comunicação com o daemon: {str(e)}")
+
+
+def submit(base_url: str, input_path: str, wait: bool = True, incremental: Optional[bool] = None,
+           resume: bool = False, priority: Optional[int] = None, timeout: float = 3600) -> Dict:
+    """
+    Envia uma imagem ou pasta (já acessível ao daemon) para processamento
+
+    Args:
+        base_url: URL base do daemon
+        input_path: Imagem ou pasta a processar
+        wait: Aguarda a conclusão e devolve a resposta final
+        incremental: Processa só imagens novas/alteradas (padrão: config do daemon)
+        resume: Retoma uma execução interrompida a partir do checkpoint
+        priority: Prioridade do job (padrão: conforme o tipo, na config do daemon)
+        timeout: Tempo máximo de espera, em segundos
+
+    Returns:
+        Resposta do Power Automate (ou o estado do job, sem wait)
+    """
+    payload = {'path': str(Path(input_path).resolve()), 'wait': wait, 'resume': resume}
+    if incremental is not None:
+        payload['incremental'] = incremental
+    if priority is not None:
+        payload['priority'] = priority
+    return _request(
+        f"{base_url}/process?timeout={timeout}",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        timeout=timeout + 5
+    )
+
+
+def job_status(base_url: str, job_id: str) -> Dict:
+    """
+    Consulta um job
+
+    Args:
+        base_url: URL base do daemon
+        job_id: Identificador devolvido por submit(wait=False)
+
+    Returns:
+        Resposta do Power Automate se concluído, senão o estado do job
+    """
+    return _request(f"{base_url}/jobs/{job_id}", timeout=10)
+
+
+def wait_for_job(base_url: str, response: Dict, poll_interval: float = 2.0) -> Dict:
+    """
+    Acompanha um job até a resposta final
+
+    submit devolve o estado do job (sem 'success') quando não espera ou
+    quando a espera do daemon expira; aqui o job é consultado até terminar.
+
+    Args:
+        base_url: URL base do daemon
+        response: Resposta de submit ou job_status
+        poll_interval: Intervalo entre consultas, em segundos
+
+    Returns:
+        Resposta do Power Automate (ou de erro)
+    """
+    while 'success' not in response and 'job_id' in response:
+        time.sleep(poll_interval)
+        response = job_status(base_url, response['job_id'])
+    return response
+
+
+def main():
+    """
+    Função principal para execução via linha de comando
+    """
+    parser = argparse.ArgumentParser(description='Cliente do daemon OCR de latas')
+    parser.add_argument('input_path', nargs='?', help='Caminho para imagem ou pasta com imagens')
+    parser.add_argument('--job', help='Consulta o estado de um job')
+    parser.add_argument('--no-wait', action='store_true', help='Não aguarda a conclusão do job')
+    parser.add_argument('--priority', type=int, help='Prioridade do job (maior = mais urgente)')
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE, help='Arquivo de estado do daemon')
+    args = parser.parse_args()
+
+    if not args.input_path and not args.job:
+        parser.error('informe input_path ou --job')
+
+    base_url = find_daemon(args.state_file)
+    not_running = _error_response("Daemon OCR não está em execução")
+    if base_url is None:
+        print(json.dumps(not_running, ensure_ascii=False))
+        sys.exit(2)
+
+    try:
+        if args.job:
+            response = job_status(base_url, args.job)
+        else:
+            response = submit(base_url, args.input_path, wait=not args.no_wait, priority=args.priority)
+    except DaemonUnavailable:
+        print(json.dumps(not_running, ensure_ascii=False))
+        sys.exit(2)
+
+    print(json.dumps(response, ensure_ascii=False))
+    sys.exit(0 if response.get('success', True) else 1)
+
+
+if __name__ == "__main__":
+    main()
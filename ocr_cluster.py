@@ -0,0 +1,739 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Cluster - Processamento distribuído por várias máquinas
+Coordenador e workers trocam shards, leases e resultados por um diretório compartilhado
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ocr_processor import JsonlResultWriter, OCRProcessor, load_config
+
+logger = logging.getLogger(__name__)
+
+# Padrões da seção 'cluster' do settings.json
+DEFAULT_SHARD_SIZE = 200
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETENTION_DAYS = 7
+
+
+def _write_json_atomic(path: Path, data: Dict):
+    """
+    Grava um JSON por arquivo temporário + rename (leitores nunca veem meio arquivo)
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class SharedDirectory:
+    """
+    Estado de um job distribuído, em um subdiretório da fila compartilhada (NFS/SMB)
+
+    Estrutura:
+        job.json                      Pasta de entrada, número de shards e duração do lease
+        shards/NNNNN.json             Imagens de cada shard
+        claims/NNNNN.lease            Lease do worker que processa o shard (criado com
+                                      O_EXCL; o worker renova a data de modificação)
+        results/NNNNN.<worker>.partial  Resultados gravados à medida que terminam
+        results/NNNNN.jsonl           Resultados finais do shard
+        done/NNNNN.json               Marca de shard finalizado
+        resposta.json                 Resposta do coordenador (job encerrado)
+
+    Só o coordenador quebra leases vencidos; um worker que perde o lease
+    abandona o shard, e quem o assumir reaproveita os resultados parciais.
+    Como a validade do lease é medida pela data de modificação, os relógios
+    das máquinas devem divergir bem menos que 'lease_seconds'.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Diretório do job
+        """
+        self.root = Path(root)
+        self.job_id = self.root.name
+        self.job_path = self.root / 'job.json'
+        self.shards_dir = self.root / 'shards'
+        self.claims_dir = self.root / 'claims'
+        self.results_dir = self.root / 'results'
+        self.done_dir = self.root / 'done'
+
+    @staticmethod
+    def shard_name(shard: int) -> str:
+        return f"{shard:05d}"
+
+    def lease_path(self, shard: int) -> Path:
+        return self.claims_dir / f"{self.shard_name(shard)}.lease"
+
+    def result_path(self, shard: int) -> Path:
+        return self.results_dir / f"{self.shard_name(shard)}.jsonl"
+
+    def partial_path(self, shard: int, worker: str) -> Path:
+        return self.results_dir / f"{self.shard_name(shard)}.{worker}.partial"
+
+    def done_path(self, shard: int) -> Path:
+        return self.done_dir / f"{self.shard_name(shard)}.json"
+
+    def load_job(self) -> Optional[Dict]:
+        try:
+            with open(self.job_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def create_job(self, input_folder: str, image_files: List[Path], shard_size: int,
+                   lease_seconds: float) -> Dict:
+        """
+        Divide as imagens em shards e publica o job (job.json é gravado por último)
+
+        Args:
+            input_folder: Pasta de entrada
+            image_files: Imagens da pasta
+            shard_size: Imagens por shard
+            lease_seconds: Validade de um lease sem renovação
+
+        Returns:
+            Conteúdo de job.json
+        """
+        for folder in (self.shards_dir, self.claims_dir, self.results_dir, self.done_dir):
+            folder.mkdir(parents=True, exist_ok=True)
+
+        paths = [str(Path(image_file).resolve()) for image_file in image_files]
+        shards = [paths[i:i + shard_size] for i in range(0, len(paths), shard_size)]
+        for shard, images in enumerate(shards):
+            _write_json_atomic(self.shards_dir / f"{self.shard_name(shard)}.json", {'imagens': images})
+
+        job = {
+            'entrada': str(Path(input_folder).resolve()),
+            'total_imagens': len(paths),
+            'shards': len(shards),
+            'shard_size': shard_size,
+            'lease_seconds': lease_seconds,
+            'criado_em': datetime.now().isoformat()
+        }
+        _write_json_atomic(self.job_path, job)
+        return job
+
+    @property
+    def response_path(self) -> Path:
+        return self.root / 'resposta.json'
+
+    def is_closed(self) -> bool:
+        return self.response_path.exists()
+
+    def cleanup(self):
+        """
+        Remove shards, leases e resultados de um job encerrado
+
+        Ficam só job.json e resposta.json: os resultados já foram juntados
+        nos arquivos de saída do coordenador.
+        """
+        for folder in (self.shards_dir, self.claims_dir, self.results_dir, self.done_dir):
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def shard_images(self, shard: int) -> List[str]:
+        with open(self.shards_dir / f"{self.shard_name(shard)}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)['imagens']
+
+    def is_done(self, shard: int) -> bool:
+        return self.done_path(shard).exists()
+
+    def pending_shards(self, job: Dict) -> List[int]:
+        return [shard for shard in range(job['shards']) if not self.is_done(shard)]
+
+    def claim(self, shard: int, worker: str) -> bool:
+        """
+        Tenta reservar um shard criando o arquivo de lease com O_EXCL
+
+        Args:
+            shard: Número do shard
+            worker: Identificação do worker
+
+        Returns:
+            True se o lease foi obtido
+        """
+        try:
+            fd = os.open(self.lease_path(shard), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'worker': worker, 'inicio': datetime.now().isoformat()}, f)
+
+        # Outro worker pode ter finalizado o shard entre a listagem e a reserva
+        if self.is_done(shard):
+            self.release(shard, worker)
+            return False
+        return True
+
+    def lease_owner(self, shard: int) -> Optional[str]:
+        """
+        Worker registrado no lease do shard
+
+        Returns:
+            Identificação do worker ou None (sem lease, ou lease ainda sendo gravado)
+        """
+        try:
+            with open(self.lease_path(shard), 'r', encoding='utf-8') as f:
+                return json.load(f).get('worker')
+        except (OSError, ValueError):
+            return None
+
+    def renew(self, shard: int, worker: str) -> bool:
+        """
+        Renova o lease, se ainda pertencer a este worker
+
+        O coordenador pode ter quebrado o lease e outro worker o recriado;
+        nesse caso o arquivo existe, mas registra outro dono.
+
+        Args:
+            shard: Número do shard
+            worker: Identificação do worker
+
+        Returns:
+            True se o lease é deste worker e foi renovado
+        """
+        if self.lease_owner(shard) != worker:
+            return False
+        try:
+            os.utime(self.lease_path(shard))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def release(self, shard: int, worker: Optional[str] = None):
+        """
+        Remove o lease do shard
+
+        Args:
+            shard: Número do shard
+            worker: Remove só se o lease for deste worker (None: remove sempre)
+        """
+        if worker is not None and self.lease_owner(shard) != worker:
+            return
+        try:
+            self.lease_path(shard).unlink()
+        except FileNotFoundError:
+            pass
+
+    def load_partials(self, shard: int) -> Dict[str, Dict]:
+        """
+        Junta os resultados parciais de todos os workers que já pegaram o shard
+
+        Returns:
+            Dicionário caminho absoluto -> resultado
+        """
+        done = {}
+        for partial in sorted(self.results_dir.glob(f"{self.shard_name(shard)}.*.partial")):
+            done.update(OCRProcessor.load_checkpoint(str(partial)))
+        return done
+
+    def finish(self, shard: int, results: List[Dict], worker: str, failed: bool = False):
+        """
+        Publica os resultados finais de um shard e o marca como finalizado
+
+        Args:
+            shard: Número do shard
+            results: Resultados na ordem das imagens do shard
+            worker: Quem finalizou (worker ou coordenador)
+            failed: Shard desistido após esgotar as tentativas
+        """
+        result_path = self.result_path(shard)
+        tmp_path = result_path.with_name(f"{result_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, result_path)
+
+        _write_json_atomic(self.done_path(shard), {
+            'worker': worker,
+            'total': len(results),
+            'falhou': failed,
+            'concluido_em': datetime.now().isoformat()
+        })
+
+        for partial in self.results_dir.glob(f"{self.shard_name(shard)}.*.partial"):
+            partial.unlink(missing_ok=True)
+        self.release(shard, None if failed else worker)
+
+    def break_expired_leases(self, lease_seconds: float) -> List[int]:
+        """
+        Remove os leases não renovados dentro do prazo (worker parado ou perdido)
+
+        O lease é renomeado antes de ser apagado: se o worker renová-lo ao
+        mesmo tempo, só um dos dois vê o arquivo.
+
+        Args:
+            lease_seconds: Validade de um lease sem renovação
+
+        Returns:
+            Shards liberados
+        """
+        expired = []
+        now = time.time()
+        for lease in self.claims_dir.glob('*.lease'):
+            try:
+                if now - lease.stat().st_mtime < lease_seconds:
+                    continue
+                stale = lease.with_name(f"{lease.name}.{os.getpid()}.vencido")
+                os.rename(lease, stale)
+                stale.unlink()
+            except FileNotFoundError:
+                continue
+            expired.append(int(lease.stem))
+        return expired
+
+    def merged_results(self, job: Dict) -> List[Dict]:
+        """
+        Lê os resultados de todos os shards, na ordem das imagens da pasta
+        """
+        results = []
+        for shard in range(job['shards']):
+            with open(self.result_path(shard), 'r', encoding='utf-8') as f:
+                results.extend(json.loads(line) for line in f if line.strip())
+        return results
+
+
+class SharedQueue:
+    """
+    Fila de jobs distribuídos em um diretório compartilhado
+
+    Cada job ocupa jobs/<id>/ (ver SharedDirectory), com id iniciado pela
+    data de criação: os workers atendem os jobs em ordem de chegada e
+    continuam aguardando novos jobs depois que a fila esvazia. Jobs
+    encerrados ficam só com job.json e resposta.json até 'retention_days'.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Diretório compartilhado entre coordenadores e workers
+        """
+        self.root = Path(root)
+        self.jobs_dir = self.root / 'jobs'
+
+    def jobs(self) -> List[SharedDirectory]:
+        """
+        Jobs publicados, do mais antigo ao mais recente
+        """
+        if not self.jobs_dir.is_dir():
+            return []
+        return [SharedDirectory(str(path)) for path in sorted(self.jobs_dir.iterdir()) if path.is_dir()]
+
+    def open_jobs(self) -> List[SharedDirectory]:
+        """
+        Jobs publicados e ainda não encerrados pelo coordenador
+        """
+        return [shared for shared in self.jobs() if shared.job_path.exists() and not shared.is_closed()]
+
+    def create_job(self, input_folder: str, image_files: List[Path], shard_size: int,
+                   lease_seconds: float) -> SharedDirectory:
+        """
+        Publica um novo job no fim da fila
+
+        Args:
+            input_folder: Pasta de entrada
+            image_files: Imagens da pasta
+            shard_size: Imagens por shard
+            lease_seconds: Validade de um lease sem renovação
+
+        Returns:
+            Diretório do job criado
+        """
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}-{socket.gethostname()}-{os.getpid()}"
+        root = self.jobs_dir / job_id
+        root.mkdir()
+        shared = SharedDirectory(str(root))
+        shared.create_job(input_folder, image_files, shard_size, lease_seconds)
+        return shared
+
+    def find_open(self, input_folder: str) -> Optional[SharedDirectory]:
+        """
+        Job não encerrado da pasta (coordenador reiniciado)
+        """
+        entrada = str(Path(input_folder).resolve())
+        for shared in self.open_jobs():
+            job = shared.load_job()
+            if job is not None and job['entrada'] == entrada:
+                return shared
+        return None
+
+    def discard(self, input_folder: str) -> int:
+        """
+        Remove os jobs não encerrados da pasta
+
+        Returns:
+            Número de jobs removidos
+        """
+        entrada = str(Path(input_folder).resolve())
+        discarded = 0
+        for shared in self.open_jobs():
+            job = shared.load_job()
+            if job is not None and job['entrada'] == entrada:
+                shutil.rmtree(shared.root, ignore_errors=True)
+                discarded += 1
+        return discarded
+
+    def purge(self, max_age_days: float = DEFAULT_RETENTION_DAYS) -> int:
+        """
+        Remove os jobs encerrados há mais que o limite
+
+        Args:
+            max_age_days: Idade máxima, em dias, de um job encerrado
+
+        Returns:
+            Número de jobs removidos
+        """
+        limit = time.time() - max_age_days * 86400
+        removed = 0
+        for shared in self.jobs():
+            try:
+                if shared.response_path.stat().st_mtime >= limit:
+                    continue
+            except FileNotFoundError:
+                continue
+            shutil.rmtree(shared.root, ignore_errors=True)
+            removed += 1
+        return removed
+
+    def claim_next(self, worker: str, jobs: Optional[List[SharedDirectory]] = None):
+        """
+        Reserva o primeiro shard livre, do job mais antigo ao mais recente
+
+        Args:
+            worker: Identificação do worker
+            jobs: Jobs considerados (padrão: todos os não encerrados)
+
+        Returns:
+            (diretório do job, job.json, shard) ou None se não há shard livre
+        """
+        for shared in (self.open_jobs() if jobs is None else jobs):
+            job = shared.load_job()
+            if job is None:
+                continue
+            try:
+                for shard in shared.pending_shards(job):
+                    if shared.claim(shard, worker):
+                        return shared, job, shard
+            except FileNotFoundError:
+                # Job descartado (--reset) durante a busca
+                continue
+        return None
+
+
+class _LeaseKeeper(threading.Thread):
+    """
+    Renova o lease de um shard em segundo plano enquanto ele é processado
+    """
+
+    def __init__(self, shared: SharedDirectory, shard: int, worker: str, interval: float):
+        super().__init__(name='ocr-lease', daemon=True)
+        self.shared = shared
+        self.shard = shard
+        self.worker = worker
+        self.interval = interval
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            if not self.shared.renew(self.shard, self.worker):
+                # Lease quebrado pelo coordenador: outro worker pode assumir o shard
+                logger.warning(f"Lease perdido: {self.shared.lease_path(self.shard).name}")
+                self.lost = True
+                return
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _error_result(path: str, message: str) -> Dict:
+    return {
+        'arquivo': Path(path).name,
+        'caminho_completo': path,
+        'texto_extraido': '',
+        'texto_limpo': '',
+        'observacao': f"ERRO: {message}",
+        'status': 'erro'
+    }
+
+
+def process_shard(shared: SharedDirectory, processor: OCRProcessor, shard: int, worker: str,
+                  lease_seconds: float) -> bool:
+    """
+    Processa um shard reservado, reaproveitando resultados parciais de workers anteriores
+
+    Args:
+        shared: Diretório compartilhado
+        processor: Processador OCR do worker
+        shard: Número do shard (já reservado por este worker)
+        worker: Identificação do worker
+        lease_seconds: Validade do lease (renovado a cada terço desse tempo)
+
+    Returns:
+        True se o shard foi finalizado, False se o lease foi perdido
+    """
+    images = shared.shard_images(shard)
+    done = shared.load_partials(shard)
+    pending = [path for path in images if path not in done]
+    if len(pending) < len(images):
+        logger.info(f"Shard {shard}: {len(images) - len(pending)} imagens já processadas por outro worker")
+
+    keeper = _LeaseKeeper(shared, shard, worker, lease_seconds / 3)
+    keeper.start()
+    try:
+        with JsonlResultWriter(str(shared.partial_path(shard, worker)), append=True, fsync=True,
+                               write_summary=False) as writer:
+            for result in processor.iter_files(pending):
+                writer.write(result)
+                done[str(Path(result['caminho_completo']).resolve())] = result
+                if keeper.lost:
+                    return False
+    finally:
+        keeper.stop()
+
+    # Confere o lease logo antes de publicar: se venceu entre duas renovações,
+    # o shard é de outro worker (ou do coordenador) e os parciais já bastam
+    if keeper.lost or not shared.renew(shard, worker):
+        logger.warning(f"Worker {worker}: lease do shard {shard} perdido; shard abandonado")
+        return False
+
+    results = [done.get(path) or _error_result(path, 'resultado ausente') for path in images]
+    shared.finish(shard, results, worker)
+    return True
+
+
+def run_worker(shared_dir: str, processor: OCRProcessor, worker: Optional[str] = None,
+               poll_interval: float = DEFAULT_POLL_INTERVAL, once: bool = False,
+               should_stop=None) -> int:
+    """
+    Reserva e processa shards dos jobs da fila compartilhada
+
+    O worker fica em execução aguardando novos jobs, com o pool de OCR
+    aquecido; pode ser iniciado antes dos coordenadores.
+
+    Args:
+        shared_dir: Diretório compartilhado
+        processor: Processador OCR (pool de processos já configurado)
+        worker: Identificação única do worker (padrão: host-pid)
+        poll_interval: Intervalo entre verificações, em segundos
+        once: Encerra quando o primeiro job atendido não tiver mais shards pendentes
+        should_stop: Função sem argumentos que encerra o worker ao retornar True
+
+    Returns:
+        Número de shards processados por este worker
+    """
+    queue = SharedQueue(shared_dir)
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    should_stop = should_stop or (lambda: False)
+    logger.info(f"Worker {worker}: aguardando jobs em {queue.root}")
+
+    processed = 0
+    first_job = None
+    while not should_stop():
+        jobs = None
+        if once and first_job is not None:
+            job = first_job.load_job()
+            if job is None or not first_job.pending_shards(job):
+                break
+            jobs = [first_job]
+
+        claimed = queue.claim_next(worker, jobs)
+        if claimed is None:
+            # Fila vazia ou tudo reservado por outros workers: aguarda
+            time.sleep(poll_interval)
+            continue
+
+        shared, job, shard = claimed
+        first_job = first_job or shared
+        logger.info(f"Worker {worker}: shard {shard} do job {shared.job_id} reservado "
+                    f"({job['shards']} shards de {job['entrada']})")
+        try:
+            if process_shard(shared, processor, shard, worker, job['lease_seconds']):
+                processed += 1
+                logger.info(f"Worker {worker}: shard {shard} do job {shared.job_id} finalizado")
+        except OSError as e:
+            # Job descartado (--reset) ou diretório compartilhado indisponível
+            logger.error(f"Worker {worker}: shard {shard} do job {shared.job_id} interrompido: {str(e)}")
+            shared.release(shard, worker)
+            time.sleep(poll_interval)
+
+    logger.info(f"Worker {worker}: encerrado ({processed} shards processados aqui)")
+    return processed
+
+
+def run_coordinator(integration, input_folder: str, shared_dir: str, shard_size: int = DEFAULT_SHARD_SIZE,
+                    lease_seconds: float = DEFAULT_LEASE_SECONDS, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                    poll_interval: float = DEFAULT_POLL_INTERVAL,
+                    retention_days: float = DEFAULT_RETENTION_DAYS) -> Dict:
+    """
+    Divide a pasta em shards, acompanha os leases e junta os resultados
+
+    O job entra no fim da fila compartilhada. Se a fila já contém um job
+    não encerrado desta pasta, o acompanhamento é retomado (coordenador
+    reiniciado).
+
+    Args:
+        integration: PowerAutomateIntegration (gera JSON, Excel e CSV)
+        input_folder: Pasta com imagens
+        shared_dir: Diretório compartilhado com os workers
+        shard_size: Imagens por shard
+        lease_seconds: Validade de um lease sem renovação
+        max_attempts: Leases vencidos tolerados por shard antes de desistir dele
+        poll_interval: Intervalo entre verificações, em segundos
+        retention_days: Dias que um job encerrado (job.json e resposta.json) fica na fila
+
+    Returns:
+        Resposta formatada para Power Automate
+    """
+    queue = SharedQueue(shared_dir)
+    shared = queue.find_open(input_folder)
+
+    if shared is None:
+        image_files = integration.ocr_processor.find_images(input_folder)
+        shared = queue.create_job(input_folder, image_files, shard_size, lease_seconds)
+        job = shared.load_job()
+        logger.info(f"Job {shared.job_id} publicado: {job['total_imagens']} imagens em {job['shards']} shards")
+    else:
+        job = shared.load_job()
+        logger.info(f"Retomando job {shared.job_id}: {len(shared.pending_shards(job))} shards pendentes")
+
+    attempts: Dict[int, int] = {}
+    last_pending = None
+    while True:
+        pending = shared.pending_shards(job)
+        if not pending:
+            break
+        if len(pending) != last_pending:
+            logger.info(f"Progresso: {job['shards'] - len(pending)}/{job['shards']} shards finalizados")
+            last_pending = len(pending)
+
+        for shard in shared.break_expired_leases(job['lease_seconds']):
+            attempts[shard] = attempts.get(shard, 0) + 1
+            if attempts[shard] < max_attempts:
+                logger.warning(f"Lease do shard {shard} venceu (tentativa {attempts[shard]}); shard liberado")
+                continue
+
+            # Provável imagem que derruba o worker: finaliza com o que já foi processado
+            logger.error(f"Shard {shard} desistido após {attempts[shard]} leases vencidos")
+            done = shared.load_partials(shard)
+            results = [done.get(path) or _error_result(path, 'worker não concluiu o shard')
+                       for path in shared.shard_images(shard)]
+            shared.finish(shard, results, 'coordenador', failed=True)
+
+        time.sleep(poll_interval)
+
+    results = shared.merged_results(job)
+    logger.info(f"Todos os shards finalizados: {len(results)} resultados")
+
+    response = integration.save_power_automate_response(integration.build_outputs(results))
+    _write_json_atomic(shared.response_path, response)
+
+    # Resultados já estão na pasta de saída: o job encerrado fica só como registro
+    shared.cleanup()
+    removed = queue.purge(retention_days)
+    if removed:
+        logger.info(f"{removed} jobs encerrados antigos removidos de {queue.jobs_dir}")
+    return response
+
+
+def main():
+    """
+    Função principal para execução via linha de comando
+    """
+    parser = argparse.ArgumentParser(description='OCR de latas distribuído por várias máquinas')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    coordinator = subparsers.add_parser('coordinator', help='Divide a pasta em shards e junta os resultados')
+    coordinator.add_argument('input_path', help='Pasta com imagens')
+    coordinator.add_argument('shared_dir', help='Diretório compartilhado com os workers')
+    coordinator.add_argument('--shard-size', type=int, help='Imagens por shard')
+    coordinator.add_argument('--lease-seconds', type=float, help='Validade de um lease sem renovação')
+    coordinator.add_argument('--reset', action='store_true',
+                             help='Descarta um job não encerrado da mesma pasta em vez de retomá-lo')
+    coordinator.add_argument('--power-automate', action='store_true', help='Modo Power Automate (retorna JSON)')
+
+    worker = subparsers.add_parser('worker', help='Processa shards do diretório compartilhado')
+    worker.add_argument('shared_dir', help='Diretório compartilhado com o coordenador')
+    worker.add_argument('-w', '--workers', type=int, help='Número de processos paralelos de OCR (0 = todos os núcleos)')
+    worker.add_argument('--id', help='Identificação do worker (padrão: host-pid)')
+    worker.add_argument('--once', action='store_true', help='Encerra ao concluir o primeiro job atendido')
+
+    for subparser in (coordinator, worker):
+        subparser.add_argument('-c', '--config', help='Caminho para arquivo de configuração')
+
+    args = parser.parse_args()
+
+    if args.command == 'worker':
+        config = load_config(args.config)
+        options = config.get('cluster', {})
+        processor = OCRProcessor(
+            tesseract_path=config.get('tesseract_path') or None,
+            config=config,
+            workers=args.workers
+        )
+        processor.start_pool()
+        try:
+            run_worker(args.shared_dir, processor, worker=args.id,
+                       poll_interval=options.get('poll_interval', DEFAULT_POLL_INTERVAL), once=args.once)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            processor.close()
+        return
+
+    from power_automate_integration import PowerAutomateIntegration
+
+    integration = PowerAutomateIntegration(config_path=args.config)
+    options = integration.config.get('cluster', {})
+    if args.reset:
+        SharedQueue(args.shared_dir).discard(args.input_path)
+
+    try:
+        response = run_coordinator(
+            integration, args.input_path, args.shared_dir,
+            shard_size=args.shard_size or options.get('shard_size', DEFAULT_SHARD_SIZE),
+            lease_seconds=args.lease_seconds or options.get('lease_seconds', DEFAULT_LEASE_SECONDS),
+            max_attempts=options.get('max_attempts', DEFAULT_MAX_ATTEMPTS),
+            poll_interval=options.get('poll_interval', DEFAULT_POLL_INTERVAL),
+            retention_days=options.get('retention_days', DEFAULT_RETENTION_DAYS)
+        )
+    except Exception as e:
+        response = {"success": False, "message": f"Erro no processamento: {str(e)}", "data": None}
+
+    if args.power_automate:
+        print(json.dumps(response, ensure_ascii=False))
+    elif response.get('success'):
+        data = response['data']
+        print("✅ Processamento distribuído concluído!")
+        print(f"📊 Total de imagens: {data['total_images']}")
+        print(f"✅ Sucessos: {data['successful_ocr']}")
+        print(f"❌ Erros: {data['failed_ocr']}")
+        print(f"📄 JSON: {data['files_generated']['json_results']}")
+        print(f"📊 Excel: {data['files_generated']['excel_report']}")
+        print(f"📋 CSV: {data['files_generated']['csv_data']}")
+    else:
+        print(f"❌ Erro: {response.get('message')}")
+    sys.exit(0 if response.get('success') else 1)
+
+
+if __name__ == "__main__":
+    main()
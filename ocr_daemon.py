@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Daemon - Servidor HTTP local que mantém o OCR aquecido
+Evita o custo de iniciar Python, OpenCV e os workers a cada chamada do Power Automate
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from job_queue import CONCLUIDO, ERRO, FASE_RELATORIO, JobQueue
+from ocr_client import DEFAULT_STATE_FILE, remove_state, write_state
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Prioridades padrão por tipo de job (maior = mais urgente)
+DEFAULT_PRIORITIES = {'imagem': 10, 'pasta': 0}
+
+
+class OCRDaemon:
+    """
+    Mantém uma PowerAutomateIntegration carregada e atende pedidos via HTTP
+
+    Os pedidos vão para uma fila SQLite durável (job_queue.JobQueue) consumida
+    por um único thread de processamento; jobs interrompidos por um reinício
+    voltam à fila ao iniciar.
+
+    Endpoints (somente localhost):
+        POST /process         JSON {"path": ..., "priority": ...} ou bytes da imagem (?name=&wait=&priority=)
+        GET  /jobs/{id}       Resposta de create_power_automate_response (202 enquanto em andamento)
+        GET  /health          Estado do daemon
+    """
+
+    def __init__(self, integration, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 state_file: str = DEFAULT_STATE_FILE):
+        """
+        Inicializa o daemon (o servidor só atende após serve_forever)
+
+        Args:
+            integration: Instância de PowerAutomateIntegration já configurada
+            host: Endereço de escuta (padrão: apenas localhost)
+            port: Porta TCP
+            state_file: Arquivo onde o endereço é anunciado aos clientes
+        """
+        self.integration = integration
+        self.state_file = state_file
+        options = integration.config.get('daemon', {})
+        self.upload_folder = Path(options.get('upload_folder', 'temp/daemon_uploads'))
+        self.max_upload_bytes = int(options.get('max_upload_mb', 50) * 1024 * 1024)
+
+        queue_options = integration.config.get('queue', {})
+        self.queue = JobQueue(queue_options.get('path', 'cache/job_queue.sqlite'),
+                              max_attempts=queue_options.get('max_attempts', 3))
+        self.retention_days = queue_options.get('retention_days', 7)
+        self.priorities = {**DEFAULT_PRIORITIES, **queue_options.get('priorities', {})}
+        # Imagens reservadas por vez: limita quanto uma imagem urgente espera atrás de uma pasta
+        self.batch_size = queue_options.get('batch_size') or 4 * integration.ocr_processor.workers
+        self.worker_id = f"daemon-{os.getpid()}"
+
+        # Um único consumidor: o processador e o gerador de relatórios não são thread-safe
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._consumer = threading.Thread(target=self._consume, name='ocr-queue', daemon=True)
+
+        handler = type('OCRRequestHandler', (_OCRRequestHandler,), {'daemon': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+
+    @property
+    def address(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def submit(self, input_path: str, incremental: Optional[bool] = None, resume: bool = False,
+               priority: Optional[int] = None) -> int:
+        """
+        Enfileira um processamento
+
+        Args:
+            input_path: Imagem ou pasta a processar
+            incremental: Processa só imagens novas/alteradas (padrão: config 'incremental')
+            resume: Retoma uma execução interrompida a partir do checkpoint
+            priority: Prioridade do job (padrão: conforme o tipo, em 'queue.priorities')
+
+        Returns:
+            Identificador do job
+        """
+        kind = 'pasta' if Path(input_path).is_dir() else 'imagem'
+        if priority is None:
+            priority = self.priorities.get(kind, 0)
+
+        job_id = self.queue.submit(str(input_path), kind=kind, priority=int(priority),
+                                   params={'incremental': incremental, 'resume': resume})
+        self._wakeup.set()
+        logger.info(f"Job {job_id} enfileirado ({kind}, prioridade {priority}): {input_path}")
+        return job_id
+
+    def wait(self, job_id: int, timeout: float) -> Optional[Dict]:
+        """
+        Aguarda a finalização de um job
+
+        Args:
+            job_id: Identificador do job
+            timeout: Espera máxima, em segundos
+
+        Returns:
+            Registro do job ao finalizar ou ao esgotar o tempo
+        """
+        deadline = time.monotonic() + timeout
+        job = self.queue.get(job_id)
+        while job is not None and job['estado'] not in (CONCLUIDO, ERRO) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            job = self.queue.get(job_id)
+        return job
+
+    def _consume(self):
+        """
+        Laço do thread de processamento: reserva e executa os jobs da fila
+        """
+        while not self._stopping.is_set():
+            jobs = self.queue.claim(self.worker_id, limit=self.batch_size)
+            if not jobs:
+                self._wakeup.wait(timeout=1.0)
+                self._wakeup.clear()
+                continue
+
+            pending = {job['id']: job for job in jobs}
+            try:
+                if jobs[0]['tipo'] == 'pasta':
+                    self._run_folder(jobs[0])
+                    pending.clear()
+                else:
+                    for job_id in self._run_images(jobs):
+                        pending.pop(job_id)
+            except Exception as e:
+                logger.error(f"Erro nos jobs {', '.join(map(str, pending))}: {str(e)}")
+                for job_id, job in pending.items():
+                    self.queue.fail(job_id, str(e))
+                    if self.queue.get(job_id)['estado'] == ERRO:
+                        self._discard_upload(job)
+
+    def _respond(self, job_id: int, results: List[Dict]) -> Dict:
+        """
+        Gera os relatórios e a resposta do Power Automate para um job enviado
+
+        O id do job entra no nome dos arquivos: jobs concluídos no mesmo
+        segundo não sobrescrevem os relatórios uns dos outros.
+        """
+        outputs = self.integration.build_outputs(results, tag=f"job{job_id}")
+        return self.integration.save_power_automate_response(outputs)
+
+    def _run_folder(self, job: Dict):
+        """
+        Executa uma fase de um job de pasta
+
+        Na primeira fase a pasta é expandida em jobs de imagem; quando todos
+        terminam, a pasta volta à fila para a fase de relatório. Execuções
+        incrementais ou retomadas dependem do manifesto/checkpoint da pasta
+        inteira e rodam de uma só vez.
+
+        Args:
+            job: Job de pasta reservado
+        """
+        params = job['parametros']
+        incremental = params.get('incremental')
+        if incremental is None:
+            incremental = self.integration.config.get('incremental', False)
+
+        if job['fase'] == FASE_RELATORIO:
+            response = self._respond(job['id'], self.queue.child_results(job['id']))
+        elif incremental or params.get('resume'):
+            response = json.loads(self.integration.run_for_power_automate(
+                job['caminho'], incremental=incremental, resume=params.get('resume', False)
+            ))
+        else:
+            image_files = self.integration.ocr_processor.find_images(job['caminho'])
+            self.queue.expand(job['id'], [str(path) for path in image_files])
+            return
+
+        self.queue.complete(job['id'], response)
+        logger.info(f"Job {job['id']} concluído")
+
+    def _run_images(self, jobs: List[Dict]):
+        """
+        Processa um lote de jobs de imagem no pool de workers
+
+        Args:
+            jobs: Jobs de imagem reservados
+
+        Yields:
+            Identificador de cada job finalizado
+        """
+        results = self.integration.ocr_processor.iter_files([job['caminho'] for job in jobs])
+        for job, result in zip(jobs, results):
+            if job['pai_id'] is None:
+                # Imagem enviada diretamente: gera os relatórios como um workflow completo
+                self.queue.complete(job['id'], self._respond(job['id'], [result]))
+                self._discard_upload(job)
+                logger.info(f"Job {job['id']} concluído")
+            else:
+                self.queue.complete(job['id'], result)
+            yield job['id']
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        return self.queue.get(job_id)
+
+    def save_upload(self, data: bytes, filename: str) -> Path:
+        """
+        Grava uma imagem recebida no corpo do pedido
+
+        Args:
+            data: Bytes da imagem
+            filename: Nome sugerido pelo cliente (só o nome base é usado)
+
+        Returns:
+            Caminho do arquivo gravado
+        """
+        name = Path(filename).name or 'imagem.jpg'
+        if Path(name).suffix.lower() not in self.integration.ocr_processor.supported_extensions:
+            raise ValueError(f"Formato de imagem não suportado: {name}")
+
+        folder = self.upload_folder / uuid.uuid4().hex
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / name
+        path.write_bytes(data)
+        return path
+
+    def _discard_upload(self, job: Dict):
+        """
+        Remove a imagem enviada no corpo do pedido depois que o job é finalizado
+
+        Args:
+            job: Job de imagem (jobs com caminhos próprios do usuário são ignorados)
+        """
+        folder = Path(job['caminho']).parent
+        if folder.parent.resolve() == self.upload_folder.resolve():
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def purge_uploads(self, max_age_days: float) -> int:
+        """
+        Remove envios antigos que ficaram para trás (daemon interrompido no meio do job)
+
+        Args:
+            max_age_days: Idade máxima, em dias, de uma pasta de envio
+
+        Returns:
+            Número de pastas removidas
+        """
+        if not self.upload_folder.is_dir():
+            return 0
+        limit = time.time() - max_age_days * 86400
+        removed = 0
+        for folder in self.upload_folder.iterdir():
+            if folder.is_dir() and folder.stat().st_mtime < limit:
+                shutil.rmtree(folder, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def serve_forever(self):
+        """
+        Atende pedidos até shutdown() ou Ctrl+C
+        """
+        # Único consumidor desta fila: o que estava em processamento foi interrompido
+        self.queue.requeue_stale()
+        removed = self.queue.purge(self.retention_days)
+        if removed:
+            logger.info(f"{removed} jobs antigos removidos da fila")
+        removed = self.purge_uploads(self.retention_days)
+        if removed:
+            logger.info(f"{removed} envios antigos removidos de {self.upload_folder}")
+        self._consumer.start()
+
+        logger.info(f"Daemon OCR ouvindo em {self.address}")
+        write_state(self.address, self.state_file)
+        try:
+            self.server.serve_forever()
+        finally:
+            remove_state(self.state_file)
+            self.server.server_close()
+            # O lote em andamento termina; o restante fica na fila para o próximo início
+            self._stopping.set()
+            self._wakeup.set()
+            self._consumer.join()
+            self.queue.close()
+
+    def shutdown(self):
+        self.server.shutdown()
+
+
+class _OCRRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handler HTTP; a instância do daemon é injetada como atributo de classe
+    """
+
+    daemon: OCRDaemon = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json(status, {"success": False, "message": message, "data": None})
+
+    def _job_payload(self, job: Dict) -> Tuple[int, Dict]:
+        """
+        Resposta de um job: a do Power Automate se finalizado, senão o estado
+        """
+        if job['estado'] == CONCLUIDO:
+            return 200, job['resultado']
+        if job['estado'] == ERRO:
+            return 200, {"success": False, "message": f"Erro no processamento: {job['erro']}", "data": None}
+
+        payload = {'job_id': job['id'], 'status': job['estado'], 'prioridade': job['prioridade'],
+                   'tentativas': job['tentativas'], 'status_url': f"/jobs/{job['id']}"}
+        if job['tipo'] == 'pasta':
+            payload['progresso'] = self.daemon.queue.progress(job['id'])
+        return 202, payload
+
+    def do_GET(self):
+        parts = urlparse(self.path).path.strip('/').split('/')
+
+        if parts == ['health']:
+            self._send_json(200, {'status': 'ok', 'jobs': self.daemon.queue.counts()})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self.daemon.get_job(int(parts[1])) if parts[1].isdigit() else None
+            if job is None:
+                self._send_error(404, f"Job não encontrado: {parts[1]}")
+            else:
+                self._send_json(*self._job_payload(job))
+        else:
+            self._send_error(404, f"Rota não encontrada: {self.path}")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/process':
+            self._send_error(404, f"Rota não encontrada: {self.path}")
+            return
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length', 0))
+        if length > self.daemon.max_upload_bytes:
+            self._send_error(413, "Corpo do pedido excede o limite configurado")
+            return
+        body = self.rfile.read(length)
+
+        try:
+            if self.headers.get('Content-Type', '').startswith('application/json'):
+                # Caminho de imagem ou pasta já acessível ao daemon
+                request = json.loads(body or b'{}')
+                if not request.get('path'):
+                    raise ValueError("Campo 'path' obrigatório")
+                input_path = request['path']
+                if not Path(input_path).exists():
+                    raise ValueError(f"Caminho não encontrado: {input_path}")
+                wait = request.get('wait', query.get('wait'))
+                incremental = request.get('incremental')
+                resume = bool(request.get('resume', False))
+                priority = request.get('priority', query.get('priority'))
+            else:
+                # Bytes da imagem no corpo do pedido
+                if not body:
+                    raise ValueError("Corpo vazio: envie JSON com 'path' ou os bytes da imagem")
+                input_path = str(self.daemon.save_upload(body, query.get('name', 'imagem.jpg')))
+                wait = query.get('wait')
+                incremental, resume = None, False
+                priority = query.get('priority')
+            if priority is not None:
+                priority = int(priority)
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+
+        job_id = self.daemon.submit(input_path, incremental=incremental, resume=resume, priority=priority)
+
+        if str(wait).lower() in ('1', 'true', 'yes', 'sim'):
+            job = self.daemon.wait(job_id, timeout=float(query.get('timeout', 600)))
+        else:
+            job = self.daemon.get_job(job_id)
+
+        self._send_json(*self._job_payload(job))
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Engines - Motores de reconhecimento intercambiáveis
+Cada motor implementa recognize(imagem) -> (texto, confiança, caixas)
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import logging
+import shlex
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+# Backend Tesseract em processo (opcional): pip install tesserocr
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(__name__)
+
+# Resultado de um motor: (texto, confiança 0-100 ou -1 se desconhecida, caixas)
+RecognitionResult = Tuple[str, float, List[Dict]]
+
+
+def _parse_tesseract_config(config: str) -> Tuple[Optional[int], Optional[int], Dict[str, str]]:
+    """
+    Converte a string de configuração do Tesseract (estilo linha de comando)
+
+    Args:
+        config: String como '--oem 3 --psm 8 -c chave=valor'
+
+    Returns:
+        Tupla com (oem, psm, variáveis)
+    """
+    oem, psm, variables = None, None, {}
+    tokens = shlex.split(config)
+
+    for i, token in enumerate(tokens):
+        if i + 1 >= len(tokens):
+            break
+        value = tokens[i + 1]
+        if token == '--oem':
+            oem = int(value)
+        elif token == '--psm':
+            psm = int(value)
+        elif token == '-c' and '=' in value:
+            name, var_value = value.split('=', 1)
+            variables[name] = var_value
+
+    return oem, psm, variables
+
+
+class OCREngine:
+    """
+    Interface base dos motores de OCR
+    """
+
+    name = ''
+
+    def __init__(self, ocr_config: str = '', options: Optional[Dict] = None):
+        """
+        Inicializa o motor
+
+        Args:
+            ocr_config: String de configuração do Tesseract (estilo linha de comando)
+            options: Opções específicas do motor (settings.json 'engine_options')
+        """
+        self.ocr_config = ocr_config
+        self.options = options or {}
+
+    def recognize(self, image: np.ndarray) -> RecognitionResult:
+        """
+        Reconhece o texto de uma imagem pré-processada
+
+        Args:
+            image: Imagem pré-processada (escala de cinza, uint8)
+
+        Returns:
+            Tupla com (texto, confiança, caixas)
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Libera recursos mantidos pelo motor
+        """
+        pass
+
+
+class TesseractCLIEngine(OCREngine):
+    """
+    Tesseract via pytesseract (um subprocesso por imagem)
+    """
+
+    name = 'tesseract'
+
+    def recognize(self, image: np.ndarray) -> RecognitionResult:
+        # image_to_data devolve texto, confiança e caixa de cada palavra numa única chamada
+        data = pytesseract.image_to_data(Image.fromarray(image), config=self.ocr_config,
+                                         output_type=pytesseract.Output.DICT)
+
+        lines, confidences, boxes = {}, [], []
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if not word.strip() or confidence < 0:
+                continue
+            line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(line_key, []).append(word)
+            confidences.append(confidence)
+            boxes.append({'texto': word, 'confianca': round(confidence, 1),
+                          'x': data['left'][i], 'y': data['top'][i],
+                          'w': data['width'][i], 'h': data['height'][i]})
+
+        text = '\n'.join(' '.join(words) for words in lines.values())
+        # Nenhuma palavra reconhecida: confiança zero (e não desconhecida)
+        mean_confidence = float(np.mean(confidences)) if confidences else 0.0
+        return text, mean_confidence, boxes
+
+
+class TesseractAPIEngine(OCREngine):
+    """
+    Tesseract em processo via tesserocr (um handle por processo)
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, ocr_config: str = '', options: Optional[Dict] = None):
+        super().__init__(ocr_config, options)
+        if tesserocr is None:
+            raise ImportError("tesserocr não instalado")
+        self._api = None
+
+    def _get_api(self):
+        """
+        Retorna o handle da API do Tesseract, inicializando-o no primeiro uso
+
+        A inicialização é preguiçosa para que cada processo do pool crie
+        o seu próprio handle (o modelo LSTM é carregado uma única vez).
+
+        Returns:
+            Instância de tesserocr.PyTessBaseAPI
+        """
+        if self._api is None:
+            oem, psm, variables = _parse_tesseract_config(self.ocr_config)
+
+            kwargs = {'lang': self.options.get('lang', 'eng')}
+            if self.options.get('tessdata_path'):
+                kwargs['path'] = self.options['tessdata_path']
+            if oem is not None:
+                kwargs['oem'] = oem
+            if psm is not None:
+                kwargs['psm'] = psm
+
+            self._api = tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in variables.items():
+                self._api.SetVariable(name, value)
+
+            logger.info("API do Tesseract inicializada em processo (tesserocr)")
+
+        return self._api
+
+    def recognize(self, image: np.ndarray) -> RecognitionResult:
+        api = self._get_api()
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+
+        # Passa o buffer numpy direto, sem arquivo temporário
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+        text = api.GetUTF8Text()
+
+        # Confiança e caixa de cada palavra, do mesmo reconhecimento
+        boxes = []
+        level = tesserocr.RIL.WORD
+        for word_iter in tesserocr.iterate_level(api.GetIterator(), level):
+            word = word_iter.GetUTF8Text(level)
+            if not word or not word.strip():
+                continue
+            x1, y1, x2, y2 = word_iter.BoundingBox(level)
+            boxes.append({'texto': word, 'confianca': round(word_iter.Confidence(level), 1),
+                          'x': x1, 'y': y1, 'w': x2 - x1, 'h': y2 - y1})
+
+        return text, float(api.MeanTextConf()), boxes
+
+    def close(self):
+        if self._api is not None:
+            self._api.End()
+            self._api = None
+
+
+class TemplateMatchingEngine(OCREngine):
+    """
+    Reconhecimento por comparação com modelos de caracteres
+
+    Cada arquivo em 'templates_dir' é um glifo; o primeiro caractere do
+    nome do arquivo é o caractere representado (ex.: 'A.png', '7_b.png').
+    """
+
+    name = 'template'
+
+    def __init__(self, ocr_config: str = '', options: Optional[Dict] = None):
+        super().__init__(ocr_config, options)
+        self.glyph_size = tuple(self.options.get('glyph_size', (24, 32)))
+        self.min_score = float(self.options.get('min_score', 0.5))
+        self.min_height = int(self.options.get('min_char_height', 8))
+        self.templates = self._load_templates(self.options.get('templates_dir', 'config/templates'))
+
+    def _load_templates(self, templates_dir: str) -> List[Tuple[str, np.ndarray]]:
+        """
+        Carrega os glifos de referência
+
+        Args:
+            templates_dir: Pasta com as imagens dos caracteres
+
+        Returns:
+            Lista de (caractere, glifo normalizado)
+        """
+        templates = []
+        folder = Path(templates_dir)
+        if not folder.exists():
+            logger.warning(f"Pasta de modelos não encontrada: {folder}")
+            return templates
+
+        for path in sorted(folder.iterdir()):
+            glyph = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+            if glyph is None:
+                continue
+            # Glifos armazenados como texto escuro em fundo claro
+            _, glyph = cv2.threshold(glyph, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+            templates.append((path.stem[0].upper(), cv2.resize(glyph, self.glyph_size)))
+
+        logger.info(f"{len(templates)} modelos de caracteres carregados de {folder}")
+        return templates
+
+    def recognize(self, image: np.ndarray) -> RecognitionResult:
+        if not self.templates:
+            return '', -1.0, []
+
+        # Componentes conectados do texto (texto claro em fundo escuro)
+        foreground = cv2.bitwise_not(image) if np.mean(image) > 127 else image
+        count, _, stats, _ = cv2.connectedComponentsWithStats(foreground)
+
+        chars, scores, boxes = [], [], []
+        for x, y, w, h, _ in sorted(stats[1:count].tolist(), key=lambda s: s[0]):
+            if h < self.min_height:
+                continue
+
+            glyph = cv2.resize(foreground[y:y + h, x:x + w], self.glyph_size)
+            best_char, best_score = '', -1.0
+            for char, template in self.templates:
+                score = float(cv2.matchTemplate(glyph, template, cv2.TM_CCOEFF_NORMED)[0][0])
+                if score > best_score:
+                    best_char, best_score = char, score
+
+            if best_score >= self.min_score:
+                chars.append(best_char)
+                scores.append(best_score)
+                boxes.append({'texto': best_char, 'confianca': round(best_score * 100, 1),
+                              'x': x, 'y': y, 'w': w, 'h': h})
+
+        confidence = float(np.mean(scores) * 100) if scores else -1.0
+        return ''.join(chars), confidence, boxes
+
+
+class NullEngine(OCREngine):
+    """
+    Motor vazio, para medir o custo do restante do pipeline
+    """
+
+    name = 'noop'
+
+    def recognize(self, image: np.ndarray) -> RecognitionResult:
+        return '', -1.0, []
+
+
+# Motores disponíveis por nome (settings.json 'ocr_engine')
+ENGINES = {
+    engine.name: engine
+    for engine in (TesseractCLIEngine, TesseractAPIEngine, TemplateMatchingEngine, NullEngine)
+}
+
+# Nomes alternativos aceitos na configuração
+ENGINE_ALIASES = {'pytesseract': 'tesseract', 'none': 'noop'}
+
+
+def create_engine(name: str, ocr_config: str = '', options: Optional[Dict] = None) -> OCREngine:
+    """
+    Cria um motor de OCR pelo nome, com fallback para o Tesseract CLI
+
+    Args:
+        name: Nome do motor ('tesseract', 'tesserocr', 'template', 'noop')
+        ocr_config: String de configuração do Tesseract
+        options: Opções específicas do motor
+
+    Returns:
+        Instância do motor
+    """
+    name = ENGINE_ALIASES.get(name, name)
+    if name not in ENGINES:
+        raise ValueError(f"Motor de OCR desconhecido: {name} (disponíveis: {', '.join(ENGINES)})")
+
+    try:
+        return ENGINES[name](ocr_config, options)
+    except ImportError as e:
+        logger.warning(f"Motor '{name}' indisponível ({e}), usando tesseract")
+        return TesseractCLIEngine(ocr_config, options)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Pipeline - Etapas de pré-processamento configuráveis
+A cadeia é declarada como lista ordenada de etapas no settings.json
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def resize_min(image: np.ndarray, min_width: int = 300, min_height: int = 200) -> np.ndarray:
+    """
+    Amplia imagens pequenas até o tamanho mínimo (melhora OCR)
+
+    Args:
+        image: Imagem em escala de cinza
+        min_width: Largura mínima, em pixels
+        min_height: Altura mínima, em pixels
+
+    Returns:
+        Imagem ampliada (ou a original, se já tiver o tamanho mínimo)
+    """
+    height, width = image.shape[:2]
+    if width < min_width or height < min_height:
+        scale_factor = max(min_width / width, min_height / height)
+        new_size = (int(width * scale_factor), int(height * scale_factor))
+        image = cv2.resize(image, new_size, interpolation=cv2.INTER_CUBIC)
+    return image
+
+
+def upscale(image: np.ndarray, factor: float = 2.0) -> np.ndarray:
+    """
+    Amplia a imagem por um fator fixo
+
+    Args:
+        image: Imagem em escala de cinza
+        factor: Fator de ampliação
+
+    Returns:
+        Imagem ampliada
+    """
+    return cv2.resize(image, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)
+
+
+def bilateral(image: np.ndarray, d: int = 11, sigma_color: float = 17, sigma_space: float = 17) -> np.ndarray:
+    """
+    Filtro bilateral: reduz ruído mantendo as bordas (caro)
+
+    Args:
+        image: Imagem em escala de cinza
+        d: Diâmetro da vizinhança de cada pixel
+        sigma_color: Sigma do filtro no espaço de cores
+        sigma_space: Sigma do filtro no espaço de coordenadas
+
+    Returns:
+        Imagem filtrada
+    """
+    return cv2.bilateralFilter(image, d, sigma_color, sigma_space)
+
+
+def gaussian_blur(image: np.ndarray, ksize: int = 3) -> np.ndarray:
+    """
+    Desfoque gaussiano (alternativa barata ao bilateral)
+
+    Args:
+        image: Imagem em escala de cinza
+        ksize: Tamanho do kernel (ímpar)
+
+    Returns:
+        Imagem filtrada
+    """
+    return cv2.GaussianBlur(image, (ksize, ksize), 0)
+
+
+def median_blur(image: np.ndarray, ksize: int = 3) -> np.ndarray:
+    """
+    Filtro de mediana (bom para ruído sal e pimenta)
+
+    Args:
+        image: Imagem em escala de cinza
+        ksize: Tamanho do kernel (ímpar)
+
+    Returns:
+        Imagem filtrada
+    """
+    return cv2.medianBlur(image, ksize)
+
+
+def adaptive_threshold(image: np.ndarray, block_size: int = 11, c: float = 2) -> np.ndarray:
+    """
+    Binarização adaptativa gaussiana
+
+    Args:
+        image: Imagem em escala de cinza
+        block_size: Tamanho da vizinhança usada no limiar (ímpar)
+        c: Constante subtraída da média ponderada
+
+    Returns:
+        Imagem binarizada
+    """
+    return cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, c)
+
+
+def otsu(image: np.ndarray) -> np.ndarray:
+    """
+    Binarização global de Otsu
+
+    Args:
+        image: Imagem em escala de cinza
+
+    Returns:
+        Imagem binarizada
+    """
+    _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    return binary
+
+
+def close(image: np.ndarray, kernel: int = 2) -> np.ndarray:
+    """
+    Fechamento morfológico
+
+    Args:
+        image: Imagem binarizada
+        kernel: Lado do elemento estruturante quadrado
+
+    Returns:
+        Imagem processada
+    """
+    return cv2.morphologyEx(image, cv2.MORPH_CLOSE, np.ones((kernel, kernel), np.uint8))
+
+
+def open_(image: np.ndarray, kernel: int = 2) -> np.ndarray:
+    """
+    Abertura morfológica
+
+    Args:
+        image: Imagem binarizada
+        kernel: Lado do elemento estruturante quadrado
+
+    Returns:
+        Imagem processada
+    """
+    return cv2.morphologyEx(image, cv2.MORPH_OPEN, np.ones((kernel, kernel), np.uint8))
+
+
+def invert_if_light(image: np.ndarray) -> np.ndarray:
+    """
+    Inverte a polaridade se a imagem for predominantemente clara
+
+    Args:
+        image: Imagem em escala de cinza ou binarizada
+
+    Returns:
+        Imagem com fundo escuro
+    """
+    if np.mean(image) > 127:
+        image = cv2.bitwise_not(image)
+    return image
+
+
+def rotate(image: np.ndarray, angle: int = 90) -> np.ndarray:
+    """
+    Rotaciona em múltiplos de 90 graus (sentido horário)
+
+    Args:
+        image: Imagem em escala de cinza
+        angle: Ângulo (90, 180 ou 270; outros valores não rotacionam)
+
+    Returns:
+        Imagem rotacionada
+    """
+    rotations = {90: cv2.ROTATE_90_CLOCKWISE, 180: cv2.ROTATE_180, 270: cv2.ROTATE_90_COUNTERCLOCKWISE}
+    angle = angle % 360
+    return cv2.rotate(image, rotations[angle]) if angle in rotations else image
+
+
+# Etapas disponíveis por nome (chave 'stage' de cada item do pipeline)
+PREPROCESSING_STAGES = {
+    'resize_min': resize_min,
+    'upscale': upscale,
+    'bilateral': bilateral,
+    'gaussian_blur': gaussian_blur,
+    'median_blur': median_blur,
+    'adaptive_threshold': adaptive_threshold,
+    'otsu': otsu,
+    'close': close,
+    'open': open_,
+    'invert_if_light': invert_if_light,
+    'rotate': rotate
+}
+
+# Cadeia original do OCRProcessor
+DEFAULT_PIPELINE = [
+    {'stage': 'resize_min', 'min_width': 300, 'min_height': 200},
+    {'stage': 'bilateral', 'd': 11, 'sigma_color': 17, 'sigma_space': 17},
+    {'stage': 'adaptive_threshold', 'block_size': 11, 'c': 2},
+    {'stage': 'close', 'kernel': 2},
+    {'stage': 'open', 'kernel': 2},
+    {'stage': 'invert_if_light'}
+]
+
+# Níveis da cascata, do mais barato ao mais caro (settings.json 'cascade.levels')
+DEFAULT_CASCADE_LEVELS = [
+    {'name': 'otsu', 'pipeline': [
+        {'stage': 'resize_min', 'min_width': 300, 'min_height': 200},
+        {'stage': 'otsu'}
+    ]},
+    {'name': 'adaptativo', 'pipeline': DEFAULT_PIPELINE},
+    {'name': 'ampliado', 'pipeline': [
+        {'stage': 'upscale', 'factor': 2.0},
+        {'stage': 'bilateral', 'd': 11, 'sigma_color': 17, 'sigma_space': 17},
+        {'stage': 'adaptive_threshold', 'block_size': 15, 'c': 4},
+        {'stage': 'close', 'kernel': 2},
+        {'stage': 'invert_if_light'}
+    ]},
+    {'name': 'rotacionado_180', 'pipeline': [{'stage': 'rotate', 'angle': 180}] + DEFAULT_PIPELINE}
+]
+
+
+def scale_matrix(sx: float, sy: float) -> np.ndarray:
+    """
+    Matriz homogênea (3x3) de mudança de escala
+
+    Args:
+        sx: Fator horizontal
+        sy: Fator vertical
+
+    Returns:
+        Matriz que leva coordenadas da imagem original para a redimensionada
+    """
+    return np.array([[sx, 0, 0], [0, sy, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def translation_matrix(dx: float, dy: float) -> np.ndarray:
+    """
+    Matriz homogênea (3x3) de translação
+
+    Args:
+        dx: Deslocamento horizontal
+        dy: Deslocamento vertical
+
+    Returns:
+        Matriz de translação
+    """
+    return np.array([[1, 0, dx], [0, 1, dy], [0, 0, 1]], dtype=np.float64)
+
+
+def rotation_matrix(angle: int, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Matriz homogênea (3x3) de uma rotação de cv2.rotate
+
+    Args:
+        angle: Rotação horária (90, 180 ou 270; outros valores = identidade)
+        shape: Forma (altura, largura) da imagem antes da rotação
+
+    Returns:
+        Matriz que leva coordenadas da imagem original para a rotacionada
+    """
+    height, width = shape[:2]
+    angle = angle % 360
+    if angle == 90:
+        return np.array([[0, -1, height - 1], [1, 0, 0], [0, 0, 1]], dtype=np.float64)
+    if angle == 180:
+        return np.array([[-1, 0, width - 1], [0, -1, height - 1], [0, 0, 1]], dtype=np.float64)
+    if angle == 270:
+        return np.array([[0, 1, 0], [-1, 0, width - 1], [0, 0, 1]], dtype=np.float64)
+    return np.eye(3)
+
+
+def validate_pipeline(pipeline: List[Dict]):
+    """
+    Verifica se todas as etapas do pipeline existem
+
+    Args:
+        pipeline: Lista de etapas ({'stage': nome, ...parâmetros})
+    """
+    for step in pipeline:
+        if step.get('stage') not in PREPROCESSING_STAGES:
+            raise ValueError(
+                f"Etapa de pré-processamento desconhecida: {step.get('stage')} "
+                f"(disponíveis: {', '.join(PREPROCESSING_STAGES)})"
+            )
+
+
+def run_pipeline(image: np.ndarray, pipeline: List[Dict], timings: Optional[Dict[str, float]] = None,
+                 matrix: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Executa as etapas em ordem, medindo o tempo de cada uma
+
+    Args:
+        image: Imagem em escala de cinza
+        pipeline: Lista de etapas ({'stage': nome, ...parâmetros})
+        timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+        matrix: Matriz 3x3 atualizada no lugar com as etapas geométricas
+            (redimensionamento e rotação), para levar coordenadas da entrada
+            para a saída (opcional)
+
+    Returns:
+        Imagem processada
+    """
+    for step in pipeline:
+        name = step['stage']
+        params = {k: v for k, v in step.items() if k != 'stage'}
+
+        start = time.perf_counter()
+        output = PREPROCESSING_STAGES[name](image, **params)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+        if matrix is not None:
+            if name == 'rotate':
+                matrix[:] = rotation_matrix(params.get('angle', 90), image.shape) @ matrix
+            elif output.shape[:2] != image.shape[:2]:
+                # Etapas de redimensionamento: escala pela razão entre as formas
+                matrix[:] = scale_matrix(output.shape[1] / image.shape[1], output.shape[0] / image.shape[0]) @ matrix
+        image = output
+
+    return image
@@ -16,10 +16,20 @@ import pytesseract
 import numpy as np
 from PIL import Image, ImageEnhance
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import re
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+from ocr_cache import OCRCache, config_fingerprint, hash_file
+from barcode_reader import BarcodeReader
+from ocr_engines import ENGINE_ALIASES, OCREngine, create_engine
+from ocr_pipeline import (DEFAULT_CASCADE_LEVELS, DEFAULT_PIPELINE, rotation_matrix, run_pipeline, scale_matrix,
+                          translation_matrix, validate_pipeline)
+
 # Configuração do logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,18 +41,236 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Configuração padrão do Tesseract para códigos de latas
+DEFAULT_OCR_CONFIG = r'--oem 3 --psm 8 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-_'
+
+# Flags do OpenCV para decodificar JPEG direto em escala de cinza reduzida
+REDUCED_GRAYSCALE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8
+}
+
+# Rotações aceitas nos perfis de estação (graus no sentido horário)
+ROTATIONS = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE
+}
+
+# Tag EXIF com o modelo da câmera
+EXIF_MODEL_TAG = 0x0110
+
+# Tag EXIF de orientação (o cv2.imread já aplica a rotação indicada)
+EXIF_ORIENTATION_TAG = 0x0112
+
+# Rotação horária que desfaz a aplicada pelo cv2.imread nas tags 6 e 8 (câmera girada 90°)
+EXIF_UNDO_ROTATION = {6: 270, 8: 90}
+
+# Chaves de configuração que alteram o texto reconhecido (entram na chave do cache);
+# as demais (pastas, relatórios, daemon, fila...) não invalidam o cache
+_OCR_CONFIG_KEYS = (
+    'ocr_config', 'ocr_engine', 'ocr_backend', 'engine_options', 'ocr_lang', 'tessdata_path',
+    'preprocessing', 'localization', 'quality', 'orientation', 'unwarp', 'barcode', 'stations',
+    'cascade'
+)
+
+# Processador usado por cada processo do pool (criado em _init_worker)
+_worker_processor = None
+
+
+def _init_worker(tesseract_path: Optional[str], config: Optional[Dict]):
+    """
+    Inicializa um processo do pool de workers
+
+    Limita o OpenMP do Tesseract e as threads do OpenCV a 1 por processo,
+    para que N workers não disputem mais do que N núcleos.
+
+    Args:
+        tesseract_path: Caminho para o executável do Tesseract
+        config: Configurações repassadas ao OCRProcessor do worker
+    """
+    global _worker_processor
+
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    cv2.setNumThreads(1)
+
+    _worker_processor = OCRProcessor(tesseract_path=tesseract_path, config=config, workers=1)
+
+
+def _process_in_worker(image_path: str) -> Dict:
+    """
+    Processa uma imagem no processador do worker atual
+
+    Args:
+        image_path: Caminho para a imagem
+
+    Returns:
+        Dicionário com os resultados do processamento
+    """
+    return _worker_processor.process_single_image(image_path)
+
+
+def default_checkpoint_path(folder_path: str, output_dir: str = '.') -> Path:
+    """
+    Retorna o caminho padrão do checkpoint JSONL de uma pasta de entrada
+
+    Args:
+        folder_path: Pasta com imagens
+        output_dir: Pasta onde o checkpoint é gravado
+
+    Returns:
+        Caminho do checkpoint (estável entre execuções, para permitir --resume)
+    """
+    return Path(output_dir) / f"checkpoint_{Path(folder_path).resolve().name}.jsonl"
+
+
+def load_config(config_path: Optional[str] = None) -> Dict:
+    """
+    Carrega o arquivo de configuração (config/settings.json por padrão)
+
+    Args:
+        config_path: Caminho para o arquivo de configuração (opcional)
+
+    Returns:
+        Dicionário com configurações (vazio se o arquivo não existir)
+    """
+    if not config_path:
+        config_path = Path('config') / 'settings.json'
+
+    if not Path(config_path).exists():
+        return {}
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_config(config: Dict, config_path: Optional[str] = None):
+    """
+    Salva o arquivo de configuração (config/settings.json por padrão)
+
+    Args:
+        config: Dicionário com configurações
+        config_path: Caminho para o arquivo de configuração (opcional)
+    """
+    if not config_path:
+        config_path = Path('config') / 'settings.json'
+
+    Path(config_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+
+
+class JsonlResultWriter:
+    """
+    Grava resultados em JSONL, um registro por linha, à medida que são produzidos
+
+    O resumo (total_processadas, sucessos, erros) é gravado ao final em um
+    arquivo lateral '<saida>.summary.json', mantendo a memória constante.
+    """
+
+    def __init__(self, output_path: str, append: bool = False, fsync: bool = False,
+                 write_summary: bool = True):
+        """
+        Abre o arquivo de saída
+
+        Args:
+            output_path: Caminho do arquivo JSONL
+            append: Acrescenta ao arquivo existente em vez de sobrescrever
+            fsync: Força a gravação em disco a cada registro (checkpoint durável)
+            write_summary: Grava o arquivo de resumo ao fechar
+        """
+        self.output_path = Path(output_path)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.write_summary = write_summary
+        self.total = 0
+        self.sucessos = 0
+        self.erros = 0
+        self.baixa_qualidade = 0
+
+        self._file = open(self.output_path, 'a' if append else 'w', encoding='utf-8')
+
+        # Linha parcial de uma execução interrompida: começa em linha nova
+        if append and self._file.tell() > 0:
+            with open(self.output_path, 'rb') as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b'\n':
+                    self._file.write('\n')
+
+    @property
+    def summary_path(self) -> Path:
+        return self.output_path.with_name(self.output_path.name + '.summary.json')
+
+    def write(self, result: Dict):
+        """
+        Grava um resultado e o envia imediatamente para o disco
+
+        Args:
+            result: Resultado de uma imagem
+        """
+        self._file.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        self.total += 1
+        if result.get('status') == 'sucesso':
+            self.sucessos += 1
+        elif result.get('status') == 'erro':
+            self.erros += 1
+        elif result.get('status') == 'baixa_qualidade':
+            self.baixa_qualidade += 1
+
+    def close(self):
+        """
+        Fecha o arquivo e grava o resumo
+        """
+        self._file.close()
+        if self.write_summary:
+            with open(self.summary_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'timestamp': datetime.now().isoformat(),
+                    'total_processadas': self.total,
+                    'sucessos': self.sucessos,
+                    'erros': self.erros,
+                    'baixa_qualidade': self.baixa_qualidade,
+                    'resultados_jsonl': str(self.output_path)
+                }, f, ensure_ascii=False, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 class OCRProcessor:
     """
     Classe principal para processamento OCR de imagens de latas
     """
 
-    def __init__(self, tesseract_path: Optional[str] = None):
+    def __init__(self, tesseract_path: Optional[str] = None, config: Optional[Dict] = None,
+                 workers: Optional[int] = None):
         """
         Inicializa o processador OCR
 
         Args:
             tesseract_path: Caminho para o executável do Tesseract (opcional)
+            config: Configurações carregadas do settings.json (opcional)
+            workers: Número de processos para process_folder (padrão: config 'workers' ou 1)
         """
+        self.tesseract_path = tesseract_path
+        self.config = config or {}
+
+        # Número de processos paralelos (0 = todos os núcleos)
+        if workers is None:
+            workers = self.config.get('workers', 1)
+        self.workers = int(workers) if workers else (os.cpu_count() or 1)
+
+        # Pool de processos persistente (start_pool), reaproveitado entre chamadas
+        self._executor = None
+
         # Configuração do caminho do Tesseract (Windows)
         if tesseract_path:
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
@@ -50,7 +278,62 @@ class OCRProcessor:
             pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
         # Configurações do OCR
-        self.ocr_config = r'--oem 3 --psm 8 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-_'
+        self.ocr_config = self.config.get('ocr_config') or DEFAULT_OCR_CONFIG
+
+        # Motor de OCR escolhido por nome ('tesseract', 'tesserocr', 'template', 'noop')
+        engine_name = self.config.get('ocr_engine') or self.config.get('ocr_backend', 'tesseract')
+        engine_name = ENGINE_ALIASES.get(engine_name, engine_name)
+        engine_options = dict(self.config.get('engine_options', {}).get(engine_name, {}))
+        # Chaves de nível superior das versões anteriores, lidas quando engine_options não as define
+        for legacy_key, option in (('ocr_lang', 'lang'), ('tessdata_path', 'tessdata_path')):
+            if legacy_key in self.config:
+                engine_options.setdefault(option, self.config[legacy_key])
+        self.engine: OCREngine = create_engine(engine_name, self.ocr_config, engine_options)
+
+        # Parâmetros de pré-processamento (settings.json 'preprocessing')
+        self.preprocessing = self.config.get('preprocessing', {})
+
+        # Localização de regiões de texto antes do OCR (settings.json 'localization')
+        self.localization = self.config.get('localization', {})
+
+        # Filtro de qualidade (desfoque/imagem vazia) antes do OCR (settings.json 'quality')
+        self.quality = self.config.get('quality', {})
+
+        # Estimativa de orientação (0/90/180/270) antes do OCR (settings.json 'orientation')
+        self.orientation = self.config.get('orientation', {})
+
+        # Correção da curvatura da lata (settings.json 'unwarp'); tabelas de remap em cache
+        self.unwarp = self.config.get('unwarp', {})
+        self._unwarp_maps = OrderedDict()
+
+        # Leitura de códigos de barras/QR/DataMatrix antes do OCR (settings.json 'barcode')
+        barcode_options = self.config.get('barcode', {})
+        self.barcode_reader = BarcodeReader(barcode_options) if barcode_options.get('enabled') else None
+
+        # Perfis de estações fixas (settings.json 'stations')
+        self.stations = self.config.get('stations', {})
+
+        # Valida os pipelines declarados (global e por estação) já na inicialização
+        validate_pipeline(self.preprocessing.get('pipeline', DEFAULT_PIPELINE))
+        for profile in self.stations.values():
+            validate_pipeline(self.preprocessing_for(profile).get('pipeline', DEFAULT_PIPELINE))
+
+        # Cascata guiada pela confiança (settings.json 'cascade')
+        self.cascade = self.config.get('cascade', {})
+        for level in self.cascade.get('levels', DEFAULT_CASCADE_LEVELS):
+            validate_pipeline(level['pipeline'])
+
+        # Cache de resultados por conteúdo da imagem (opcional)
+        cache_config = self.config.get('cache', {})
+        self.cache = None
+        if cache_config.get('enabled'):
+            self.cache = OCRCache(
+                db_path=cache_config.get('path', 'cache/ocr_cache.sqlite'),
+                max_entries=cache_config.get('max_entries', 100000),
+                max_age_days=cache_config.get('max_age_days', 30),
+                max_size_mb=cache_config.get('max_size_mb', 200)
+            )
+        self.fingerprint = self.config_fingerprint()
 
         # Extensões de imagem suportadas
         self.supported_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
@@ -67,52 +350,99 @@ class OCRProcessor:
 
         logger.info("OCR Processor iniciado com sucesso")
 
-    def preprocess_image(self, image_path: str) -> np.ndarray:
+    def get_decode_flags(self, image_path: str, preprocessing: Optional[Dict] = None) -> Tuple[int, int]:
         """
-        Pré-processa a imagem para melhorar a precisão do OCR
+        Escolhe o modo de leitura da imagem pelo cabeçalho do arquivo
+
+        No modo 'reduced', o fator de redução (2, 4 ou 8) é o maior que ainda
+        mantém a altura estimada dos caracteres acima de 'target_char_height'.
+        Para JPEG, o OpenCV decodifica direto na escala reduzida.
 
         Args:
             image_path: Caminho para a imagem
+            preprocessing: Parâmetros de pré-processamento (padrão: self.preprocessing)
 
         Returns:
-            Imagem pré-processada como array numpy
+            Tupla com (flag do cv2.imread, fator de redução)
         """
-        try:
-            # Carrega a imagem
+        preprocessing = self.preprocessing if preprocessing is None else preprocessing
+        mode = preprocessing.get('decode_mode', 'grayscale')
+        if mode != 'reduced':
+            return cv2.IMREAD_GRAYSCALE, 1
+
+        # Lê apenas o cabeçalho (dimensões), sem decodificar os pixels
+        with Image.open(image_path) as header:
+            width, height = header.size
+
+        char_height = min(width, height) * preprocessing.get('char_height_ratio', 0.05)
+        target = preprocessing.get('target_char_height', 32)
+
+        for factor in (8, 4, 2):
+            if char_height / factor >= target and width / factor >= 300 and height / factor >= 200:
+                return REDUCED_GRAYSCALE_FLAGS[factor], factor
+
+        return cv2.IMREAD_GRAYSCALE, 1
+
+    def load_image(self, image_path: str, preprocessing: Optional[Dict] = None) -> np.ndarray:
+        """
+        Carrega a imagem já em escala de cinza
+
+        Args:
+            image_path: Caminho para a imagem
+            preprocessing: Parâmetros de pré-processamento (padrão: self.preprocessing)
+
+        Returns:
+            Imagem em escala de cinza como array numpy
+        """
+        preprocessing = self.preprocessing if preprocessing is None else preprocessing
+        if preprocessing.get('decode_mode', 'grayscale') == 'color':
+            # Caminho original: decodifica colorido e converte
             image = cv2.imread(image_path)
             if image is None:
                 raise ValueError(f"Não foi possível carregar a imagem: {image_path}")
-
-            # Converte para RGB (OpenCV usa BGR por padrão)
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            return cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY)
 
-            # Redimensiona a imagem se for muito pequena (melhora OCR)
-            height, width = image_rgb.shape[:2]
-            if width < 300 or height < 200:
-                scale_factor = max(300/width, 200/height)
-                new_width = int(width * scale_factor)
-                new_height = int(height * scale_factor)
-                image_rgb = cv2.resize(image_rgb, (new_width, new_height), interpolation=cv2.INTER_CUBIC)
+        flags, factor = self.get_decode_flags(image_path, preprocessing)
+        gray = cv2.imread(image_path, flags)
+        if gray is None:
+            raise ValueError(f"Não foi possível carregar a imagem: {image_path}")
 
-            # Converte para escala de cinza
-            gray = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY)
+        if factor > 1:
+            logger.debug(f"Imagem decodificada em 1/{factor} da resolução: {image_path}")
+        return gray
 
-            # Aplicar filtro bilateral para reduzir ruído mantendo as bordas
-            gray = cv2.bilateralFilter(gray, 11, 17, 17)
+    def preprocess_image(self, image_path: str) -> np.ndarray:
+        """
+        Pré-processa a imagem para melhorar a precisão do OCR
 
-            # Threshold adaptativo para binarização
-            binary = cv2.adaptiveThreshold(
-                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-            )
+        Args:
+            image_path: Caminho para a imagem
 
-            # Operações morfológicas para limpar a imagem
-            kernel = np.ones((2, 2), np.uint8)
-            processed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-            processed = cv2.morphologyEx(processed, cv2.MORPH_OPEN, kernel)
+        Returns:
+            Imagem pré-processada como array numpy (região principal, se a
+            localização de texto estiver ativa)
+        """
+        return self.preprocess_regions(image_path)[0]
+
+    def preprocess_regions(self, image_path: str, station: Optional[Tuple[str, Dict]] = None,
+                           timings: Optional[Dict[str, float]] = None) -> List[np.ndarray]:
+        """
+        Pré-processa a imagem, recortando as regiões de texto quando ativado
+
+        Args:
+            image_path: Caminho para a imagem
+            station: Perfil de estação (nome, perfil); padrão: select_station(image_path)
+            timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+
+        Returns:
+            Lista de imagens pré-processadas (a imagem inteira se não houver recorte)
+        """
+        try:
+            timings = {} if timings is None else timings
+            crops, preprocessing = self.load_regions(image_path, station, timings)
 
-            # Inversão se necessário (Tesseract espera texto preto em fundo branco)
-            if np.mean(processed) > 127:
-                processed = cv2.bitwise_not(processed)
+            processed = [self.enhance_image(crop, preprocessing, timings) for crop in crops]
 
             logger.debug(f"Pré-processamento concluído para: {image_path}")
             return processed
@@ -121,33 +451,856 @@ class OCRProcessor:
             logger.error(f"Erro no pré-processamento da imagem {image_path}: {str(e)}")
             raise
 
-    def extract_text(self, processed_image: np.ndarray) -> str:
+    def load_regions(self, image_path: str, station: Optional[Tuple[str, Dict]] = None,
+                     timings: Optional[Dict[str, float]] = None) -> Tuple[List[np.ndarray], Dict]:
         """
-        Extrai texto da imagem pré-processada usando Tesseract
+        Carrega a imagem em escala de cinza e recorta as regiões de texto
+
+        Args:
+            image_path: Caminho para a imagem
+            station: Perfil de estação (nome, perfil); padrão: select_station(image_path)
+            timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+
+        Returns:
+            Tupla com (recortes em escala de cinza, parâmetros de pré-processamento efetivos)
+        """
+        if station is None:
+            station = self.select_station(image_path)
+        gray, preprocessing = self.load_station_image(image_path, station, timings)
+        if not station and self.orientation.get('enabled'):
+            gray, _ = self.orient_image(gray, image_path, timings)
+        return self.crop_regions(gray, station, timings), preprocessing
+
+    def load_station_image(self, image_path: str, station: Optional[Tuple[str, Dict]],
+                           timings: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, Dict]:
+        """
+        Carrega a imagem em escala de cinza com os parâmetros da estação
+
+        Args:
+            image_path: Caminho para a imagem
+            station: Perfil de estação (nome, perfil) ou None
+            timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+
+        Returns:
+            Tupla com (imagem em escala de cinza, parâmetros de pré-processamento efetivos)
+        """
+        preprocessing = self.preprocessing_for(station[1] if station else None)
+
+        # Carrega a imagem direto em escala de cinza
+        start = time.perf_counter()
+        gray = self.load_image(image_path, preprocessing)
+        if timings is not None:
+            timings['decode'] = (time.perf_counter() - start) * 1000
+
+        return gray, preprocessing
+
+    def crop_regions(self, gray: np.ndarray, station: Optional[Tuple[str, Dict]],
+                     timings: Optional[Dict[str, float]] = None, matrix: Optional[np.ndarray] = None,
+                     geometry: Optional[List[Dict]] = None) -> List[np.ndarray]:
+        """
+        Recorta as regiões de texto (ROI da estação ou localização automática)
+
+        Args:
+            gray: Imagem em escala de cinza
+            station: Perfil de estação (nome, perfil) ou None
+            timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+            matrix: Matriz 3x3 que leva coordenadas da imagem original para gray
+                (padrão: identidade)
+            geometry: Lista onde a geometria de cada recorte é acrescentada, para
+                levar as caixas do OCR de volta à imagem original (opcional)
+
+        Returns:
+            Lista de recortes (a imagem inteira se não houver recorte)
+        """
+        timings = {} if timings is None else timings
+        matrix = np.eye(3) if matrix is None else matrix
+
+        start = time.perf_counter()
+        if station:
+            # Estação fixa: recorte direto pela ROI, sem localização
+            crops = [self.apply_station_profile(gray, station[1])]
+            crop_matrices = [self.station_profile_matrix(gray.shape, station[1])]
+            timings['roi'] = (time.perf_counter() - start) * 1000
+        else:
+            boxes = self.region_boxes(gray)
+            crops = [gray[y:y + h, x:x + w] for x, y, w, h in boxes]
+            crop_matrices = [translation_matrix(-x, -y) for x, y, _, _ in boxes]
+            if self.localization.get('enabled'):
+                timings['localization'] = (time.perf_counter() - start) * 1000
+
+        cylinders = [None] * len(crops)
+        if self.unwarp.get('enabled'):
+            start = time.perf_counter()
+            cylinders = [self.cylinder_geometry(crop, station) for crop in crops]
+            crops = [self.unwarp_region(crop, station, cylinder) for crop, cylinder in zip(crops, cylinders)]
+            timings['unwarp'] = (time.perf_counter() - start) * 1000
+
+        if geometry is not None:
+            geometry.extend({'recorte': crop_matrix @ matrix, 'cilindro': cylinder, 'pipeline': np.eye(3)}
+                            for crop_matrix, cylinder in zip(crop_matrices, cylinders))
+        return crops
+
+    def unwarp_region(self, crop: np.ndarray, station: Optional[Tuple[str, Dict]] = None,
+                      cylinder: Optional[Dict] = None) -> np.ndarray:
+        """
+        Planifica a superfície cilíndrica da lata em um recorte
+
+        Args:
+            crop: Recorte em escala de cinza (lata na vertical)
+            station: Perfil de estação (nome, perfil) ou None
+            cylinder: Geometria de cylinder_geometry (padrão: calculada aqui)
+
+        Returns:
+            Recorte planificado
+        """
+        if cylinder is None:
+            cylinder = self.cylinder_geometry(crop, station)
+
+        # Só a geometria fixa da estação se repete entre imagens; a estimada não vai para o cache
+        key = station[0] if cylinder['fixa'] else None
+        map_1, map_2 = self.get_unwarp_maps(key, crop.shape[:2], cylinder['center_x'], cylinder['radius'])
+        return cv2.remap(crop, map_1, map_2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+    def cylinder_geometry(self, crop: np.ndarray, station: Optional[Tuple[str, Dict]] = None) -> Dict:
+        """
+        Determina o eixo, o raio e o ângulo inicial do cilindro em um recorte
+
+        O eixo e o raio vêm do perfil da estação ('unwarp': {'center', 'radius'},
+        frações opcionais da largura do recorte); o valor ausente é estimado
+        pela silhueta da lata. Ambos são arredondados para 4 px, como nas
+        tabelas de remap.
+
+        Args:
+            crop: Recorte em escala de cinza (lata na vertical)
+            station: Perfil de estação (nome, perfil) ou None
+
+        Returns:
+            Dicionário com 'center_x', 'radius', 'theta_left' (radianos) e
+            'fixa' (eixo e raio vindos do perfil da estação)
+        """
+        width = crop.shape[1]
+        fixed = (station[1].get('unwarp') if station else None) or {}
+        center, radius_ratio = fixed.get('center'), fixed.get('radius')
+        is_fixed = center is not None and radius_ratio is not None
+
+        if is_fixed:
+            center_x, radius = center * width, radius_ratio * width
+        else:
+            estimated_center, estimated_radius = self.estimate_cylinder(crop)
+            center_x = center * width if center is not None else estimated_center
+            radius = radius_ratio * width if radius_ratio is not None else estimated_radius
+
+        center_x = round(center_x / 4) * 4
+        radius = max(4, round(radius / 4) * 4)
+        theta_left, _ = self.cylinder_angles(width, center_x, radius)
+        return {'center_x': center_x, 'radius': radius, 'theta_left': float(theta_left),
+                'fixa': is_fixed}
+
+    def cylinder_angles(self, width: int, center_x: float, radius: float) -> Tuple[float, float]:
+        """
+        Faixa de ângulos visível no recorte, limitada perto da silhueta
+
+        Args:
+            width: Largura do recorte
+            center_x: x do eixo da lata, em pixels
+            radius: Raio da lata, em pixels
+
+        Returns:
+            Tupla com (ângulo da borda esquerda, ângulo da borda direita), em radianos
+        """
+        max_angle = np.radians(self.unwarp.get('max_angle', 75))
+        theta_left = max(-max_angle, np.arcsin(np.clip((0 - center_x) / radius, -1, 1)))
+        theta_right = min(max_angle, np.arcsin(np.clip((width - 1 - center_x) / radius, -1, 1)))
+        return theta_left, theta_right
+
+    def estimate_cylinder(self, gray: np.ndarray) -> Tuple[float, float]:
+        """
+        Estima o eixo e o raio da lata pelas bordas verticais da silhueta
+
+        Procura o pico do gradiente horizontal médio por coluna em cada lateral;
+        sem bordas nítidas, supõe a lata centrada com raio 'radius_ratio'
+        da largura.
+
+        Args:
+            gray: Imagem em escala de cinza
+
+        Returns:
+            Tupla com (x do eixo, raio) em pixels
+        """
+        height, width = gray.shape[:2]
+        fallback = (width / 2, self.unwarp.get('radius_ratio', 0.75) * width)
+        if width < 20:
+            return fallback
+
+        profile = np.abs(cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)).mean(axis=0)
+        side = int(width * 0.35)
+        left = int(np.argmax(profile[:side]))
+        right = width - side + int(np.argmax(profile[width - side:]))
+
+        # As duas bordas precisam se destacar do restante (texto, fundo)
+        baseline = float(np.median(profile)) + 1e-6
+        edge_ratio = self.unwarp.get('edge_ratio', 3.0)
+        if profile[left] < edge_ratio * baseline or profile[right] < edge_ratio * baseline:
+            return fallback
+
+        return (left + right) / 2, (right - left) / 2
+
+    def get_unwarp_maps(self, key: Optional[str], shape: Tuple[int, int], center_x: float,
+                        radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna as tabelas de remap do cilindro
+
+        Cada coluna de saída corresponde a um ângulo θ na superfície
+        (comprimento de arco R·θ), lido da coluna x = eixo + R·sen(θ).
+        Com a geometria fixa de uma estação (recortes de mesmo tamanho), as
+        tabelas são calculadas só na primeira vez; a geometria estimada muda
+        a cada imagem e não é guardada em cache.
+
+        Args:
+            key: Nome da estação com geometria fixa (None = sem cache)
+            shape: (altura, largura) do recorte
+            center_x: x do eixo da lata, em pixels
+            radius: Raio da lata, em pixels
+
+        Returns:
+            Tabelas (map1, map2) no formato de ponto fixo do cv2.remap
+        """
+        height, width = shape
+        center_x = round(center_x / 4) * 4
+        radius = max(4, round(radius / 4) * 4)
+        cache_key = (key, height, width, center_x, radius)
+
+        if key is not None:
+            maps = self._unwarp_maps.get(cache_key)
+            if maps is not None:
+                self._unwarp_maps.move_to_end(cache_key)
+                return maps
+
+        theta_left, theta_right = self.cylinder_angles(width, center_x, radius)
+        out_width = max(1, int(round(radius * (theta_right - theta_left))))
+
+        theta = theta_left + np.arange(out_width, dtype=np.float32) / radius
+        map_x = np.tile((center_x + radius * np.sin(theta)).astype(np.float32), (height, 1))
+        map_y = np.repeat(np.arange(height, dtype=np.float32)[:, None], out_width, axis=1)
+        maps = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+        if key is not None:
+            self._unwarp_maps[cache_key] = maps
+            if len(self._unwarp_maps) > self.unwarp.get('cache_size', 32):
+                self._unwarp_maps.popitem(last=False)
+        return maps
+
+    def preprocessing_for(self, profile: Optional[Dict]) -> Dict:
+        """
+        Combina os parâmetros de pré-processamento globais com os da estação
+
+        Args:
+            profile: Perfil da estação (ou None)
+
+        Returns:
+            Parâmetros de pré-processamento efetivos
+        """
+        if not profile or not profile.get('preprocessing'):
+            return self.preprocessing
+        return {**self.preprocessing, **profile['preprocessing']}
+
+    def select_station(self, image_path: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Escolhe o perfil de estação da imagem
+
+        Critérios, na ordem: prefixo do nome do arquivo ('filename_prefix'),
+        nome da subpasta ('subfolder') e modelo da câmera no EXIF ('camera_model').
+
+        Args:
+            image_path: Caminho para a imagem
+
+        Returns:
+            Tupla com (nome, perfil) ou None se nenhuma estação corresponder
+        """
+        if not self.stations:
+            return None
+
+        path = Path(image_path)
+        for name, profile in self.stations.items():
+            prefix = profile.get('filename_prefix')
+            if prefix and path.name.startswith(prefix):
+                return name, profile
+        for name, profile in self.stations.items():
+            if profile.get('subfolder') and path.parent.name == profile['subfolder']:
+                return name, profile
+
+        if any(profile.get('camera_model') for profile in self.stations.values()):
+            try:
+                with Image.open(image_path) as image:
+                    model = str(image.getexif().get(EXIF_MODEL_TAG, '')).strip()
+            except Exception:
+                model = ''
+            for name, profile in self.stations.items():
+                if model and profile.get('camera_model') == model:
+                    return name, profile
+
+        return None
+
+    def apply_station_profile(self, gray: np.ndarray, profile: Dict) -> np.ndarray:
+        """
+        Aplica a rotação e o recorte (ROI) de uma estação fixa
+
+        Args:
+            gray: Imagem em escala de cinza
+            profile: Perfil da estação; 'roi' = [x0, y0, x1, y1] em frações (0-1)
+                da imagem já rotacionada
+
+        Returns:
+            Recorte em escala de cinza
+        """
+        rotation = profile.get('rotation', 0) % 360
+        if rotation in ROTATIONS:
+            gray = cv2.rotate(gray, ROTATIONS[rotation])
+
+        roi = profile.get('roi')
+        if not roi:
+            return gray
+
+        height, width = gray.shape[:2]
+        x0, y0, x1, y1 = roi
+        return gray[int(y0 * height):int(y1 * height), int(x0 * width):int(x1 * width)]
+
+    def station_profile_matrix(self, shape: Tuple[int, ...], profile: Dict) -> np.ndarray:
+        """
+        Matriz que leva coordenadas da imagem para o recorte de apply_station_profile
+
+        Args:
+            shape: Forma (altura, largura) da imagem antes da rotação
+            profile: Perfil da estação
+
+        Returns:
+            Matriz homogênea 3x3
+        """
+        rotation = profile.get('rotation', 0) % 360
+        matrix = rotation_matrix(rotation, shape)
+
+        roi = profile.get('roi')
+        if not roi:
+            return matrix
+
+        height, width = shape[:2]
+        if rotation in (90, 270):
+            height, width = width, height
+        return translation_matrix(-int(roi[0] * width), -int(roi[1] * height)) @ matrix
+
+    def learn_station_roi(self, image_paths: List[Path], rotation: int = 0,
+                          margin: float = 0.05) -> List[float]:
+        """
+        Deriva a ROI de uma estação fixa a partir de uma amostra de imagens
+
+        Localiza o texto em cada imagem e usa os percentis 5/95 das caixas,
+        o que descarta detecções espúrias isoladas.
+
+        Args:
+            image_paths: Amostra de imagens da estação
+            rotation: Rotação da estação (0, 90, 180, 270)
+            margin: Margem extra, em fração da imagem
+
+        Returns:
+            ROI [x0, y0, x1, y1] em frações da imagem
+        """
+        boxes = []
+        for image_path in image_paths:
+            try:
+                gray = self.apply_station_profile(self.load_image(str(image_path)), {'rotation': rotation})
+            except Exception as e:
+                logger.warning(f"Imagem ignorada no aprendizado da ROI {image_path}: {e}")
+                continue
+
+            height, width = gray.shape[:2]
+            for x, y, w, h in self.localize_text_regions(gray):
+                boxes.append((x / width, y / height, (x + w) / width, (y + h) / height))
+
+        if not boxes:
+            raise ValueError("Nenhuma região de texto encontrada na amostra")
+
+        boxes = np.array(boxes)
+        x0, y0 = np.percentile(boxes[:, 0], 5), np.percentile(boxes[:, 1], 5)
+        x1, y1 = np.percentile(boxes[:, 2], 95), np.percentile(boxes[:, 3], 95)
+
+        roi = [max(0.0, x0 - margin), max(0.0, y0 - margin), min(1.0, x1 + margin), min(1.0, y1 + margin)]
+        return [round(float(v), 4) for v in roi]
+
+    def orient_image(self, gray: np.ndarray, image_path: str,
+                     timings: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, Dict]:
+        """
+        Coloca o texto na horizontal com uma única rotação
+
+        A estimativa roda sempre na imagem decodificada: a tag EXIF de
+        orientação só diz como a câmera estava (e o cv2.imread já a aplicou),
+        não como o texto da lata está no quadro. Com 'exif_hint', as tags
+        6 e 8 (câmera girada 90°) apenas escolhem o sentido da rotação
+        quando a estimativa indica texto na vertical.
+
+        Args:
+            gray: Imagem em escala de cinza
+            image_path: Caminho para a imagem (para ler a tag EXIF)
+            timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+
+        Returns:
+            Tupla com (imagem rotacionada, {'angulo', 'fonte', 'confianca', 'exif'})
+        """
+        start = time.perf_counter()
+
+        exif_orientation = None
+        if self.orientation.get('exif_hint', True):
+            try:
+                with Image.open(image_path) as image:
+                    exif_orientation = image.getexif().get(EXIF_ORIENTATION_TAG)
+            except Exception:
+                exif_orientation = None
+
+        angle, confidence = self.estimate_orientation(gray)
+        if angle and exif_orientation in EXIF_UNDO_ROTATION:
+            # Texto alinhado ao sensor: desfaz a rotação que a decodificação aplicou
+            angle = EXIF_UNDO_ROTATION[exif_orientation]
+        if angle in ROTATIONS:
+            gray = cv2.rotate(gray, ROTATIONS[angle])
+        info = {'angulo': angle, 'fonte': 'estimativa', 'confianca': round(confidence, 2),
+                'exif': exif_orientation}
+
+        if timings is not None:
+            timings['orientation'] = (time.perf_counter() - start) * 1000
+        return gray, info
+
+    def estimate_orientation(self, gray: np.ndarray) -> Tuple[int, float]:
+        """
+        Estima se as linhas de texto estão na horizontal ou na vertical
+
+        Em uma cópia binária reduzida, combina o formato dos blobs de texto
+        (lado maior do minAreaRect) com os perfis de projeção de linhas e
+        colunas. Distinguir 0 de 180 graus fica para o fallback por
+        confiança do OCR.
+
+        Args:
+            gray: Imagem em escala de cinza
+
+        Returns:
+            Tupla com (rotação horária a aplicar: 0 ou 'vertical_rotation',
+            confiança da estimativa 0-1)
+        """
+        height, width = gray.shape[:2]
+        max_side = self.orientation.get('max_side', 480)
+        scale = min(1.0, max_side / max(height, width))
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+
+        # Bordas de caracteres, unidas em blobs por uma dilatação isotrópica
+        ellipse = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, ellipse)
+        _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        blobs = cv2.dilate(binary, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5)))
+
+        # Voto 1: orientação do lado maior de cada blob alongado, ponderada pela área
+        horizontal = vertical = 0.0
+        min_area = 0.0005 * small.shape[0] * small.shape[1]
+        contours, _ = cv2.findContours(blobs, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            rect = cv2.minAreaRect(contour)
+            rect_w, rect_h = rect[1]
+            if rect_w * rect_h < min_area or min(rect_w, rect_h) == 0:
+                continue
+            points = cv2.boxPoints(rect)
+            edges = [points[1] - points[0], points[2] - points[1]]
+            long_edge = max(edges, key=lambda edge: float(np.hypot(*edge)))
+            weight = rect_w * rect_h * (max(rect_w, rect_h) / min(rect_w, rect_h) - 1)
+            if abs(long_edge[0]) >= abs(long_edge[1]):
+                horizontal += weight
+            else:
+                vertical += weight
+        blob_score = horizontal / (horizontal + vertical) if horizontal + vertical > 0 else 0.5
+
+        # Voto 2: linhas de texto horizontais geram um perfil de linhas mais variável
+        row_var = float(np.var(binary.mean(axis=1)))
+        col_var = float(np.var(binary.mean(axis=0)))
+        profile_score = row_var / (row_var + col_var) if row_var + col_var > 0 else 0.5
+
+        score = (blob_score + profile_score) / 2
+        confidence = abs(score - 0.5) * 2
+        if score >= 0.5 or confidence < self.orientation.get('min_estimate_confidence', 0.2):
+            return 0, confidence
+        return self.orientation.get('vertical_rotation', 90) % 360, confidence
+
+    def extract_regions(self, gray: np.ndarray) -> List[np.ndarray]:
+        """
+        Recorta as regiões candidatas a código, se a localização estiver ativa
+
+        Args:
+            gray: Imagem em escala de cinza (resolução de trabalho)
+
+        Returns:
+            Recortes em escala de cinza (ou a imagem inteira)
+        """
+        return [gray[y:y + h, x:x + w] for x, y, w, h in self.region_boxes(gray)]
+
+    def region_boxes(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Caixas das regiões recortadas por extract_regions
+
+        Args:
+            gray: Imagem em escala de cinza (resolução de trabalho)
+
+        Returns:
+            Lista de caixas (x, y, largura, altura); a imagem inteira se a
+            localização estiver desativada ou nada for encontrado
+        """
+        height, width = gray.shape[:2]
+        if not self.localization.get('enabled'):
+            return [(0, 0, width, height)]
+
+        boxes = self.localize_text_regions(gray)
+        if not boxes:
+            logger.debug("Nenhuma região de texto localizada, usando a imagem inteira")
+            return [(0, 0, width, height)]
+
+        return boxes
+
+    def assess_quality(self, gray: np.ndarray) -> Dict:
+        """
+        Avalia nitidez, contraste e densidade de bordas em uma cópia reduzida
+
+        Imagens tremidas têm baixa variância do Laplaciano; fotos da esteira
+        vazia têm pouco contraste e quase nenhuma borda.
+
+        Args:
+            gray: Imagem em escala de cinza
+
+        Returns:
+            Dicionário com 'aprovada', 'motivos' e 'metricas'
+        """
+        height, width = gray.shape[:2]
+        max_side = self.quality.get('max_side', 320)
+        scale = min(1.0, max_side / max(height, width))
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+
+        edges = cv2.Canny(small, 50, 150)
+        metrics = {
+            'variancia_laplaciano': round(float(cv2.Laplacian(small, cv2.CV_64F).var()), 2),
+            'contraste': round(float(small.std()), 2),
+            'densidade_bordas': round(float(np.count_nonzero(edges)) / edges.size, 4)
+        }
+
+        reasons = []
+        if metrics['variancia_laplaciano'] < self.quality.get('min_laplacian_var', 30):
+            reasons.append('desfocada')
+        if metrics['contraste'] < self.quality.get('min_contrast', 15):
+            reasons.append('sem contraste')
+        if metrics['densidade_bordas'] < self.quality.get('min_edge_density', 0.005):
+            reasons.append('sem bordas')
+
+        return {'aprovada': not reasons, 'motivos': reasons, 'metricas': metrics}
+
+    def localize_text_regions(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Localiza blocos de texto com operações baratas em uma cópia reduzida
+
+        Gradiente morfológico + Otsu + fechamento horizontal juntam os
+        caracteres de uma linha em um blob; os blobs com formato de linha de
+        texto são mapeados de volta para a resolução original.
+
+        Args:
+            gray: Imagem em escala de cinza
+
+        Returns:
+            Lista de caixas (x, y, largura, altura) na resolução de gray,
+            ordenadas de cima para baixo
+        """
+        height, width = gray.shape[:2]
+        max_side = self.localization.get('max_side', 640)
+        scale = min(1.0, max_side / max(height, width))
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+
+        # Bordas de caracteres
+        ellipse = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, ellipse)
+        _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+        # Junta os caracteres de uma mesma linha
+        small_w = small.shape[1]
+        line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(9, small_w // 40), 3))
+        connected = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, line_kernel)
+
+        contours, _ = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        min_area = self.localization.get('min_area_ratio', 0.002) * small.shape[0] * small.shape[1]
+        min_aspect = self.localization.get('min_aspect', 1.5)
+
+        candidates = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if w * h < min_area or w < h * min_aspect or h < 6:
+                continue
+            # Blobs de texto são densos em bordas
+            density = cv2.countNonZero(binary[y:y + h, x:x + w]) / float(w * h)
+            if density < 0.1:
+                continue
+            candidates.append((w * h * density, x, y, w, h))
+
+        candidates.sort(reverse=True)
+        candidates = candidates[:self.localization.get('max_regions', 3)]
+
+        # Volta para a resolução original, com margem
+        padding = self.localization.get('padding', 0.15)
+        boxes = []
+        for _, x, y, w, h in candidates:
+            pad = int(h * padding / scale) + 2
+            x0 = max(0, int(x / scale) - pad)
+            y0 = max(0, int(y / scale) - pad)
+            x1 = min(width, int((x + w) / scale) + pad)
+            y1 = min(height, int((y + h) / scale) + pad)
+            boxes.append((x0, y0, x1 - x0, y1 - y0))
+
+        boxes.sort(key=lambda box: (box[1], box[0]))
+        return boxes
+
+    def enhance_image(self, gray: np.ndarray, preprocessing: Optional[Dict] = None,
+                      timings: Optional[Dict[str, float]] = None, matrix: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Aplica o pipeline de pré-processamento a uma imagem em escala de cinza
+
+        A cadeia vem de preprocessing['pipeline'] (padrão: DEFAULT_PIPELINE,
+        redimensionamento, bilateral, threshold adaptativo, fechamento,
+        abertura e inversão de polaridade).
+
+        Args:
+            gray: Imagem em escala de cinza
+            preprocessing: Parâmetros de pré-processamento (padrão: self.preprocessing)
+            timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+            matrix: Matriz 3x3 atualizada com as etapas geométricas (ver run_pipeline)
+
+        Returns:
+            Imagem binarizada
+        """
+        preprocessing = self.preprocessing if preprocessing is None else preprocessing
+        return run_pipeline(gray, preprocessing.get('pipeline', DEFAULT_PIPELINE), timings, matrix)
+
+    def extract_text(self, processed_image: np.ndarray) -> Tuple[str, List[float], List[Dict]]:
+        """
+        Extrai texto da imagem pré-processada usando o motor de OCR configurado
+
+        Texto, confianças e caixas vêm de uma única chamada ao motor (no
+        Tesseract, uma única saída de image_to_data).
 
         Args:
             processed_image: Imagem pré-processada
 
         Returns:
-            Texto extraído
+            Tupla com (texto extraído, confiança de cada palavra, caixas das palavras)
         """
         try:
-            # Converte numpy array para PIL Image
-            pil_image = Image.fromarray(processed_image)
-
-            # Extrai texto usando Tesseract
-            text = pytesseract.image_to_string(pil_image, config=self.ocr_config)
+            # Extrai texto usando o motor configurado
+            text, confidence, boxes = self.engine.recognize(processed_image)
 
             # Limpa o texto extraído
             text = text.strip().replace('\n', ' ').replace('\t', ' ')
             text = re.sub(r'\s+', ' ', text)  # Remove espaços múltiplos
 
-            logger.debug(f"Texto extraído: {text}")
-            return text
+            word_confidences = [box['confianca'] for box in boxes if 'confianca' in box]
+
+            logger.debug(f"Texto extraído: {text} (confiança {confidence:.1f})")
+            return text, word_confidences, boxes
 
         except Exception as e:
             logger.error(f"Erro na extração de texto: {str(e)}")
-            return ""
+            return "", [], []
+
+    def recognize_regions(self, regions: List[np.ndarray],
+                          timings: Optional[Dict[str, float]] = None) -> Tuple[str, float, List[float], List[Dict]]:
+        """
+        Reconhece o texto de todas as regiões de uma imagem
+
+        Args:
+            regions: Imagens pré-processadas (uma por região de texto)
+            timings: Dicionário onde o tempo de OCR (ms) é acumulado (opcional)
+
+        Returns:
+            Tupla com (texto das regiões unido, confiança média das palavras
+            ou -1 se desconhecida, confiança de cada palavra, caixas das palavras)
+        """
+        start = time.perf_counter()
+        texts, word_confidences, boxes = [], [], []
+        for index, region in enumerate(regions):
+            text, region_confidences, region_boxes = self.extract_text(region)
+            if text:
+                texts.append(text)
+            word_confidences.extend(region_confidences)
+            # Coordenadas da região pré-processada (map_boxes_to_image leva à imagem original)
+            boxes.extend({**box, 'regiao': index} for box in region_boxes)
+        if timings is not None:
+            timings['ocr'] = timings.get('ocr', 0.0) + (time.perf_counter() - start) * 1000
+
+        confidence = float(np.mean(word_confidences)) if word_confidences else -1.0
+        return ' '.join(texts), confidence, word_confidences, boxes
+
+    def run_cascade(self, crops: List[np.ndarray], timings: Optional[Dict[str, float]] = None,
+                    geometry: Optional[List[Dict]] = None) -> Tuple[Tuple, str]:
+        """
+        Executa a cascata de pré-processamento guiada pela confiança
+
+        Os níveis vão do mais barato ao mais caro; a cascata para no primeiro
+        nível cuja confiança atinja 'min_confidence'. Se nenhum atingir, fica
+        o resultado de maior confiança.
+
+        Args:
+            crops: Recortes em escala de cinza (uma por região de texto)
+            timings: Dicionário onde os tempos (ms) são acumulados por etapa (opcional)
+            geometry: Geometria dos recortes (crop_regions); recebe a matriz do
+                pipeline do nível usado (opcional)
+
+        Returns:
+            Tupla com (resultado de recognize_regions, nome do nível usado)
+        """
+        min_confidence = self.cascade.get('min_confidence', 70)
+        best = None
+
+        for level in self.cascade.get('levels', DEFAULT_CASCADE_LEVELS):
+            matrices = [np.eye(3) for _ in crops]
+            processed = [run_pipeline(crop, level['pipeline'], timings, matrix)
+                         for crop, matrix in zip(crops, matrices)]
+            recognized = self.recognize_regions(processed, timings)
+            confidence = recognized[1]
+            logger.debug(f"Cascata nível '{level['name']}': confiança {confidence:.1f}")
+
+            if best is None or confidence > best[0][1]:
+                best = (recognized, level['name'], matrices)
+            if confidence >= min_confidence:
+                break
+
+        recognized, level_name, matrices = best
+        if geometry is not None:
+            for region, matrix in zip(geometry, matrices):
+                region['pipeline'] = matrix
+        return recognized, level_name
+
+    def map_boxes_to_image(self, boxes: List[Dict], geometry: List[Dict]) -> List[Dict]:
+        """
+        Leva as caixas do OCR (coordenadas da região pré-processada) para a imagem original
+
+        Desfaz, em ordem inversa, as etapas geométricas do pipeline, a
+        planificação do cilindro, o recorte, a rotação e a redução da decodificação.
+
+        Args:
+            boxes: Caixas de recognize_regions (com 'regiao')
+            geometry: Geometria de cada região (crop_regions)
+
+        Returns:
+            Caixas com x, y, w, h na resolução original da imagem
+        """
+        mapped = []
+        for box in boxes:
+            region = geometry[box['regiao']]
+            corners = np.array([[box['x'], box['x'] + box['w'], box['x'], box['x'] + box['w']],
+                                [box['y'], box['y'], box['y'] + box['h'], box['y'] + box['h']],
+                                [1, 1, 1, 1]], dtype=np.float64)
+
+            points = np.linalg.inv(region['pipeline']) @ corners
+            cylinder = region['cilindro']
+            if cylinder is not None:
+                # Coluna planificada u -> coluna do recorte x = eixo + R·sen(θ0 + u/R)
+                radius = cylinder['radius']
+                points[0] = cylinder['center_x'] + radius * np.sin(cylinder['theta_left'] + points[0] / radius)
+            points = np.linalg.inv(region['recorte']) @ points
+
+            x0, y0 = np.floor(points[:2].min(axis=1)).astype(int)
+            x1, y1 = np.ceil(points[:2].max(axis=1)).astype(int)
+            mapped.append({**box, 'x': int(x0), 'y': int(y0), 'w': int(x1 - x0), 'h': int(y1 - y0)})
+        return mapped
+
+    def config_fingerprint(self) -> str:
+        """
+        Gera a impressão digital das opções que afetam o texto reconhecido
+
+        Returns:
+            Hash curto da configuração de pré-processamento e OCR
+        """
+        relevant = {key: self.config[key] for key in _OCR_CONFIG_KEYS if key in self.config}
+        relevant['ocr_config'] = self.ocr_config
+        relevant['ocr_engine'] = self.engine.name
+        return config_fingerprint(relevant)
+
+    def start_pool(self):
+        """
+        Cria um pool de workers persistente, reaproveitado por iter_files
+
+        Usado por processos de longa duração (daemon), para não pagar a
+        inicialização dos workers (imports, motor de OCR) a cada lote.
+        """
+        if self._executor is None and self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.tesseract_path, self.config)
+            )
+            logger.info(f"Pool persistente iniciado com {self.workers} workers")
+
+    def _restart_pool(self):
+        """
+        Recria o pool persistente depois que um worker morreu (BrokenProcessPool)
+        """
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self.start_pool()
+
+    def _iter_persistent_pool(self, paths: List[str], chunksize: int) -> Iterator[Dict]:
+        """
+        Gera os resultados no pool persistente, sobrevivendo à queda de um worker
+
+        Uma falha nativa (OpenCV/Tesseract) em uma imagem derruba o processo e
+        quebra o pool inteiro. O pool é recriado e as imagens restantes do
+        lote são refeitas uma a uma, para isolar a que derruba o worker; só
+        essa recebe resultado de erro.
+
+        Args:
+            paths: Caminhos das imagens
+            chunksize: Tamanho dos blocos enviados a cada worker
+
+        Yields:
+            Resultado de cada imagem, na mesma ordem de paths
+        """
+        done = 0
+        try:
+            for result in self._executor.map(_process_in_worker, paths, chunksize=chunksize):
+                done += 1
+                logger.info(f"Concluída {done}/{len(paths)}: {result['arquivo']}")
+                yield result
+            return
+        except BrokenProcessPool:
+            logger.error("Um worker do pool terminou inesperadamente; recriando o pool")
+            self._restart_pool()
+
+        for path in paths[done:]:
+            try:
+                result = self._executor.submit(_process_in_worker, path).result()
+            except BrokenProcessPool:
+                logger.error(f"Worker terminou inesperadamente ao processar: {path}")
+                self._restart_pool()
+                result = {
+                    'arquivo': os.path.basename(path),
+                    'caminho_completo': path,
+                    'texto_extraido': '',
+                    'texto_limpo': '',
+                    'observacao': 'ERRO: processo de OCR terminou inesperadamente',
+                    'timestamp': datetime.now().isoformat(),
+                    'status': 'erro'
+                }
+            done += 1
+            logger.info(f"Concluída {done}/{len(paths)}: {result['arquivo']}")
+            yield result
+
+    def close(self):
+        """
+        Libera recursos mantidos pelo processador (pool, motor de OCR e cache)
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.engine.close()
+        if self.cache is not None:
+            self.cache.close()
 
     def apply_business_rules(self, text: str) -> Tuple[str, str]:
         """
@@ -188,11 +1341,83 @@ class OCRProcessor:
         try:
             logger.info(f"Processando imagem: {image_path}")
 
-            # Pré-processamento
-            processed_image = self.preprocess_image(image_path)
-
-            # Extração de texto
-            raw_text = self.extract_text(processed_image)
+            # Consulta o cache pelo conteúdo do arquivo, sem decodificar a imagem
+            cache_key = None
+            if self.cache is not None:
+                cache_key = f"{hash_file(image_path)}-{self.fingerprint}"
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Resultado obtido do cache: {image_path}")
+                    return self._result_from_cache(cached, image_path)
+
+            # Pré-processamento (uma imagem por região de texto)
+            timings = {}
+            station = self.select_station(image_path)
+            cascade_level = None
+
+            gray, preprocessing = self.load_station_image(image_path, station, timings)
+
+            quality = {}
+            if self.quality.get('enabled'):
+                start = time.perf_counter()
+                quality = self.assess_quality(gray)
+                timings['quality'] = (time.perf_counter() - start) * 1000
+                if not quality['aprovada']:
+                    # Reprovada no filtro de qualidade: nenhum filtro nem OCR é executado
+                    logger.info(f"Imagem rejeitada ({', '.join(quality['motivos'])}): {image_path}")
+                    return self._low_quality_result(image_path, station, quality, timings)
+
+            symbol = None
+            if self.barcode_reader is not None:
+                # Caminho rápido: código de barras/QR/DataMatrix dispensa o OCR
+                start = time.perf_counter()
+                symbol = self.barcode_reader.decode(gray)
+                timings['barcode'] = (time.perf_counter() - start) * 1000
+
+            orientation = None
+            if symbol is not None:
+                recognized = (symbol['texto'], 100.0, [], [])
+            else:
+                # Coordenadas da imagem original -> imagem de trabalho (decodificação reduzida)
+                _, factor = self.get_decode_flags(image_path, preprocessing)
+                matrix = scale_matrix(1 / factor, 1 / factor)
+
+                # Estações fixas já têm a rotação no perfil
+                if not station and self.orientation.get('enabled'):
+                    shape = gray.shape
+                    gray, orientation = self.orient_image(gray, image_path, timings)
+                    matrix = rotation_matrix(orientation['angulo'], shape) @ matrix
+
+                geometry = []
+                crops = self.crop_regions(gray, station, timings, matrix, geometry)
+
+                if self.cascade.get('enabled'):
+                    # Cascata: do pipeline mais barato ao mais caro, enquanto a confiança for baixa
+                    recognized, cascade_level = self.run_cascade(crops, timings, geometry)
+                else:
+                    processed_regions = [self.enhance_image(crop, preprocessing, timings, region['pipeline'])
+                                         for crop, region in zip(crops, geometry)]
+
+                    # Extração de texto (texto, confianças e caixas numa única passada)
+                    recognized = self.recognize_regions(processed_regions, timings)
+
+                    # Orientação estimada com OCR pouco confiável: tenta a orientação oposta
+                    if (orientation and orientation['fonte'] == 'estimativa'
+                            and recognized[1] < self.orientation.get('fallback_min_confidence', 60)):
+                        flipped = [cv2.rotate(region, cv2.ROTATE_180) for region in processed_regions]
+                        retry = self.recognize_regions(flipped, timings)
+                        if retry[1] > recognized[1]:
+                            recognized = retry
+                            orientation['angulo'] = (orientation['angulo'] + 180) % 360
+                            orientation['fonte'] = 'fallback'
+                            for region, flipped_region in zip(geometry, processed_regions):
+                                region['pipeline'] = rotation_matrix(180, flipped_region.shape) @ region['pipeline']
+
+                # Caixas na resolução e orientação da imagem original
+                text, confidence, word_confidences, boxes = recognized
+                recognized = (text, confidence, word_confidences, self.map_boxes_to_image(boxes, geometry))
+
+            raw_text, confidence, word_confidences, boxes = recognized
 
             # Aplicação das regras de negócio
             clean_text, observation = self.apply_business_rules(raw_text)
@@ -204,9 +1429,22 @@ class OCRProcessor:
                 'texto_extraido': raw_text,
                 'texto_limpo': clean_text,
                 'observacao': observation,
+                'confianca': round(confidence, 1),
+                'confiancas_palavras': word_confidences,
+                'caixas': boxes,
+                'estacao': station[0] if station else None,
+                'nivel_cascata': cascade_level,
+                'origem_texto': f"codigo:{symbol['tipo']}" if symbol else 'ocr',
+                'orientacao': orientation,
+                'tempos_etapas': {name: round(ms, 2) for name, ms in timings.items()},
                 'timestamp': datetime.now().isoformat(),
                 'status': 'sucesso'
             }
+            if quality:
+                result['metricas_qualidade'] = quality['metricas']
+
+            if cache_key is not None:
+                self.cache.put(cache_key, result)
 
             logger.info(f"Processamento concluído: {image_path}")
             return result
@@ -223,21 +1461,74 @@ class OCRProcessor:
                 'status': 'erro'
             }
 
-    def process_folder(self, folder_path: str) -> List[Dict]:
+    def _low_quality_result(self, image_path: str, station: Optional[Tuple[str, Dict]],
+                            quality: Dict, timings: Dict[str, float]) -> Dict:
         """
-        Processa todas as imagens em uma pasta
+        Monta o resultado de uma imagem reprovada no filtro de qualidade
+
+        Args:
+            image_path: Caminho para a imagem
+            station: Perfil de estação (nome, perfil) ou None
+            quality: Resultado de assess_quality
+            timings: Tempos (ms) das etapas executadas
+
+        Returns:
+            Dicionário com status 'baixa_qualidade' e as métricas medidas
+        """
+        return {
+            'arquivo': os.path.basename(image_path),
+            'caminho_completo': image_path,
+            'texto_extraido': '',
+            'texto_limpo': '',
+            'observacao': f"Baixa qualidade: {', '.join(quality['motivos'])}",
+            'estacao': station[0] if station else None,
+            'metricas_qualidade': quality['metricas'],
+            'tempos_etapas': {name: round(ms, 2) for name, ms in timings.items()},
+            'timestamp': datetime.now().isoformat(),
+            'status': 'baixa_qualidade'
+        }
+
+    def _result_from_cache(self, cached: Dict, image_path: str) -> Dict:
+        """
+        Monta o resultado de uma imagem a partir de uma entrada do cache
+
+        As regras de negócio são reaplicadas, pois não fazem parte da chave.
+
+        Args:
+            cached: Resultado armazenado no cache
+            image_path: Caminho da imagem atual
+
+        Returns:
+            Dicionário com os resultados do processamento
+        """
+        clean_text, observation = self.apply_business_rules(cached.get('texto_extraido', ''))
+
+        result = dict(cached)
+        result.update({
+            'arquivo': os.path.basename(image_path),
+            'caminho_completo': image_path,
+            'texto_limpo': clean_text,
+            'observacao': observation,
+            'tempos_etapas': {},
+            'timestamp': datetime.now().isoformat(),
+            'cache': True
+        })
+        return result
+
+    def find_images(self, folder_path: str) -> List[Path]:
+        """
+        Lista os arquivos de imagem suportados em uma pasta
 
         Args:
             folder_path: Caminho para a pasta com imagens
 
         Returns:
-            Lista com resultados de todas as imagens processadas
+            Lista de caminhos das imagens encontradas
         """
         folder_path = Path(folder_path)
         if not folder_path.exists():
             raise ValueError(f"Pasta não encontrada: {folder_path}")
 
-        results = []
         image_files = []
 
         # Encontra todos os arquivos de imagem
@@ -245,19 +1536,174 @@ class OCRProcessor:
             image_files.extend(folder_path.glob(f"*{ext}"))
             image_files.extend(folder_path.glob(f"*{ext.upper()}"))
 
+        return image_files
+
+    def process_folder(self, folder_path: str, workers: Optional[int] = None,
+                       checkpoint_path: Optional[str] = None, resume: bool = False) -> List[Dict]:
+        """
+        Processa todas as imagens em uma pasta
+
+        Args:
+            folder_path: Caminho para a pasta com imagens
+            workers: Número de processos paralelos (padrão: self.workers)
+            checkpoint_path: Arquivo JSONL onde cada resultado é gravado ao terminar (opcional)
+            resume: Pula as imagens já presentes no checkpoint
+
+        Returns:
+            Lista com resultados de todas as imagens processadas
+        """
+        image_files = self.find_images(folder_path)
+
         if not image_files:
             logger.warning(f"Nenhuma imagem encontrada em: {folder_path}")
-            return results
+            return []
 
         logger.info(f"Encontradas {len(image_files)} imagens para processar")
 
-        # Processa cada imagem
-        for i, image_file in enumerate(image_files, 1):
-            logger.info(f"Processando {i}/{len(image_files)}: {image_file.name}")
-            result = self.process_single_image(str(image_file))
-            results.append(result)
+        return self.process_files(image_files, workers=workers, checkpoint_path=checkpoint_path, resume=resume)
 
-        return results
+    def process_files(self, image_files: List[Path], workers: Optional[int] = None,
+                      checkpoint_path: Optional[str] = None, resume: bool = False) -> List[Dict]:
+        """
+        Processa uma lista de imagens, em série ou em um pool de processos
+
+        Com checkpoint, cada resultado é anexado ao arquivo JSONL assim que
+        termina, e a lista final é reconstruída a partir do checkpoint.
+
+        Args:
+            image_files: Caminhos das imagens
+            workers: Número de processos paralelos (padrão: self.workers)
+            checkpoint_path: Arquivo JSONL de checkpoint (opcional)
+            resume: Pula as imagens já presentes no checkpoint
+
+        Returns:
+            Lista com resultados, na mesma ordem de image_files
+        """
+        image_files = [Path(image_file) for image_file in image_files]
+        if not checkpoint_path:
+            return list(self.iter_files(image_files, workers))
+
+        done = self.load_checkpoint(str(checkpoint_path)) if resume else {}
+        pending = [f for f in image_files if str(f.resolve()) not in done]
+        if done:
+            logger.info(f"Retomando: {len(image_files) - len(pending)} imagens já no checkpoint, "
+                        f"{len(pending)} pendentes")
+
+        with JsonlResultWriter(str(checkpoint_path), append=resume, fsync=True, write_summary=False) as writer:
+            for result in self.iter_files(pending, workers):
+                writer.write(result)
+
+        # Reconstrói os resultados a partir do checkpoint, na ordem das imagens
+        done = self.load_checkpoint(str(checkpoint_path))
+        return [done[str(f.resolve())] for f in image_files if str(f.resolve()) in done]
+
+    def iter_folder(self, folder_path: str, workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Gera os resultados das imagens de uma pasta, um a um, sem acumulá-los
+
+        Args:
+            folder_path: Caminho para a pasta com imagens
+            workers: Número de processos paralelos (padrão: self.workers)
+
+        Yields:
+            Resultado de cada imagem, na ordem de find_images
+        """
+        image_files = self.find_images(folder_path)
+
+        if not image_files:
+            logger.warning(f"Nenhuma imagem encontrada em: {folder_path}")
+            return
+
+        logger.info(f"Encontradas {len(image_files)} imagens para processar")
+        yield from self.iter_files(image_files, workers)
+
+    def iter_files(self, image_files: List[Path], workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Gera os resultados das imagens, em série ou em um pool de processos
+
+        Args:
+            image_files: Caminhos das imagens
+            workers: Número de processos paralelos (padrão: self.workers)
+
+        Yields:
+            Resultado de cada imagem, na mesma ordem de image_files
+        """
+        image_files = [Path(image_file) for image_file in image_files]
+        if not image_files:
+            return
+
+        workers = min(self.workers if workers is None else workers, len(image_files))
+
+        if workers <= 1:
+            # Processa cada imagem
+            for i, image_file in enumerate(image_files, 1):
+                logger.info(f"Processando {i}/{len(image_files)}: {image_file.name}")
+                yield self.process_single_image(str(image_file))
+            return
+
+        # Processa em paralelo; executor.map mantém a ordem do caminho serial
+        logger.info(f"Processando com {workers} workers em paralelo")
+        chunksize = max(1, len(image_files) // (workers * 4))
+        paths = [str(image_file) for image_file in image_files]
+
+        if self._executor is not None:
+            # Pool persistente (daemon): os workers já estão aquecidos
+            yield from self._iter_persistent_pool(paths, chunksize)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.tesseract_path, self.config)
+        ) as executor:
+            for i, result in enumerate(executor.map(_process_in_worker, paths, chunksize=chunksize), 1):
+                logger.info(f"Concluída {i}/{len(image_files)}: {result['arquivo']}")
+                yield result
+
+    @staticmethod
+    def load_checkpoint(checkpoint_path: str) -> Dict[str, Dict]:
+        """
+        Carrega os resultados gravados em um checkpoint JSONL
+
+        Linhas incompletas (processo interrompido no meio da escrita) são ignoradas.
+
+        Args:
+            checkpoint_path: Caminho do arquivo JSONL
+
+        Returns:
+            Dicionário caminho absoluto -> resultado
+        """
+        done = {}
+        if not Path(checkpoint_path).exists():
+            return done
+
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[str(Path(result['caminho_completo']).resolve())] = result
+
+        return done
+
+    def save_results_jsonl(self, results: Iterable[Dict], output_path: str) -> JsonlResultWriter:
+        """
+        Salva os resultados em JSONL à medida que são produzidos
+
+        Args:
+            results: Resultados (lista ou gerador, ex.: iter_folder)
+            output_path: Caminho para salvar o arquivo JSONL
+
+        Returns:
+            Escritor já fechado, com as contagens do resumo
+        """
+        with JsonlResultWriter(output_path) as writer:
+            for result in results:
+                writer.write(result)
+
+        logger.info(f"Resultados salvos em: {output_path} (resumo em {writer.summary_path})")
+        return writer
 
     def save_results_json(self, results: List[Dict], output_path: str):
         """
@@ -273,6 +1719,7 @@ class OCRProcessor:
                 'total_processadas': len(results),
                 'sucessos': len([r for r in results if r['status'] == 'sucesso']),
                 'erros': len([r for r in results if r['status'] == 'erro']),
+                'baixa_qualidade': len([r for r in results if r['status'] == 'baixa_qualidade']),
                 'resultados': results
             }
 
@@ -296,19 +1743,84 @@ def main():
     parser.add_argument('input_path', help='Caminho para imagem ou pasta com imagens')
     parser.add_argument('-o', '--output', help='Caminho para arquivo de saída JSON')
     parser.add_argument('-t', '--tesseract', help='Caminho para executável do Tesseract')
+    parser.add_argument('-c', '--config', help='Caminho para arquivo de configuração')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='Número de processos paralelos (0 = todos os núcleos)')
+    parser.add_argument('--checkpoint', help='Arquivo JSONL de checkpoint (padrão: checkpoint_<pasta>.jsonl)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Retoma o processamento, pulando imagens já no checkpoint')
+    parser.add_argument('--jsonl', action='store_true',
+                        help='Grava um registro JSONL por imagem à medida que termina (memória constante)')
+    parser.add_argument('--learn-roi', metavar='ESTACAO',
+                        help='Aprende a ROI da estação a partir das imagens da pasta e salva no settings.json')
+    parser.add_argument('--sample', type=int, default=30,
+                        help='Número de imagens usadas por --learn-roi (padrão: 30)')
 
     args = parser.parse_args()
 
+    config = load_config(args.config)
+
     # Inicializa o processador
-    processor = OCRProcessor(tesseract_path=args.tesseract)
+    processor = OCRProcessor(
+        tesseract_path=args.tesseract or config.get('tesseract_path') or None,
+        config=config,
+        workers=args.workers
+    )
 
     # Determina se é arquivo ou pasta
     input_path = Path(args.input_path)
 
+    if args.learn_roi:
+        # Aprende a ROI de uma estação fixa e grava no arquivo de configuração
+        image_files = processor.find_images(str(input_path))
+        step = max(1, len(image_files) // max(args.sample, 1))
+        station = config.setdefault('stations', {}).setdefault(args.learn_roi, {})
+
+        roi = processor.learn_station_roi(image_files[::step][:args.sample], rotation=station.get('rotation', 0))
+        station['roi'] = roi
+        save_config(config, args.config)
+
+        print("\n=== ROI APRENDIDA ===")
+        print(f"Estação: {args.learn_roi}")
+        print(f"ROI (x0, y0, x1, y1): {roi}")
+        print(f"Configuração salva em: {args.config or Path('config') / 'settings.json'}")
+        return
+
+    if args.jsonl:
+        # Modo streaming: cada resultado vai para o disco assim que termina
+        if input_path.is_file():
+            results = iter([processor.process_single_image(str(input_path))])
+        elif input_path.is_dir():
+            results = processor.iter_folder(str(input_path))
+        else:
+            print(f"Erro: Caminho não encontrado: {input_path}")
+            return
+
+        if args.output:
+            output_path = args.output
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = f"ocr_results_{timestamp}.jsonl"
+
+        writer = processor.save_results_jsonl(results, output_path)
+
+        print("\n=== RESUMO DO PROCESSAMENTO ===")
+        print(f"Total de imagens: {writer.total}")
+        print(f"Sucessos: {writer.sucessos}")
+        print(f"Erros: {writer.erros}")
+        print(f"Resultados salvos em: {output_path}")
+        print(f"Resumo salvo em: {writer.summary_path}")
+        return
+
     if input_path.is_file():
         results = [processor.process_single_image(str(input_path))]
     elif input_path.is_dir():
-        results = processor.process_folder(str(input_path))
+        checkpoint_path = args.checkpoint or default_checkpoint_path(
+            str(input_path), str(Path(args.output).parent) if args.output else '.'
+        )
+        results = processor.process_folder(
+            str(input_path), checkpoint_path=str(checkpoint_path), resume=args.resume
+        )
     else:
         print(f"Erro: Caminho não encontrado: {input_path}")
         return
@@ -326,11 +1838,13 @@ def main():
     # Exibe resumo
     sucessos = len([r for r in results if r['status'] == 'sucesso'])
     erros = len([r for r in results if r['status'] == 'erro'])
+    baixa_qualidade = len([r for r in results if r['status'] == 'baixa_qualidade'])
 
     print(f"\n=== RESUMO DO PROCESSAMENTO ===")
     print(f"Total de imagens: {len(results)}")
     print(f"Sucessos: {sucessos}")
     print(f"Erros: {erros}")
+    print(f"Baixa qualidade: {baixa_qualidade}")
     print(f"Resultados salvos em: {output_path}")
 
 
@@ -17,35 +17,52 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import argparse
 
-# Importa nossos módulos
-try:
-    from ocr_processor import OCRProcessor
-    from excel_generator import ExcelGenerator
-except ImportError as e:
-    print(f"❌ Erro: Não foi possível importar módulos necessários: {e}")
-    print("   Certifique-se de que todos os arquivos estão no mesmo diretório")
-    sys.exit(1)
+import ocr_client
+
+
+def _import_ocr_modules():
+    """
+    Importa nossos módulos de OCR
+
+    Os imports são adiados até a criação da integração: OpenCV, numpy e
+    openpyxl levam segundos para carregar, e main() pode apenas encaminhar
+    o pedido a um daemon já aquecido.
+    """
+    global OCRProcessor, JsonlResultWriter, default_checkpoint_path, ExcelGenerator, hash_file
+    try:
+        from ocr_processor import OCRProcessor, JsonlResultWriter, default_checkpoint_path
+        from excel_generator import ExcelGenerator
+        from ocr_cache import hash_file
+    except ImportError as e:
+        print(f"❌ Erro: Não foi possível importar módulos necessários: {e}")
+        print("   Certifique-se de que todos os arquivos estão no mesmo diretório")
+        sys.exit(1)
+
 
 class PowerAutomateIntegration:
     """
     Classe para integração com Power Automate Desktop
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, workers: Optional[int] = None):
         """
         Inicializa a integração
 
         Args:
             config_path: Caminho para arquivo de configuração (opcional)
+            workers: Número de processos paralelos de OCR (sobrepõe a configuração)
         """
+        _import_ocr_modules()
         self.config = self.load_config(config_path)
         self.setup_logging()
 
         # Inicializa processadores
         self.ocr_processor = OCRProcessor(
-            tesseract_path=self.config.get('tesseract_path')
+            tesseract_path=self.config.get('tesseract_path'),
+            config=self.config,
+            workers=workers
         )
-        self.excel_generator = ExcelGenerator()
+        self.excel_generator = ExcelGenerator(write_only=self.config.get('excel_write_only', False))
 
         logger.info("Power Automate Integration inicializada")
 
@@ -88,8 +105,103 @@ class PowerAutomateIntegration:
             "input_folder": "input_images",
             "output_folder": "output_results",
             "log_level": "INFO",
+            "workers": 1,
+            "incremental": False,
+            "excel_write_only": False,
+            "ocr_engine": "tesseract",
+            "preprocessing": {
+                "decode_mode": "grayscale",
+                "char_height_ratio": 0.05,
+                "target_char_height": 32,
+                "pipeline": [
+                    {"stage": "resize_min", "min_width": 300, "min_height": 200},
+                    {"stage": "bilateral", "d": 11, "sigma_color": 17, "sigma_space": 17},
+                    {"stage": "adaptive_threshold", "block_size": 11, "c": 2},
+                    {"stage": "close", "kernel": 2},
+                    {"stage": "open", "kernel": 2},
+                    {"stage": "invert_if_light"}
+                ]
+            },
+            "cascade": {
+                "enabled": False,
+                "min_confidence": 70
+            },
+            "orientation": {
+                "enabled": False,
+                "exif_hint": True,
+                "max_side": 480,
+                "min_estimate_confidence": 0.2,
+                "vertical_rotation": 90,
+                "fallback_min_confidence": 60
+            },
+            "unwarp": {
+                "enabled": False,
+                "radius_ratio": 0.75,
+                "max_angle": 75,
+                "edge_ratio": 3.0,
+                "cache_size": 32
+            },
+            "barcode": {
+                "enabled": False,
+                "readers": ["opencv_barcode", "opencv_qr", "pyzbar", "libdmtx"],
+                "max_side": 1600,
+                "libdmtx_timeout_ms": 200
+            },
+            "quality": {
+                "enabled": False,
+                "max_side": 320,
+                "min_laplacian_var": 30,
+                "min_contrast": 15,
+                "min_edge_density": 0.005
+            },
+            "localization": {
+                "enabled": False,
+                "max_side": 640,
+                "max_regions": 3,
+                "min_area_ratio": 0.002,
+                "min_aspect": 1.5,
+                "padding": 0.15
+            },
+            "stations": {},
+            "monitor": {
+                "use_inotify": True,
+                "poll_interval": 1.0,
+                "settle_seconds": 2.0,
+                "batch_window": 0.5,
+                "process_existing": False
+            },
+            "daemon": {
+                "host": "127.0.0.1",
+                "port": 8765,
+                "upload_folder": "temp/daemon_uploads",
+                "max_upload_mb": 50
+            },
+            "queue": {
+                "path": "cache/job_queue.sqlite",
+                "max_attempts": 3,
+                "retention_days": 7,
+                "batch_size": 0,
+                "priorities": {
+                    "imagem": 10,
+                    "pasta": 0
+                }
+            },
+            "cluster": {
+                "shard_size": 200,
+                "lease_seconds": 60,
+                "poll_interval": 2.0,
+                "max_attempts": 3,
+                "retention_days": 7
+            },
+            "cache": {
+                "enabled": True,
+                "path": "cache/ocr_cache.sqlite",
+                "max_entries": 100000,
+                "max_age_days": 30,
+                "max_size_mb": 200
+            },
             "supported_formats": [".jpg", ".jpeg", ".png", ".bmp", ".tiff"],
-            "ocr_config": "--oem 3 --psm 8",
+            "ocr_config": "--oem 3 --psm 8 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-_",
             "business_rules": {
                 "SP": "Produto de São Paulo",
                 "RJ": "Produto do Rio de Janeiro",
@@ -120,7 +232,120 @@ class PowerAutomateIntegration:
         global logger
         logger = logging.getLogger(__name__)
 
-    def process_workflow(self, input_path: str, generate_excel: bool = True, generate_csv: bool = True) -> Dict:
+    def get_manifest_path(self) -> Path:
+        """
+        Retorna o caminho do manifesto de arquivos já processados
+
+        Returns:
+            Caminho do arquivo de manifesto
+        """
+        manifest_file = self.config.get('manifest_file')
+        if manifest_file:
+            return Path(manifest_file)
+        return Path(self.config['output_folder']) / 'processed_manifest.json'
+
+    def load_manifest(self) -> Dict:
+        """
+        Carrega o manifesto de arquivos já processados
+
+        Returns:
+            Dicionário caminho -> {size, mtime, sha256, configuracao, resultado}
+        """
+        manifest_path = self.get_manifest_path()
+        if not manifest_path.exists():
+            return {}
+
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Manifesto inválido, reprocessando tudo: {e}")
+            return {}
+
+    def save_manifest(self, manifest: Dict):
+        """
+        Salva o manifesto de forma atômica (arquivo temporário + rename)
+
+        Args:
+            manifest: Dicionário caminho -> entrada do manifesto
+        """
+        manifest_path = self.get_manifest_path()
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+
+    def process_incremental(self, folder_path: str) -> List[Dict]:
+        """
+        Processa apenas imagens novas ou alteradas desde a última execução
+
+        Arquivos com mesmo tamanho e mtime reutilizam o resultado anterior;
+        se só o mtime mudou, o hash do conteúdo decide. Entradas gravadas com
+        outra configuração de OCR (motor, pré-processamento, estações...)
+        não são reaproveitadas.
+
+        Args:
+            folder_path: Pasta com imagens
+
+        Returns:
+            Lista com resultados de todas as imagens da pasta (novos + anteriores)
+        """
+        manifest = self.load_manifest()
+        image_files = self.ocr_processor.find_images(folder_path)
+        fingerprint = self.ocr_processor.fingerprint
+
+        results = [None] * len(image_files)
+        pending = []  # (índice, chave, size, mtime, sha256)
+
+        for i, image_file in enumerate(image_files):
+            key = str(image_file.resolve())
+            stat = image_file.stat()
+            entry = manifest.get(key)
+            if entry and entry.get('configuracao') != fingerprint:
+                # Resultado de outra configuração de OCR: processa de novo
+                entry = None
+
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+                results[i] = entry['resultado']
+                continue
+
+            digest = hash_file(str(image_file))
+            if entry and entry['sha256'] == digest:
+                entry['mtime'] = stat.st_mtime
+                results[i] = entry['resultado']
+                continue
+
+            pending.append((i, key, stat.st_size, stat.st_mtime, digest))
+
+        logger.info(
+            f"Modo incremental: {len(pending)} imagens novas/alteradas, "
+            f"{len(image_files) - len(pending)} reaproveitadas"
+        )
+
+        new_results = self.ocr_processor.process_files([image_files[i] for i, *_ in pending])
+
+        for (i, key, size, mtime, digest), result in zip(pending, new_results):
+            results[i] = result
+            # Erros não entram no manifesto, para serem tentados de novo
+            if result['status'] != 'erro':
+                manifest[key] = {'size': size, 'mtime': mtime, 'sha256': digest,
+                                 'configuracao': fingerprint, 'resultado': result}
+            else:
+                manifest.pop(key, None)
+
+        # Remove do manifesto arquivos que saíram da pasta
+        folder_key = str(Path(folder_path).resolve())
+        current = {str(image_file.resolve()) for image_file in image_files}
+        for key in [k for k in manifest if str(Path(k).parent) == folder_key and k not in current]:
+            del manifest[key]
+
+        self.save_manifest(manifest)
+        return results
+
+    def process_workflow(self, input_path: str, generate_excel: bool = True, generate_csv: bool = True,
+                         incremental: Optional[bool] = None, resume: bool = False) -> Dict:
         """
         Executa o workflow completo de OCR e geração de relatórios
 
@@ -128,6 +353,8 @@ class PowerAutomateIntegration:
             input_path: Caminho para imagem ou pasta com imagens
             generate_excel: Se deve gerar arquivo Excel
             generate_csv: Se deve gerar arquivo CSV
+            incremental: Processa só imagens novas/alteradas (padrão: config 'incremental')
+            resume: Retoma uma execução interrompida a partir do checkpoint
 
         Returns:
             Dicionário com informações sobre os arquivos gerados
@@ -144,40 +371,19 @@ class PowerAutomateIntegration:
             if input_path.is_file():
                 results = [self.ocr_processor.process_single_image(str(input_path))]
             elif input_path.is_dir():
-                results = self.ocr_processor.process_folder(str(input_path))
+                if incremental is None:
+                    incremental = self.config.get('incremental', False)
+                if incremental:
+                    results = self.process_incremental(str(input_path))
+                else:
+                    checkpoint_path = default_checkpoint_path(str(input_path), self.config['output_folder'])
+                    results = self.ocr_processor.process_folder(
+                        str(input_path), checkpoint_path=str(checkpoint_path), resume=resume
+                    )
             else:
                 raise ValueError(f"Caminho inválido: {input_path}")
 
-            # Salva resultados JSON temporário
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            json_path = Path(self.config['output_folder']) / f"ocr_results_{timestamp}.json"
-
-            # Garante que pasta de saída existe
-            json_path.parent.mkdir(exist_ok=True)
-
-            self.ocr_processor.save_results_json(results, str(json_path))
-
-            generated_files = {
-                'json_file': str(json_path),
-                'excel_file': None,
-                'csv_file': None,
-                'timestamp': timestamp,
-                'total_images': len(results),
-                'successful': len([r for r in results if r['status'] == 'sucesso']),
-                'errors': len([r for r in results if r['status'] == 'erro'])
-            }
-
-            # Gera Excel se solicitado
-            if generate_excel:
-                excel_path = self.excel_generator.generate_excel(str(json_path))
-                generated_files['excel_file'] = excel_path
-                logger.info(f"Excel gerado: {excel_path}")
-
-            # Gera CSV se solicitado
-            if generate_csv:
-                csv_path = self.excel_generator.generate_csv_for_power_automate(str(json_path))
-                generated_files['csv_file'] = csv_path
-                logger.info(f"CSV gerado: {csv_path}")
+            generated_files = self.build_outputs(results, generate_excel, generate_csv)
 
             logger.info("Workflow concluído com sucesso")
             return generated_files
@@ -186,6 +392,88 @@ class PowerAutomateIntegration:
             logger.error(f"Erro no workflow: {str(e)}")
             raise
 
+    @staticmethod
+    def _reserve_output_id(output_folder: Path, timestamp: str, tag: Optional[str] = None) -> str:
+        """
+        Escolhe o sufixo dos arquivos de saída de uma execução
+
+        O JSON de resultados é criado de forma exclusiva para reservar o nome:
+        execuções simultâneas no mesmo segundo (jobs do daemon, CLI) recebem
+        sufixos diferentes em vez de sobrescrever os arquivos umas das outras.
+
+        Args:
+            output_folder: Pasta de saída
+            timestamp: Data/hora da execução (AAAAMMDD_HHMMSS)
+            tag: Identificação opcional da execução (ex.: 'job42')
+
+        Returns:
+            Sufixo reservado (ex.: '20250101_120000_job42' ou '20250101_120000_2')
+        """
+        base = f"{timestamp}_{tag}" if tag else timestamp
+        output_id, attempt = base, 1
+        while True:
+            try:
+                with open(output_folder / f"ocr_results_{output_id}.json", 'x'):
+                    return output_id
+            except FileExistsError:
+                attempt += 1
+                output_id = f"{base}_{attempt}"
+
+    def build_outputs(self, results: List[Dict], generate_excel: bool = True,
+                      generate_csv: bool = True, tag: Optional[str] = None) -> Dict:
+        """
+        Grava o JSON de resultados e os relatórios Excel/CSV
+
+        Args:
+            results: Resultados do OCR
+            generate_excel: Se deve gerar arquivo Excel
+            generate_csv: Se deve gerar arquivo CSV
+            tag: Identificação da execução nos nomes dos arquivos (ex.: id do job)
+
+        Returns:
+            Dicionário com informações sobre os arquivos gerados
+        """
+        output_folder = Path(self.config['output_folder'])
+
+        # Garante que pasta de saída existe
+        output_folder.mkdir(exist_ok=True)
+
+        # Salva resultados JSON temporário
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_id = self._reserve_output_id(output_folder, timestamp, tag)
+        json_path = output_folder / f"ocr_results_{output_id}.json"
+
+        self.ocr_processor.save_results_json(results, str(json_path))
+
+        generated_files = {
+            'json_file': str(json_path),
+            'excel_file': None,
+            'csv_file': None,
+            'timestamp': timestamp,
+            'output_id': output_id,
+            'total_images': len(results),
+            'successful': len([r for r in results if r['status'] == 'sucesso']),
+            'errors': len([r for r in results if r['status'] == 'erro']),
+            'low_quality': len([r for r in results if r['status'] == 'baixa_qualidade'])
+        }
+
+        # Gera Excel e CSV a partir dos resultados em memória, em uma única passada
+        if generate_excel or generate_csv:
+            reports = self.excel_generator.generate_reports(
+                {'timestamp': datetime.now().isoformat(), 'resultados': results},
+                excel_output_path=str(output_folder / f"relatorio_ocr_latas_{output_id}.xlsx"),
+                csv_output_path=str(output_folder / f"dados_ocr_latas_{output_id}.csv"),
+                generate_excel=generate_excel,
+                generate_csv=generate_csv
+            )
+            generated_files['excel_file'] = reports['excel_file']
+            generated_files['csv_file'] = reports['csv_file']
+            if reports['excel_file']:
+                logger.info(f"Excel gerado: {reports['excel_file']}")
+            if reports['csv_file']:
+                logger.info(f"CSV gerado: {reports['csv_file']}")
+        return generated_files
+
     def create_power_automate_response(self, workflow_result: Dict) -> Dict:
         """
         Cria resposta formatada para o Power Automate
@@ -204,6 +492,7 @@ class PowerAutomateIntegration:
                 "total_images": workflow_result['total_images'],
                 "successful_ocr": workflow_result['successful'],
                 "failed_ocr": workflow_result['errors'],
+                "low_quality_images": workflow_result['low_quality'],
                 "success_rate": round((workflow_result['successful'] / max(workflow_result['total_images'], 1)) * 100, 2),
                 "files_generated": {
                     "json_results": workflow_result['json_file'],
@@ -213,29 +502,47 @@ class PowerAutomateIntegration:
             }
         }
 
-    def run_for_power_automate(self, input_folder: str) -> str:
+    def save_power_automate_response(self, workflow_result: Dict) -> Dict:
+        """
+        Cria a resposta para o Power Automate e a salva na pasta de saída
+
+        Args:
+            workflow_result: Resultado do workflow (ou de build_outputs)
+
+        Returns:
+            Resposta formatada para Power Automate
+        """
+        response = self.create_power_automate_response(workflow_result)
+
+        # Salva resposta para Power Automate, com o mesmo sufixo dos demais arquivos
+        output_id = workflow_result.get('output_id', workflow_result['timestamp'])
+        response_path = Path(self.config['output_folder']) / f"power_automate_response_{output_id}.json"
+
+        with open(response_path, 'w', encoding='utf-8') as f:
+            json.dump(response, f, ensure_ascii=False, indent=2)
+
+        return response
+
+    def run_for_power_automate(self, input_folder: str, incremental: Optional[bool] = None,
+                               resume: bool = False) -> str:
         """
         Executa processamento otimizado para Power Automate
 
         Args:
             input_folder: Pasta com imagens para processar
+            incremental: Processa só imagens novas/alteradas (padrão: config 'incremental')
+            resume: Retoma uma execução interrompida a partir do checkpoint
 
         Returns:
             JSON string com resultado formatado
         """
         try:
             # Executa workflow
-            result = self.process_workflow(input_folder, generate_excel=True, generate_csv=True)
-
-            # Formata resposta
-            response = self.create_power_automate_response(result)
-
-            # Salva resposta para Power Automate
-            timestamp = result['timestamp']
-            response_path = Path(self.config['output_folder']) / f"power_automate_response_{timestamp}.json"
+            result = self.process_workflow(input_folder, generate_excel=True, generate_csv=True,
+                                           incremental=incremental, resume=resume)
 
-            with open(response_path, 'w', encoding='utf-8') as f:
-                json.dump(response, f, ensure_ascii=False, indent=2)
+            # Formata e salva a resposta
+            response = self.save_power_automate_response(result)
 
             # Retorna JSON como string para Power Automate
             return json.dumps(response, ensure_ascii=False)
@@ -248,17 +555,88 @@ class PowerAutomateIntegration:
             }
             return json.dumps(error_response, ensure_ascii=False)
 
-    def monitor_folder(self, watch_folder: str, output_folder: Optional[str] = None):
+    def monitor_folder(self, watch_folder: Optional[str] = None, output_folder: Optional[str] = None,
+                       should_stop=None):
         """
-        Monitora pasta para processamento automático (para uso futuro)
+        Monitora a pasta e processa cada nova imagem assim que termina de ser gravada
+
+        Os resultados são acrescentados aos arquivos do dia na pasta de saída
+        (ocr_latas_AAAAMMDD.jsonl e dados_ocr_latas_AAAAMMDD.csv); o Excel do
+        dia é gerado a partir do JSONL na virada do dia e ao encerrar.
+
+        Args:
+            watch_folder: Pasta para monitorar (padrão: config 'input_folder')
+            output_folder: Pasta de saída (padrão: config 'output_folder')
+            should_stop: Função sem argumentos que encerra o monitoramento ao retornar True
+        """
+        from folder_watcher import FolderWatcher
+
+        watch_folder = Path(watch_folder or self.config.get('input_folder', 'input_images'))
+        output_folder = Path(output_folder or self.config['output_folder'])
+        output_folder.mkdir(parents=True, exist_ok=True)
+        options = self.config.get('monitor', {})
+
+        watcher = FolderWatcher(
+            str(watch_folder),
+            self.ocr_processor.supported_extensions,
+            use_inotify=options.get('use_inotify', True),
+            poll_interval=options.get('poll_interval', 1.0),
+            settle_seconds=options.get('settle_seconds', 2.0),
+            batch_window=options.get('batch_window', 0.5),
+            process_existing=options.get('process_existing', False)
+        )
+
+        # Workers aquecidos durante todo o monitoramento
+        self.ocr_processor.start_pool()
+
+        day = writer = None
+        next_id = None
+        try:
+            for batch in watcher.batches(should_stop):
+                today = datetime.now().strftime("%Y%m%d")
+                if today != day:
+                    if writer is not None:
+                        writer.close()
+                        self._write_daily_excel(writer.output_path, output_folder, day)
+                    day = today
+                    writer = JsonlResultWriter(str(output_folder / f"ocr_latas_{day}.jsonl"),
+                                               append=True, fsync=True, write_summary=False)
+                    next_id = None
+
+                # JSONL e CSV recebem cada resultado juntos: uma interrupção no
+                # meio do lote não deixa imagens no JSONL sem linha no CSV
+                csv_path = str(output_folder / f"dados_ocr_latas_{day}.csv")
+                processed = 0
+                for result in self.ocr_processor.iter_files(batch):
+                    writer.write(result)
+                    next_id = self.excel_generator.append_csv_rows([result], csv_path, start_index=next_id)
+                    processed += 1
+
+                logger.info(f"Monitoramento: {processed} imagens processadas de {watch_folder}")
+        except KeyboardInterrupt:
+            logger.info("Monitoramento interrompido")
+        finally:
+            if writer is not None:
+                writer.close()
+                self._write_daily_excel(writer.output_path, output_folder, day)
+
+    def _write_daily_excel(self, jsonl_path: Path, output_folder: Path, day: str):
+        """
+        Gera o Excel do dia a partir dos resultados acumulados no JSONL
 
         Args:
-            watch_folder: Pasta para monitorar
-            output_folder: Pasta de saída (opcional)
+            jsonl_path: JSONL do dia
+            output_folder: Pasta de saída
+            day: Dia no formato AAAAMMDD
         """
-        # Implementação futura para monitoramento automático
-        logger.info(f"Monitoramento de pasta não implementado ainda: {watch_folder}")
-        pass
+        results = list(OCRProcessor.load_checkpoint(str(jsonl_path)).values())
+        if not results:
+            return
+        self.excel_generator.generate_reports(
+            {'timestamp': datetime.now().isoformat(), 'resultados': results},
+            excel_output_path=str(output_folder / f"relatorio_ocr_latas_{day}.xlsx"),
+            generate_csv=False
+        )
 
 
 def main():
@@ -271,6 +649,7 @@ def main():
 
     parser.add_argument(
         'input_path',
+        nargs='?',
         help='Caminho para imagem ou pasta com imagens'
     )
 
@@ -297,15 +676,138 @@ def main():
         help='Modo Power Automate (retorna JSON)'
     )
 
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        help='Número de processos paralelos de OCR (0 = todos os núcleos)'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        default=None,
+        help='Processa só imagens novas ou alteradas desde a última execução'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Retoma um processamento interrompido a partir do checkpoint'
+    )
+
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Inicia o daemon HTTP local (POST /process, GET /jobs/{id})'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Porta do daemon (padrão: config daemon.port)'
+    )
+
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Monitora a pasta (input_path ou config input_folder) e processa novas imagens continuamente'
+    )
+
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Processa neste processo mesmo com um daemon em execução'
+    )
+
     args = parser.parse_args()
 
-    try:
-        # Inicializa integração
-        integration = PowerAutomateIntegration(config_path=args.config)
+    if not args.input_path and not (args.serve or args.watch):
+        parser.error('informe input_path ou use --serve/--watch')
 
+    # Encaminha ao daemon aquecido, se houver, antes de importar OpenCV/openpyxl.
+    # Opções que o daemon não aplica (outra config, só Excel/CSV, número de
+    # workers diferente do pool do daemon) processam aqui.
+    forwardable = not (args.serve or args.watch or args.no_daemon or args.config
+                       or args.excel_only or args.csv_only or args.workers is not None)
+    daemon_url = ocr_client.find_daemon() if forwardable else None
+    if daemon_url:
+        try:
+            response = ocr_client.submit(daemon_url, args.input_path,
+                                         incremental=args.incremental, resume=args.resume)
+        except ocr_client.DaemonUnavailable:
+            # Daemon encerrado depois da verificação de saúde: processa aqui
+            response = None
+        except Exception as e:
+            response = {"success": False, "message": f"Erro: {str(e)}", "data": None}
+
+        if response is not None and 'success' not in response:
+            # Espera do daemon expirou com o job ainda na fila ou em andamento
+            if not args.power_automate:
+                print(f"⏳ Job {response.get('job_id')} em andamento no daemon; aguardando a conclusão...")
+            try:
+                response = ocr_client.wait_for_job(daemon_url, response)
+            except ocr_client.DaemonUnavailable:
+                response = {"success": False, "data": None,
+                            "message": f"Daemon encerrado durante o job {response.get('job_id')}"}
+            except Exception as e:
+                response = {"success": False, "message": f"Erro: {str(e)}", "data": None}
+
+    if daemon_url and response is not None:
         if args.power_automate:
+            print(json.dumps(response, ensure_ascii=False))
+        elif response.get('success'):
+            data = response['data']
+            print(f"\n🎉 PROCESSAMENTO CONCLUÍDO! (daemon {daemon_url})")
+            print("=" * 40)
+            print(f"📊 Total de imagens: {data['total_images']}")
+            print(f"✅ Sucessos: {data['successful_ocr']}")
+            print(f"❌ Erros: {data['failed_ocr']}")
+            print(f"🌫️ Baixa qualidade: {data['low_quality_images']}")
+            print(f"📈 Taxa de sucesso: {data['success_rate']:.1f}%")
+            print("\n📁 Arquivos gerados:")
+            print(f"   📄 JSON: {data['files_generated']['json_results']}")
+            print(f"   📊 Excel: {data['files_generated']['excel_report']}")
+            print(f"   📋 CSV: {data['files_generated']['csv_data']}")
+        else:
+            print(f"❌ Erro: {response.get('message')}")
+        sys.exit(0 if response.get('success') else 1)
+
+    try:
+        # Inicializa integração
+        integration = PowerAutomateIntegration(config_path=args.config, workers=args.workers)
+
+        if args.serve:
+            # Modo daemon: mantém OCR, relatórios e pool de workers carregados
+            from ocr_daemon import DEFAULT_HOST, DEFAULT_PORT, OCRDaemon
+
+            daemon_config = integration.config.get('daemon', {})
+            integration.ocr_processor.start_pool()
+            daemon = OCRDaemon(
+                integration,
+                host=daemon_config.get('host', DEFAULT_HOST),
+                port=args.port or daemon_config.get('port', DEFAULT_PORT)
+            )
+            print(f"🛰️ Daemon OCR em {daemon.address} (Ctrl+C para encerrar)")
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                integration.ocr_processor.close()
+
+        elif args.watch:
+            # Monitoramento contínuo da pasta de entrada
+            print("👀 Monitorando novas imagens (Ctrl+C para encerrar)")
+            try:
+                integration.monitor_folder(args.input_path)
+            finally:
+                integration.ocr_processor.close()
+
+        elif args.power_automate:
             # Modo Power Automate
-            response = integration.run_for_power_automate(args.input_path)
+            response = integration.run_for_power_automate(
+                args.input_path, incremental=args.incremental, resume=args.resume
+            )
             print(response)
 
         else:
@@ -316,7 +818,9 @@ def main():
             result = integration.process_workflow(
                 args.input_path,
                 generate_excel=generate_excel,
-                generate_csv=generate_csv
+                generate_csv=generate_csv,
+                incremental=args.incremental,
+                resume=args.resume
             )
 
             print("\n🎉 PROCESSAMENTO CONCLUÍDO!")
@@ -324,6 +828,7 @@ def main():
             print(f"📊 Total de imagens: {result['total_images']}")
             print(f"✅ Sucessos: {result['successful']}")
             print(f"❌ Erros: {result['errors']}")
+            print(f"🌫️ Baixa qualidade: {result['low_quality']}")
             print(f"📈 Taxa de sucesso: {(result['successful'] / max(result['total_images'], 1) * 100):.1f}%")
             print("\n📁 Arquivos gerados:")
             print(f"   📄 JSON: {result['json_file']}")
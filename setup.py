@@ -200,6 +200,7 @@ class OCRSetup:
 __pycache__/
 .env
 temp/
+.ocr_daemon.json
 *.jpg
 *.jpeg
 *.png
@@ -225,6 +226,101 @@ temp/
             "input_folder": "input_images",
             "output_folder": "output_results",
             "log_level": "INFO",
+            "workers": 1,
+            "incremental": False,
+            "excel_write_only": False,
+            "ocr_engine": "tesseract",
+            "preprocessing": {
+                "decode_mode": "grayscale",
+                "char_height_ratio": 0.05,
+                "target_char_height": 32,
+                "pipeline": [
+                    {"stage": "resize_min", "min_width": 300, "min_height": 200},
+                    {"stage": "bilateral", "d": 11, "sigma_color": 17, "sigma_space": 17},
+                    {"stage": "adaptive_threshold", "block_size": 11, "c": 2},
+                    {"stage": "close", "kernel": 2},
+                    {"stage": "open", "kernel": 2},
+                    {"stage": "invert_if_light"}
+                ]
+            },
+            "cascade": {
+                "enabled": False,
+                "min_confidence": 70
+            },
+            "orientation": {
+                "enabled": False,
+                "exif_hint": True,
+                "max_side": 480,
+                "min_estimate_confidence": 0.2,
+                "vertical_rotation": 90,
+                "fallback_min_confidence": 60
+            },
+            "unwarp": {
+                "enabled": False,
+                "radius_ratio": 0.75,
+                "max_angle": 75,
+                "edge_ratio": 3.0,
+                "cache_size": 32
+            },
+            "barcode": {
+                "enabled": False,
+                "readers": ["opencv_barcode", "opencv_qr", "pyzbar", "libdmtx"],
+                "max_side": 1600,
+                "libdmtx_timeout_ms": 200
+            },
+            "quality": {
+                "enabled": False,
+                "max_side": 320,
+                "min_laplacian_var": 30,
+                "min_contrast": 15,
+                "min_edge_density": 0.005
+            },
+            "localization": {
+                "enabled": False,
+                "max_side": 640,
+                "max_regions": 3,
+                "min_area_ratio": 0.002,
+                "min_aspect": 1.5,
+                "padding": 0.15
+            },
+            "stations": {},
+            "monitor": {
+                "use_inotify": True,
+                "poll_interval": 1.0,
+                "settle_seconds": 2.0,
+                "batch_window": 0.5,
+                "process_existing": False
+            },
+            "daemon": {
+                "host": "127.0.0.1",
+                "port": 8765,
+                "upload_folder": "temp/daemon_uploads",
+                "max_upload_mb": 50
+            },
+            "queue": {
+                "path": "cache/job_queue.sqlite",
+                "max_attempts": 3,
+                "retention_days": 7,
+                "batch_size": 0,
+                "priorities": {
+                    "imagem": 10,
+                    "pasta": 0
+                }
+            },
+            "cluster": {
+                "shard_size": 200,
+                "lease_seconds": 60,
+                "poll_interval": 2.0,
+                "max_attempts": 3,
+                "retention_days": 7
+            },
+            "cache": {
+                "enabled": True,
+                "path": "cache/ocr_cache.sqlite",
+                "max_entries": 100000,
+                "max_age_days": 30,
+                "max_size_mb": 200
+            },
             "supported_formats": [".jpg", ".jpeg", ".png", ".bmp", ".tiff"],
             "ocr_config": "--oem 3 --psm 8 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-_",
             "business_rules": {
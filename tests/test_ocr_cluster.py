@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do processamento distribuído (ocr_cluster.py)
+Workers em subprocessos com o motor 'noop'; um deles é morto no meio de um shard
+Author: Confrade Tech Solutions
+Date: 2025
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+np = pytest.importorskip('numpy')
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+CLUSTER_SCRIPT = REPO_DIR / 'ocr_cluster.py'
+
+LEASE_SECONDS = 2
+SHARD_SIZE = 3
+TIMEOUT = 120
+
+
+def _create_images(folder: Path, count: int):
+    folder.mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        image = rng.integers(0, 256, (480, 640), dtype=np.uint8)
+        cv2.imwrite(str(folder / f"lata_{i:03d}.jpg"), image)
+
+
+def _start_worker(tmp_path: Path, config_path: Path, worker_id: str) -> subprocess.Popen:
+    # Sessão própria: o worker e seus filhos podem ser mortos juntos
+    return subprocess.Popen(
+        [sys.executable, str(CLUSTER_SCRIPT), 'worker', str(tmp_path / 'compartilhado'),
+         '-c', str(config_path), '--id', worker_id, '-w', '1'],
+        cwd=tmp_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+
+
+def _run_coordinator(tmp_path: Path, config_path: Path, input_folder: Path) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, str(CLUSTER_SCRIPT), 'coordinator', str(input_folder), str(tmp_path / 'compartilhado'),
+         '-c', str(config_path), '--power-automate'],
+        cwd=tmp_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+
+
+def _wait_lease(shared_dir: Path, worker_id: str) -> Path:
+    deadline = time.monotonic() + TIMEOUT
+    while time.monotonic() < deadline:
+        for lease in shared_dir.glob('jobs/*/claims/*.lease'):
+            try:
+                if json.loads(lease.read_text(encoding='utf-8'))['worker'] == worker_id:
+                    return lease
+            except (OSError, ValueError, KeyError):
+                continue
+        time.sleep(0.005)
+    pytest.fail(f"Worker {worker_id} não reservou nenhum shard")
+
+
+def _response(coordinator: subprocess.Popen) -> dict:
+    stdout, _ = coordinator.communicate(timeout=TIMEOUT)
+    assert coordinator.returncode == 0, stdout
+    # A última linha é a resposta do Power Automate (antes vêm mensagens de configuração)
+    return json.loads(stdout.strip().splitlines()[-1])
+
+
+def _merged_results(response: dict, tmp_path: Path) -> list:
+    with open(tmp_path / response['data']['files_generated']['json_results'], 'r', encoding='utf-8') as f:
+        return json.load(f)['resultados']
+
+
+def test_worker_killed_mid_shard(tmp_path):
+    input_folder = tmp_path / 'entrada'
+    _create_images(input_folder, 7 * SHARD_SIZE)
+    config_path = tmp_path / 'settings.json'
+    config_path.write_text(json.dumps({
+        'ocr_engine': 'noop',
+        'output_folder': 'saida',
+        'cluster': {'shard_size': SHARD_SIZE, 'lease_seconds': LEASE_SECONDS, 'poll_interval': 0.2}
+    }), encoding='utf-8')
+
+    victim = _start_worker(tmp_path, config_path, 'vitima')
+    survivors = []
+    try:
+        coordinator = _run_coordinator(tmp_path, config_path, input_folder)
+
+        # A vítima morre com o lease de um shard; os outros só entram depois
+        lease = _wait_lease(tmp_path / 'compartilhado', 'vitima')
+        os.killpg(victim.pid, signal.SIGKILL)
+        victim.wait()
+        survivors = [_start_worker(tmp_path, config_path, f"w{i}") for i in range(2)]
+
+        response = _response(coordinator)
+        assert response['success']
+        assert response['data']['total_images'] == 7 * SHARD_SIZE
+
+        results = _merged_results(response, tmp_path)
+        expected = sorted(path.name for path in input_folder.glob('*.jpg'))
+        assert sorted(result['arquivo'] for result in results) == expected
+        assert not any(result.get('observacao', '').startswith('ERRO') for result in results)
+
+        # Job encerrado: só o registro fica no diretório compartilhado
+        job_dir = lease.parent.parent
+        assert sorted(path.name for path in job_dir.iterdir()) == ['job.json', 'resposta.json']
+
+        # Os sobreviventes continuam em execução e atendem o próximo job da fila
+        second_folder = tmp_path / 'entrada2'
+        _create_images(second_folder, 2 * SHARD_SIZE)
+        response = _response(_run_coordinator(tmp_path, config_path, second_folder))
+        assert response['success']
+        assert response['data']['total_images'] == 2 * SHARD_SIZE
+        assert all(worker.poll() is None for worker in survivors)
+    finally:
+        for worker in [victim] + survivors:
+            if worker.poll() is None:
+                os.killpg(worker.pid, signal.SIGKILL)
+                worker.wait()